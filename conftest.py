@@ -3,6 +3,18 @@ from playwright.sync_api import Playwright, sync_playwright, Page
 
 def pytest_addoption(parser):
     parser.addoption("--headless", action="store_true", default=False, help="Run tests in headless mode")
+    parser.addoption("--throttle", default=None,
+                     help="Throttle every test page to this profile (fast-3g, slow-4g, mid-tier-mobile)")
+    parser.addoption("--js-coverage", action="store_true", default=False,
+                     help="Collect JS/CSS coverage per route on every test page and report unused bytes")
+    parser.addoption("--long-tasks", action="store_true", default=False,
+                     help="Attribute main-thread blocking to page-object steps and report the worst at the end")
+    parser.addoption("--step-timeline", action="store_true", default=False,
+                     help="Record CDP performance counters around every page-object step and save them per test")
+    parser.addoption("--print-metrics", action="store_true", default=False,
+                     help="Print every performance metric sample as it is recorded, not only the session summary")
+    parser.addoption("--leak-cycles", type=int, default=10,
+                     help="Measured cycles per memory leak scenario (raise it for long-session runs)")
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "smoke: mark test as smoke test")
@@ -11,12 +11,20 @@ def get_test_user():
         "password": "ValidPass123!"
     }
 
-def get_payment_method_data():
+# Test cards per network: (card number, CVC)
+CARD_NETWORKS = {
+    "visa": ("4242 4242 4242 4242", "010"),
+    "mastercard": ("5555 5555 5555 4444", "010"),
+    "amex": ("3782 822463 10005", "0101")
+}
+
+def get_payment_method_data(network: str = "visa", card_number: str = None):
     """Generate test payment method data."""
+    default_number, cvc = CARD_NETWORKS[network]
     return {
-        "card_number": "4242 4242 4242 4242",
+        "card_number": card_number or default_number,
         "expiry_date": "09/28",
-        "cvc": "010",
+        "cvc": cvc,
         "cardholder_name": "Test Test",
         "phone_number": "082212341234"
     }
@@ -0,0 +1,171 @@
+"""
+Base class for page objects.
+
+Page objects built on BasePage are cheap to construct: locators are declared once on
+the class as lazy descriptors, nothing touches the browser in __init__, and every
+public method is wrapped with timing hooks so instrumentation can attribute cost to
+individual page-object steps.
+"""
+import functools
+import inspect
+import time
+from typing import Callable, Dict, List, Optional, Union
+from playwright.sync_api import Page
+from tests.config.test_config import BASE_URL
+from tests.page_components.dialog_manager import DialogManager
+
+
+class LazyLocator:
+    """Descriptor that builds a locator on first access and caches it on the instance.
+
+    Args:
+        selector: Either a CSS/XPath selector string, or a callable receiving the page
+                  object and returning a locator (or any other cached value, such as a
+                  dict of locators).
+    """
+
+    def __init__(self, selector: Union[str, Callable[["BasePage"], object]]):
+        self.selector = selector
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if isinstance(self.selector, str):
+            value = instance.page.locator(self.selector)
+        else:
+            value = self.selector(instance)
+        # Non-data descriptor: the instance attribute shadows us on later lookups
+        instance.__dict__[self.name] = value
+        return value
+
+
+class StepHook:
+    """Receives callbacks around page-object steps. Override the methods you need."""
+
+    def before_step(self, page_object: "BasePage", step: str) -> None:
+        pass
+
+    def after_step(self, page_object: "BasePage", step: str, duration: float,
+                   error: Optional[BaseException]) -> None:
+        pass
+
+
+def _instrument(name: str, func: Callable) -> Callable:
+    """Wrap a page-object method so it records timings and notifies step hooks"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        depth = self.__dict__.get("_step_depth", 0)
+        step = f"{type(self).__name__}.{name}"
+        # Hooks only see the outermost step so nested calls are not double counted
+        hooks = list(BasePage._step_hooks) if depth == 0 else []
+        for hook in hooks:
+            hook.before_step(self, step)
+        self._step_depth = depth + 1
+        start = time.perf_counter()
+        error = None
+        try:
+            return func(self, *args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self._step_depth = depth
+            self.__dict__.setdefault("timings", []).append({
+                "step": step,
+                "duration_ms": round(duration * 1000, 2),
+                "depth": depth,
+                "ok": error is None
+            })
+            for hook in reversed(hooks):
+                try:
+                    hook.after_step(self, step, duration, error)
+                except Exception as hook_error:
+                    print(f"Step hook {type(hook).__name__} failed for {step}: {hook_error}")
+    wrapper._instrumented = True
+    return wrapper
+
+
+def step(func: Callable) -> Callable:
+    """Instrument a method of a component that is not a BasePage (e.g. a table) as a step"""
+    return _instrument(func.__name__, func)
+
+
+class BasePage:
+    """Base class for all page objects.
+
+    Subclasses declare:
+        path: URL path of the page relative to the application base URL
+        ready_indicator: LazyLocator that is visible once the page is usable
+    """
+    path: str = ""
+    ready_indicator: Optional[LazyLocator] = None
+    loading_indicator = LazyLocator("svg.lucide-loader-circle.animate-spin")
+
+    _step_hooks: List[StepHook] = []
+
+    def __init__(self, page: Page, base_url: Optional[str] = None):
+        self.page = page
+        self.base_url = (base_url or BASE_URL).rstrip("/")
+        self.url = f"{self.base_url}{self.path}"
+        self.timings: List[Dict] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.isfunction(value):
+                continue
+            if getattr(value, "_instrumented", False):
+                continue
+            setattr(cls, name, _instrument(name, value))
+
+    # Step hooks
+    @classmethod
+    def add_step_hook(cls, hook: StepHook) -> StepHook:
+        """Register a hook that is notified around every page-object step"""
+        BasePage._step_hooks.append(hook)
+        return hook
+
+    @classmethod
+    def remove_step_hook(cls, hook: StepHook) -> None:
+        """Unregister a previously added step hook"""
+        if hook in BasePage._step_hooks:
+            BasePage._step_hooks.remove(hook)
+
+    @property
+    def dialogs(self) -> DialogManager:
+        """Page-scoped dialog manager shared by all page objects on this page"""
+        return DialogManager.for_page(self.page)
+
+    # Readiness contract
+    def is_ready(self) -> bool:
+        """Check whether the page's ready indicator is visible and nothing is loading"""
+        if self.ready_indicator is None:
+            return True
+        try:
+            return self.ready_indicator.first.is_visible() and not self.loading_indicator.first.is_visible()
+        except Exception:
+            return False
+
+    def wait_until_ready(self, timeout: float = 10000):
+        """Wait for the ready indicator to be visible and the loading spinner to be gone
+
+        Args:
+            timeout: Maximum time to wait in milliseconds for each condition
+        """
+        if self.ready_indicator is not None:
+            self.ready_indicator.first.wait_for(state="visible", timeout=timeout)
+        try:
+            self.loading_indicator.first.wait_for(state="hidden", timeout=timeout)
+        except Exception:
+            pass
+        return self
+
+    def open(self, timeout: float = 10000):
+        """Navigate to the page URL and wait until it is ready"""
+        self.page.goto(self.url)
+        return self.wait_until_ready(timeout=timeout)
@@ -1,43 +1,56 @@
 from playwright.sync_api import Page, expect, TimeoutError
 import time
 import re
+from pages.base_page import BasePage, LazyLocator
+from tests.page_components.search_component import SearchComponent
+from tests.page_components.table_component import TableComponent
+from tests.page_components.table_watcher import TableWatcher
+from tests.utils.cleanup_registry import cleanup_registry
 
-class CostCentersPage:
-    def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://wize-invoice-dev-front.octaprimetech.com/cost-center"
-        
-        # Common locators
-        # Search input locator using exact placeholder match
-        self.search_input = page.get_by_placeholder("Search cost centers...", exact=True)
-        
-        # Action buttons with exact text matching
-        self.new_cost_center_btn = page.get_by_role("button", name="New Cost Center", exact=True)
-        self.edit_cost_center_btn = page.get_by_role("button", name="Edit cost center", exact=True)
-        self.refresh_btn = page.get_by_role("button", name="Refresh")
-        
-        # Status messages
-        self.no_data_message = page.get_by_text("No cost centers found.")
-        
-        # Form fields
-        # Using data-slot attribute for more reliable element selection
-        self.name_input = page.locator('input[data-slot="input"]#name')
-        
-        # Counter locators based on actual DOM structure
-        self.total_counter = page.locator("div:has-text('Total Cost Centers') + div.text-2xl.font-bold")
-        self.active_counter = page.locator("div:has-text('Active Centers') + div.text-2xl.font-bold.text-green-600")
-        self.inactive_counter = page.locator("div:has-text('Inactive Centers') + div.text-2xl.font-bold")
-        
-        # Simpler counter locators from File 2
-        self.simple_total_counters = page.locator("div:has-text('Total Cost Centers') + div")
-        self.simple_active_counters = page.locator("div:has-text('Active Centers') + div.text-green-600")
-        self.simple_inactive_counters = page.locator("div:has-text('Inactive Centers') + div.text-red-600")
-        
-        # Debug: Save a screenshot of the entire page
-        page.screenshot(path="test-results/full_page.png")
-        
-        # Pagination locators
-        self.pagination = page.locator(".pagination")
+class CostCentersPage(BasePage):
+    path = "/cost-center"
+    
+    # Common locators
+    # Search input locator using exact placeholder match
+    search_input = LazyLocator(lambda self: self.page.get_by_placeholder("Search cost centers...", exact=True))
+    
+    # Action buttons with exact text matching
+    new_cost_center_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="New Cost Center", exact=True))
+    edit_cost_center_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Edit cost center", exact=True))
+    refresh_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Refresh"))
+    
+    # Status messages
+    no_data_message = LazyLocator(lambda self: self.page.get_by_text("No cost centers found."))
+    
+    # Form fields
+    # Using data-slot attribute for more reliable element selection
+    name_input = LazyLocator('input[data-slot="input"]#name')
+    
+    # Counter locators based on actual DOM structure
+    total_counter = LazyLocator("div:has-text('Total Cost Centers') + div.text-2xl.font-bold")
+    active_counter = LazyLocator("div:has-text('Active Centers') + div.text-2xl.font-bold.text-green-600")
+    inactive_counter = LazyLocator("div:has-text('Inactive Centers') + div.text-2xl.font-bold")
+    
+    # Simpler counter locators from File 2
+    simple_total_counters = LazyLocator("div:has-text('Total Cost Centers') + div")
+    simple_active_counters = LazyLocator("div:has-text('Active Centers') + div.text-green-600")
+    simple_inactive_counters = LazyLocator("div:has-text('Inactive Centers') + div.text-red-600")
+    
+    # Pagination locators
+    pagination = LazyLocator(".pagination")
+    
+    # Shared by the table component and the watcher
+    table_selector = "table"
+    
+    # The page is usable once the New Cost Center button is rendered
+    ready_indicator = LazyLocator(lambda self: self.new_cost_center_btn)
+    
+    def __init__(self, page: Page, base_url: str = None):
+        super().__init__(page, base_url)
+        self.watcher = TableWatcher(page, table_selector=self.table_selector)
+        self.table = TableComponent(page, table_selector=self.table_selector)
+        self.search_box = SearchComponent(page, self.search_input, "cost-centers", self.watcher,
+                                          metric_name="cost_centers.search.latency")
     
     def navigate(self):
         self.page.goto(self.url)
@@ -45,26 +58,9 @@ class CostCentersPage:
         return self
         
     def search(self, query: str):
-        """Search for a cost center by name"""
+        """Search for a cost center by name and wait for the matching results"""
         try:
-            # Wait for the search input to be visible and enabled
-            search_input = self.page.get_by_placeholder("Search cost centers...", exact=True)
-            search_input.wait_for(state='visible', timeout=10000)
-            
-            # Clear any existing text and type the query
-            search_input.fill('')  # Clear first
-            search_input.type(query, delay=100)  # Type with small delay
-            
-            # Wait a moment for the search to complete
-            self.page.wait_for_timeout(500)
-            
-            # Press Enter to submit the search
-            search_input.press("Enter")
-            
-            # Wait for the table to update after search
-            self.page.wait_for_load_state("domcontentloaded")
-            self.page.wait_for_timeout(1000)  # Additional small delay
-            
+            self.search_box.search(query)
             return self
             
         except Exception as e:
@@ -75,7 +71,7 @@ class CostCentersPage:
     def is_item_in_table(self, name: str, timeout: int = 5000) -> bool:
         """Check if a cost center exists in the table"""
         try:
-            self.page.wait_for_selector(f"tr:has-text('{name}')", timeout=timeout)
+            self.watcher.wait_for_row(name, timeout=timeout)
             return True
         except TimeoutError:
             return False
@@ -90,6 +86,7 @@ class CostCentersPage:
         Returns:
             bool: True if deletion was successful, False otherwise
         """
+        confirmation = None
         try:
             # Find the row containing the cost center name
             row = self.page.locator(f"tr:has-text('{name}')")
@@ -98,25 +95,25 @@ class CostCentersPage:
             menu_button = row.locator("button[aria-haspopup='menu']")
             menu_button.click()
             
-            # Set up a dialog handler to accept the confirmation
-            def handle_dialog(dialog):
-                print(f"Dialog message: {dialog.message}")
-                dialog.accept()  # Clicks 'OK' or 'Delete' on the dialog
-            
-            # Listen for the dialog before clicking delete
-            self.page.on('dialog', handle_dialog)
+            # Queue acceptance of the confirmation before clicking delete
+            confirmation = self.dialogs.accept_next("confirm")
             
             # Click the Delete option from the menu
             self.page.get_by_role("menuitem", name="Delete").click()
             
-            # Wait for the operation to complete
-            self.page.wait_for_load_state("domcontentloaded")
-            self.page.wait_for_timeout(1000)  # Small delay for the update
+            if not self.dialogs.wait_for(confirmation, timeout=10000):
+                print(f"Warning: Delete confirmation dialog for '{name}' was not shown")
+            
+            # Wait for the table to drop the deleted row (the count may not change on a full page)
+            self.watcher.wait_for_row_gone(name, exact=True)
             
+            cleanup_registry.mark_deleted("cost_center", name)
             print(f"Successfully deleted cost center: {name}")
             return True
             
         except Exception as e:
+            if confirmation is not None:
+                self.dialogs.cancel(confirmation)
             print(f"Error deleting cost center '{name}': {str(e)}")
             return False
             
@@ -125,11 +122,34 @@ class CostCentersPage:
         self.page.fill('input#name', name)
         return self
         
-    def submit_form(self):
-        """Submit the cost center form"""
+    def submit_form(self, timeout: int = 10000):
+        """Submit the cost center form
+        
+        Only a successful create response registers the cost center for cleanup;
+        submits the app rejects (validation errors, XSS payloads) are not registered.
+        """
         # Using exact button text match for reliability
         submit_button = self.page.get_by_role("button", name="Add cost center", exact=True)
-        submit_button.click()
+        name = self.name_input.input_value()
+        clicked = False
+        try:
+            with self.page.expect_response(
+                lambda response:
+                    'cost-centers' in response.url and
+                    response.request.method == 'POST',
+                timeout=timeout
+            ) as response_info:
+                submit_button.click()
+                clicked = True
+            
+            # Deleted at session end unless the test removes it itself
+            if response_info.value.ok and name:
+                cleanup_registry.register("cost_center", name, origin=self.base_url,
+                                          source=type(self).__name__)
+        except TimeoutError:
+            if not clicked:
+                raise
+            # Rejected before any request was sent (client-side validation)
         self.page.wait_for_load_state("domcontentloaded")
         return self
         
@@ -197,12 +217,9 @@ class CostCentersPage:
             raise
             
     def simple_search(self, query: str):
-        """Simpler implementation of search with the given query"""
+        """Simpler implementation of search with the given query (without pressing Enter)"""
         try:
-            self.search_input.fill(query)
-            self.page.wait_for_load_state("domcontentloaded")
-            # Add a small delay to ensure search completes
-            self.page.wait_for_timeout(1000)
+            self.search_box.search(query, submit=False)
         except Exception as e:
             print(f"Error during simple search for '{query}': {e}")
             raise
@@ -1,28 +1,52 @@
 from playwright.sync_api import Page, expect, TimeoutError
 import time
 import re
+from pages.base_page import BasePage, LazyLocator
+from tests.page_components.dropdown_component import DropdownComponent
 from tests.page_components.table_component import TableComponent
+from tests.page_components.search_component import SearchComponent
+from tests.page_components.table_watcher import TableWatcher
+from tests.utils.cleanup_registry import cleanup_registry
 
-class ExpenseTypesPage:
-    def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://wize-invoice-dev-front.octaprimetech.com/expense-type"
-        self.table = TableComponent(page)
+class ExpenseTypesPage(BasePage):
+    path = "/expense-type"
+    
+    heading = LazyLocator("h1:has-text('Expense Types')")
+    new_expense_type_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="New Expense Type"))
+    search_input = LazyLocator(lambda self: self.page.get_by_placeholder("Search expense types..."))
+    name_input = LazyLocator('input#name')
+    cost_center_dropdown = LazyLocator('button[role="combobox"]')
+    modal = LazyLocator("div[data-slot='card']")
+    cost_center_select = LazyLocator(lambda self: DropdownComponent(
+        self.page, self.cost_center_dropdown.first, "cost_centers", api_url_parts=("cost-centers",),
+        metric_name="expense_types.cost_center.select"))
+    
+    ready_indicator = LazyLocator(lambda self: self.heading)
+    
+    # Shared by the table component and the watcher
+    table_selector = 'table[data-slot="table"]'
+    
+    def __init__(self, page: Page, base_url: str = None):
+        super().__init__(page, base_url)
+        self.table = TableComponent(page, table_selector=self.table_selector)
+        self.watcher = TableWatcher(page, table_selector=self.table_selector)
+        self.search_box = SearchComponent(page, self.search_input, "expense-type", self.watcher,
+                                          metric_name="expense_types.search.latency")
         
     def navigate(self):
         self.page.goto(self.url)
-        self.page.wait_for_selector("h1:has-text('Expense Types')")
+        self.heading.wait_for()
         
     def click_new_expense_type(self):
-        self.page.get_by_role("button", name="New Expense Type").click()
+        self.new_expense_type_btn.click()
         
     def get_modal_create_new_expense_type(self):
         """Get the modal for creating a new expense type"""
-        return self.page.locator("div[data-slot='card']")
+        return self.modal
     
     def get_modal_edit_expense_type(self):
         """Get the modal for editing an expense type"""
-        return self.page.locator("div[data-slot='card']")
+        return self.modal
         
     def fill_name_field(self, name: str):
         """Fill only the name field in the expense type form"""
@@ -30,17 +54,14 @@ class ExpenseTypesPage:
         return self
         
     def search(self, query: str):
-        """Search for an expense type by name"""
-        search_input = self.page.get_by_placeholder("Search expense types...")
-        search_input.fill(query)
-        search_input.press("Enter")
-        self.page.wait_for_load_state("domcontentloaded")
+        """Search for an expense type by name and wait for the matching results"""
+        self.search_box.search(query)
         return self
         
     def is_item_in_table(self, name: str, timeout: int = 5000) -> bool:
         """Check if an expense type exists in the table"""
         try:
-            self.page.wait_for_selector(f"tr:has-text('{name}')", timeout=timeout)
+            self.watcher.wait_for_row(name, timeout=timeout)
             return True
         except TimeoutError:
             return False
@@ -55,8 +76,9 @@ class ExpenseTypesPage:
             # Confirm deletion in the dialog
             self.page.get_by_role("button", name=re.compile("delete", re.IGNORECASE)).click()
             
-            # Wait for the operation to complete
-            self.page.wait_for_load_state("domcontentloaded")
+            # Wait for the table to drop the deleted row (the count may not change on a full page)
+            self.watcher.wait_for_row_gone(name, exact=True)
+            cleanup_registry.mark_deleted("expense_type", name)
             return True
         except Exception as e:
             print(f"Error deleting expense type {name}: {str(e)}")
@@ -69,81 +91,13 @@ class ExpenseTypesPage:
             cost_center: Optional cost center to select. If None, will select the first available option
         """
         try:
-            print("\n=== Starting to fill cost center field ===")
-            
-            # Wait for the dropdown to be clickable
-            self.page.wait_for_selector('button[role="combobox"]', state='visible', timeout=10000)
-            
-            # Click the dropdown to open it
-            self.page.click('button[role="combobox"]')
-            
-            # Wait for the dropdown options to be visible
-            self.page.wait_for_selector('div[role="listbox"]', state='visible', timeout=10000)
-            
-            # Select the first available option
-            first_option = self.page.locator('div[role="option"]').first
-            first_option.click()
-            
-            # Wait for the selection to be applied
-            self.page.wait_for_timeout(500)
+            self.cost_center_select.select(cost_center)
             return self
             
         except Exception as e:
             print(f"Error selecting cost center: {str(e)}")
             self.page.screenshot(path="test-results/cost_center_selection_error.png")
             raise
-            
-        try:
-            if cost_center:
-                # Select the specified cost center
-                option_selector = f'div[role="option"]:has-text("{cost_center}"):visible'
-                self.page.wait_for_selector(option_selector, state='visible', timeout=10000)
-                option = self.page.locator(option_selector)
-                option.click()
-            else:
-                # Since the options are in a hidden select element, we'll use a different approach
-                # First, wait for the select element to be present in the DOM
-                select_selector = 'select[aria-hidden="true"]'
-                self.page.wait_for_selector(select_selector, state='attached', timeout=10000)
-                
-                # Select the first available option
-                first_option_value = self.page.evaluate('''() => {
-                    const select = document.querySelector('select[aria-hidden]');
-                    return select ? select.querySelector('option')?.value : null;
-                }''')
-                
-                if not first_option_value:
-                    raise Exception("Could not find any options in the cost center dropdown")
-                
-                # Set the value using JavaScript since the select is hidden
-                self.page.evaluate(f'''() => {{
-                    const select = document.querySelector('select[aria-hidden]');
-                    if (select) select.value = '{first_option_value}';
-                    // Trigger change event
-                    const event = new Event('change', {{ bubbles: true }});
-                    select?.dispatchEvent(event);
-                }}''')
-                
-            # Wait for the selection to be applied
-            self.page.wait_for_timeout(500)
-            return self
-            
-            # Select the first available option
-            first_option_selector = f'{listbox_selector} div[role="option"]:visible'
-            self.page.wait_for_selector(first_option_selector, state='visible', timeout=10000)
-            first_option = self.page.locator(first_option_selector).first
-            
-            if first_option.is_visible():
-                first_option.click()
-                self.page.wait_for_timeout(500)  # Small delay for the selection to take effect
-                return self
-                
-            raise Exception("No cost center options available in the dropdown")
-                
-        except Exception as e:
-            print("Error selecting dropdown option:", str(e))
-            self.page.screenshot(path="dropdown_selection_error.png")
-            raise
     
     def fill_expense_type_form(self, name: str, cost_center: str = None):
         """Fill the expense type form with the given name and optionally select a cost center
@@ -154,7 +108,7 @@ class ExpenseTypesPage:
         """
         try:
             # Wait for the name input to be ready
-            name_field = self.page.locator('input#name')
+            name_field = self.name_input
             name_field.wait_for(state='visible', timeout=10000)
             
             # Clear the field first (in case of any existing value)
@@ -171,7 +125,7 @@ class ExpenseTypesPage:
                 self.fill_cost_center_field(cost_center)
             else:
                 # Wait for the dropdown to be ready
-                dropdown = self.page.locator('button[role="combobox"]')
+                dropdown = self.cost_center_dropdown
                 dropdown.wait_for(state='visible', timeout=5000)
                 
                 # Select the first available option
@@ -238,6 +192,7 @@ class ExpenseTypesPage:
                 return False
             else:
                 # For successful submissions, wait for the API response
+                name = self.name_input.input_value()
                 with self.page.expect_response(
                     lambda response: 
                         'expense-type' in response.url and 
@@ -246,6 +201,10 @@ class ExpenseTypesPage:
                 ) as response_info:
                     submit_button.click()
                 
+                if response_info.value.request.method == 'POST' and response_info.value.ok:
+                    cleanup_registry.register("expense_type", name, origin=self.base_url,
+                                              source=type(self).__name__)
+                
                 # Wait for any loading states to complete
                 self.wait_for_loading_animation_to_disappear(timeout=timeout)
                 
@@ -423,18 +382,12 @@ class ExpenseTypesPage:
         
         return True  # If we get here, no loading indicators were found
     def clear_search(self):
-        """Clear the search field"""
-        search = self.page.get_by_placeholder("Search expense types...")
-        search.clear()
-        search.press("Enter")
-        self.page.wait_for_timeout(500)  # Short wait for the clear to take effect
+        """Clear the search field and wait for the unfiltered results"""
+        self.search_box.search("")
         
     def search_expense_type(self, name: str):
-        """Search for an expense type by name"""
-        search = self.page.get_by_placeholder("Search expense types...")
-        search.fill(name)
-        search.press("Enter")
-        self.page.wait_for_timeout(1000)  # Wait for search results
+        """Search for an expense type by name and wait for the matching results"""
+        self.search_box.search(name)
     
     def wait_for_expense_type_in_table(self, name: str, timeout: float = 15000):
         """Wait for an expense type to appear in the table and return its row
@@ -449,47 +402,14 @@ class ExpenseTypesPage:
         Raises:
             TimeoutError: If the expense type doesn't appear within the timeout
         """
-        start_time = time.time()
-        last_error = None
-        
-        while (time.time() - start_time) * 1000 < timeout:
-            try:
-                # First ensure any loading is complete
-                self.wait_for_loading_animation_to_disappear(timeout=2000)
-                
-                # Try to find the row
-                row = self.table.wait_for_row_with_text(name, timeout=2000)
-                if row:
-                    return row
-                    
-            except Exception as e:
-                last_error = e
-                # If we get here, the row wasn't found yet
-                # Refresh the table by triggering a search with the current search term
-                try:
-                    search_input = self.page.get_by_placeholder("Search expense types...")
-                    if search_input.is_visible():
-                        current_search = search_input.input_value()
-                        search_input.fill(current_search)
-                        search_input.press("Enter")
-                        self.page.wait_for_timeout(500)  # Small delay for search to trigger
-                except:
-                    pass  # Ignore errors during refresh
-                
-                # Wait a bit before retrying
-                self.page.wait_for_timeout(500)
-        
-        # If we get here, we've timed out
-        print(f"Timed out waiting for expense type '{name}' to appear in table")
-        if last_error:
-            print(f"Last error: {str(last_error)}")
-        
-        # One final attempt to get the row to include in the error
         try:
-            return self.table.wait_for_row_with_text(name, timeout=1000)
-        except Exception as e:
+            self.watcher.wait_for_row(name, timeout=timeout)
+        except TimeoutError as e:
+            print(f"Timed out waiting for expense type '{name}' to appear in table")
             raise TimeoutError(f"Expense type '{name}' did not appear in the table within {timeout}ms") from e
         
+        return self.table.get_row_by_text(name)
+        
     def get_expense_types_list(self):
         """Get the list of all expense types from the table"""
         return self.table.get_all_rows_data()
@@ -500,22 +420,14 @@ class ExpenseTypesPage:
         return rows[0]['name'] if rows else None
         
     def delete_first_expense_type(self):
-        # Set up a flag to track if the dialog was handled
-        dialog_handled = False
-        
-        def handle_dialog(dialog):
-            nonlocal dialog_handled
-            print(f"Dialog message: {dialog.message}")
-            dialog.accept()  # Clicks 'OK' or 'Delete' on the dialog
-            dialog_handled = True
-        
-        # Listen for the dialog before any actions that might trigger it
-        self.page.once('dialog', handle_dialog)
+        # Queue acceptance of the confirmation before any action that might trigger it
+        confirmation = self.dialogs.accept_next("confirm")
         
         try:
             # Click the three dots menu
             menu_button = self.page.locator("button[aria-haspopup='menu']").nth(1)
             menu_button.wait_for(state='visible')
+            name = self.table.get_row_data(menu_button.locator("xpath=ancestor::tr[1]"))['name']
             menu_button.click()
             
             # Click delete
@@ -524,17 +436,14 @@ class ExpenseTypesPage:
             delete_option.click()
             
             # Wait for the dialog to be handled
-            start_time = time.time()
-            while not dialog_handled and (time.time() - start_time) < 10:  # Wait up to 10 seconds
-                self.page.wait_for_timeout(100)
-                
-            if not dialog_handled:
+            if not self.dialogs.wait_for(confirmation, timeout=10000):
                 print("Warning: Delete confirmation dialog was not handled")
                 
-            # Wait for the operation to complete
-            self.page.wait_for_timeout(1000)
+            # Wait for the table to drop the deleted row (the count may not change on a full page)
+            self.watcher.wait_for_row_gone(name, exact=True)
             
         except Exception as e:
+            self.dialogs.cancel(confirmation)
             print(f"Error during expense type deletion: {str(e)}")
             self.page.screenshot(path="delete_expense_type_error.png")
             raise
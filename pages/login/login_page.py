@@ -1,6 +1,7 @@
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, LazyLocator
 
-class LoginPage:
+class LoginPage(BasePage):
     # Locators
     _SIGN_UP_LINK = r'a.text-sm.font-medium.text-\[\#11A193\]:has-text("Sign Up")'
     _EMAIL_INPUT = "input#email"
@@ -9,22 +10,17 @@ class LoginPage:
     _FORGOT_PASSWORD_LINK = "a:has-text('Forgot Password')"
     _ERROR_MESSAGE = ".text-red-500"
 
-    def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://wize-invoice-dev-front.octaprimetech.com/login"
-        
-        # Page elements
-        self._sign_up_link_locator = self._SIGN_UP_LINK
-        self.email_input = page.locator(self._EMAIL_INPUT)
-        self.password_input = page.locator(self._PASSWORD_INPUT)
-        self.login_button = page.locator(self._LOGIN_BUTTON)
-        self.forgot_password_link = page.locator(self._FORGOT_PASSWORD_LINK)
-        self.error_message = page.locator(self._ERROR_MESSAGE)
-        
-    @property
-    def sign_up_link(self):
-        """Get the sign up link locator."""
-        return self.page.locator(self._sign_up_link_locator)
+    path = "/login"
+    
+    # Page elements
+    sign_up_link = LazyLocator(_SIGN_UP_LINK)
+    email_input = LazyLocator(_EMAIL_INPUT)
+    password_input = LazyLocator(_PASSWORD_INPUT)
+    login_button = LazyLocator(_LOGIN_BUTTON)
+    forgot_password_link = LazyLocator(_FORGOT_PASSWORD_LINK)
+    error_message = LazyLocator(_ERROR_MESSAGE)
+    
+    ready_indicator = LazyLocator(_EMAIL_INPUT)
     
     def navigate(self):
         """Navigate to the login page."""
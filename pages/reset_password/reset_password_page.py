@@ -1,30 +1,32 @@
 import time
 from playwright.sync_api import Page, expect
+from pages.base_page import BasePage, LazyLocator
 
-class ResetPasswordPage:
-    def __init__(self, page: Page):
-        self.page = page
-        
-        # Locators for Reset Password Page
-        self.email_input = page.locator("input#email[type='email']")
-        self.send_code_btn = page.get_by_role("button", name="Send Code")
-        self.back_to_login_link = page.get_by_text("Back to Login")
-        
-        # Success and loading messages
-        self.success_message = page.locator("p.text-sm.font-medium")
-        self.loading_message = page.locator("div.bg-green-50.border-green-200.text-green-700 p.font-medium")
-        
-        # OTP Verification Locators
-        self.otp_input = page.locator("input#otp")
-        self.verify_btn = page.get_by_role("button", name="Verify")
-        
-        # New Password Locators
-        self.new_password_input = page.locator("input#newPassword")
-        self.confirm_password_input = page.locator("input#confirmPassword")
-        self.reset_password_btn = page.get_by_role("button", name="Reset Password")
-        
-        # Success message after password reset
-        self.reset_success_message = page.locator("p.text-sm.font-medium:has-text('Password has been reset successfully')")
+class ResetPasswordPage(BasePage):
+    path = "/reset-password"
+    
+    # Locators for Reset Password Page
+    email_input = LazyLocator("input#email[type='email']")
+    send_code_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Send Code"))
+    back_to_login_link = LazyLocator(lambda self: self.page.get_by_text("Back to Login"))
+    
+    # Success and loading messages
+    success_message = LazyLocator("p.text-sm.font-medium")
+    loading_message = LazyLocator("div.bg-green-50.border-green-200.text-green-700 p.font-medium")
+    
+    # OTP Verification Locators
+    otp_input = LazyLocator("input#otp")
+    verify_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Verify"))
+    
+    # New Password Locators
+    new_password_input = LazyLocator("input#newPassword")
+    confirm_password_input = LazyLocator("input#confirmPassword")
+    reset_password_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Reset Password"))
+    
+    # Success message after password reset
+    reset_success_message = LazyLocator("p.text-sm.font-medium:has-text('Password has been reset successfully')")
+    
+    ready_indicator = LazyLocator("input#email[type='email']")
 
     def navigate_to_reset_password(self, base_url: str = None):
         """Navigate to the reset password page.
@@ -35,7 +37,7 @@ class ResetPasswordPage:
         if base_url:
             reset_url = f"{base_url}/reset-password"
         else:
-            reset_url = "/reset-password"
+            reset_url = self.url
             
         self.page.goto(reset_url)
         return self
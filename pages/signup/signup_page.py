@@ -3,6 +3,7 @@ from typing import Optional, Tuple
 import os
 import time
 from dotenv import load_dotenv
+from pages.base_page import BasePage, LazyLocator
 from tests.utils.email_utils import get_latest_otp_imap
 
 # Load environment variables
@@ -12,11 +13,13 @@ load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '../../../.env')
 IMAP_HOST = os.getenv("IMAP_HOST", "imap.gmail.com")
 IMAP_USER = os.getenv("IMAP_USER")
 IMAP_PASS = os.getenv("IMAP_PASS")
+IMAP_PORT = int(os.getenv("IMAP_PORT")) if os.getenv("IMAP_PORT") else None
+IMAP_SSL = os.getenv("IMAP_SSL", "true").lower() != "false"
 
 # Debug IMAP configuration
 print(f"IMAP Configuration - Host: {IMAP_HOST}, User: {IMAP_USER}, Password: {'***' if IMAP_PASS else 'Not set'}")
 
-class SignUpPage:
+class SignUpPage(BasePage):
     # Locators
     _FIRST_NAME = "input#firstName"
     _LAST_NAME = "input#lastName"
@@ -37,90 +40,39 @@ class SignUpPage:
     _SAVE_INFO_CHECKBOX = "input#enableStripePass"
     _TERMS_CONSENT_CHECKBOX = "input#termsOfServiceConsentCheckbox"
     _SUBMIT_PAYMENT_BUTTON = "button[data-testid='hosted-payment-submit-button']"
+    _PAYMENT_PHONE_INPUT = "input#phoneNumber"
+    _PAYMENT_ERROR_MESSAGE = "[role='alert']"
+    _AUTHORIZE_3DS_BUTTON = "button#test-source-authorize-3ds"
+    _FAIL_3DS_BUTTON = "button#test-source-fail-3ds"
 
-    def __init__(self, page: Page):
-        self.page = page
-        self.url = "https://wize-invoice-dev-front.octaprimetech.com/create-account"
-        
-        # Store locator selectors instead of locators to avoid stale element references
-        self._first_name_selector = self._FIRST_NAME
-        self._last_name_selector = self._LAST_NAME
-        self._email_selector = self._EMAIL
-        self._verify_email_btn_selector = self._VERIFY_EMAIL_BTN
-        self._password_selector = self._PASSWORD
-        self._confirm_password_selector = self._CONFIRM_PASSWORD
-        self._create_account_btn_selector = self._CREATE_ACCOUNT_BTN
-        self._email_verification_code_input_selector = self._EMAIL_VERIFICATION_CODE_INPUT
-        self._email_verification_check_btn_selector = self._EMAIL_VERIFICATION_CHECK_BTN
-
-    @property
-    def first_name(self):
-        return self.page.locator(self._first_name_selector)
-        
-    @property
-    def last_name(self):
-        return self.page.locator(self._last_name_selector)
-        
-    @property
-    def email(self):
-        return self.page.locator(self._email_selector)
-        
-    @property
-    def verify_email_btn(self):
-        return self.page.locator(self._verify_email_btn_selector)
-        
-    @property
-    def password(self):
-        return self.page.locator(self._password_selector)
-        
-    @property
-    def confirm_password(self):
-        return self.page.locator(self._confirm_password_selector)
-        
-    @property
-    def create_account_btn(self):
-        return self.page.locator(self._create_account_btn_selector)
-        
-    @property
-    def email_verification_code_input(self):
-        return self.page.locator(self._email_verification_code_input_selector)
-        
-    @property
-    def email_verification_check_btn(self):
-        return self.page.locator(self._email_verification_check_btn_selector)
-    
-        # Payment method properties
-    @property
-    def card_radio_button(self):
-        return self.page.locator(self._CARD_RADIO_BUTTON)
-    
-    @property
-    def card_number_input(self):
-        return self.page.locator(self._CARD_NUMBER_INPUT)
-    
-    @property
-    def card_expiry_input(self):
-        return self.page.locator(self._CARD_EXPIRY_INPUT)
-    
-    @property
-    def card_cvc_input(self):
-        return self.page.locator(self._CARD_CVC_INPUT)
-    
-    @property
-    def cardholder_name_input(self):
-        return self.page.locator(self._CARDHOLDER_NAME_INPUT)
-    
-    @property
-    def save_info_checkbox(self):
-        return self.page.locator(self._SAVE_INFO_CHECKBOX)
-    
-    @property
-    def terms_consent_checkbox(self):
-        return self.page.locator(self._TERMS_CONSENT_CHECKBOX)
-    
-    @property
-    def submit_payment_button(self):
-        return self.page.locator(self._SUBMIT_PAYMENT_BUTTON)
+    path = "/create-account"
+
+    # Page elements
+    first_name = LazyLocator(_FIRST_NAME)
+    last_name = LazyLocator(_LAST_NAME)
+    email = LazyLocator(_EMAIL)
+    verify_email_btn = LazyLocator(_VERIFY_EMAIL_BTN)
+    password = LazyLocator(_PASSWORD)
+    confirm_password = LazyLocator(_CONFIRM_PASSWORD)
+    create_account_btn = LazyLocator(_CREATE_ACCOUNT_BTN)
+    email_verification_code_input = LazyLocator(_EMAIL_VERIFICATION_CODE_INPUT)
+    email_verification_check_btn = LazyLocator(_EMAIL_VERIFICATION_CHECK_BTN)
+
+    # Payment method elements
+    card_radio_button = LazyLocator(_CARD_RADIO_BUTTON)
+    card_number_input = LazyLocator(_CARD_NUMBER_INPUT)
+    card_expiry_input = LazyLocator(_CARD_EXPIRY_INPUT)
+    card_cvc_input = LazyLocator(_CARD_CVC_INPUT)
+    cardholder_name_input = LazyLocator(_CARDHOLDER_NAME_INPUT)
+    save_info_checkbox = LazyLocator(_SAVE_INFO_CHECKBOX)
+    terms_consent_checkbox = LazyLocator(_TERMS_CONSENT_CHECKBOX)
+    submit_payment_button = LazyLocator(_SUBMIT_PAYMENT_BUTTON)
+    payment_phone_input = LazyLocator(_PAYMENT_PHONE_INPUT)
+    payment_error_message = LazyLocator(_PAYMENT_ERROR_MESSAGE)
+    authorize_3ds_button = LazyLocator(_AUTHORIZE_3DS_BUTTON)
+    fail_3ds_button = LazyLocator(_FAIL_3DS_BUTTON)
+
+    ready_indicator = LazyLocator(_FIRST_NAME)
 
     def navigate(self):
         self.page.goto(self.url)
@@ -154,40 +106,46 @@ class SignUpPage:
         """
         Retrieve OTP from email using IMAP
         
+        The mailbox connection is kept for the session and woken by IMAP IDLE, so a
+        single wait covers the whole time budget; attempts are only repeated after
+        connection errors.
+        
         Args:
             email: Email address to check for OTP
-            max_attempts: Maximum number of attempts to try getting OTP
-            poll_interval: Time in seconds to wait between attempts
+            max_attempts: Maximum number of connection attempts (each allows 30 seconds of waiting)
+            poll_interval: Time in seconds to wait before retrying after a connection error
             
         Returns:
             Tuple of (success: bool, otp: str)
         """
         if not all([IMAP_USER, IMAP_PASS]):
             return False, "IMAP credentials not configured"
-            
+        
+        deadline = time.time() + max_attempts * 30
         for attempt in range(1, max_attempts + 1):
-            print(f"Attempt {attempt}/{max_attempts} to retrieve OTP...")
             try:
                 otp = get_latest_otp_imap(
                     imap_host=IMAP_HOST,
                     username=IMAP_USER,
                     password=IMAP_PASS,
                     email_to=email,
-                    timeout_sec=30
+                    timeout_sec=max(1, deadline - time.time()),
+                    port=IMAP_PORT,
+                    use_ssl=IMAP_SSL
                 )
+                print(f"Successfully retrieved OTP: {otp}")
+                return True, otp
                 
-                if otp:
-                    print(f"Successfully retrieved OTP: {otp}")
-                    return True, otp
-                    
-                print(f"OTP not found yet, waiting {poll_interval} seconds...")
+            except TimeoutError as e:
+                return False, str(e)
+            except ConnectionError as e:
+                print(f"Error retrieving OTP (attempt {attempt}/{max_attempts}): {str(e)}")
+                if attempt == max_attempts or time.time() >= deadline:
+                    return False, f"Failed to retrieve OTP after {attempt} attempts: {str(e)}"
                 time.sleep(poll_interval)
-                
             except Exception as e:
-                print(f"Error retrieving OTP: {str(e)}")
-                if attempt == max_attempts:
-                    return False, f"Failed to retrieve OTP after {max_attempts} attempts: {str(e)}"
-                time.sleep(poll_interval)
+                # Rejected credentials and other errors that a retry will not fix
+                return False, f"Failed to retrieve OTP: {str(e)}"
                 
         return False, f"Failed to retrieve OTP after {max_attempts} attempts"
 
@@ -209,7 +167,21 @@ class SignUpPage:
         Set up payment method with the provided data.
         """
         print("Setting up payment method...")
+        self.fill_payment_method(payment_data)
+        
+        # Submit the payment form
+        with self.page.expect_navigation(timeout=30000):
+            self.submit_payment_button.click()
+        print("Submitted payment form")
         
+        # Verify we're back on the signup page
+        #assert "/create-account" in self.page.url
+        #print("Successfully completed payment setup and returned to signup page")
+
+    def fill_payment_method(self, payment_data):
+        """
+        Fill in the hosted payment form without submitting it.
+        """
         # Click the card payment radio button using the provided XPath
         card_radio = self.page.locator('//input[@id="payment-method-accordion-item-title-card"]')
         card_radio.wait_for(state="visible", timeout=5000)
@@ -231,20 +203,23 @@ class SignUpPage:
         self.save_info_checkbox.check()
 
         # Fill in phone number
-        phone_input = self.page.locator('input#phoneNumber')
-        phone_input.wait_for(state="visible", timeout=10000)
-        phone_input.fill(payment_data["phone_number"])
+        self.payment_phone_input.wait_for(state="visible", timeout=10000)
+        self.payment_phone_input.fill(payment_data["phone_number"])
         print("Filled in phone number")
 
         # Check checkboxes
         self.terms_consent_checkbox.check()
         print("Checked required checkboxes")
-        
-        # Submit the payment form
-        with self.page.expect_navigation(timeout=30000):
-            self.submit_payment_button.click()
-        print("Submitted payment form")
-        
-        # Verify we're back on the signup page
-        #assert "/create-account" in self.page.url
-        #print("Successfully completed payment setup and returned to signup page")
\ No newline at end of file
+
+    def complete_3ds_challenge(self, approve: bool = True):
+        """
+        Complete (or fail) the 3D Secure challenge shown for cards that require it.
+        """
+        button = self.authorize_3ds_button if approve else self.fail_3ds_button
+        button.wait_for(state="visible", timeout=10000)
+        if approve:
+            with self.page.expect_navigation(timeout=30000):
+                button.click()
+        else:
+            button.click()
+        print(f"{'Completed' if approve else 'Failed'} 3D Secure challenge")
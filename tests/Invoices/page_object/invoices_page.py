@@ -1,71 +1,85 @@
 import os
 import time
-from playwright.sync_api import Page, expect
+from typing import Union
+from playwright.sync_api import FilePayload, Page, expect
+from pages.base_page import BasePage, LazyLocator
+from tests.page_components.dropdown_component import DropdownComponent
 from tests.page_components.table_component import TableComponent
+from tests.page_components.upload_tracker import UploadTracker
 
-class InvoicesPage:
-    def __init__(self, page: Page):
-        self.page = page
-        from tests.config.test_config import URLS
-        self.url = URLS["INVOICES"]
-        self.table = TableComponent(page, table_selector='table[data-slot="table"]')
-        
-        # Common locators based on DOM
-        self.search_input = page.locator("input[placeholder='Search invoices...']")
-        self.refresh_btn = page.get_by_role("button", name="Refresh")
-        self.new_invoice_btn = page.get_by_role("button", name="New Invoice")
-        
-        # Counter locator based on DOM
-        self.total_invoices_counter = page.locator("div:has-text('Total Invoices') + div.text-2xl.font-bold")
-        
-        # Table headers based on DOM
-        self.table_headers = {
-            "name": "Name",
-            "expense_type": "Expense Type",
-            "type": "Type",
-            "date_added": "Date Added",
-            "actions": "Actions"
-        }
-        
-        # New Invoice Overlay locators
-        self.overlay = {
-            'container': page.locator('div[data-slot="card"]').filter(has_text='New Invoice'),
-            'title': page.locator('div[data-slot="card-title"]:has-text("New Invoice")'),
-            'close_btn': page.locator('div[data-slot="card-title"] svg.lucide-x'),
-            'description': page.locator('div[data-slot="card-description"]'),
-            'cost_center_dropdown': {
-                'trigger': page.locator('button[aria-controls^="radix-"][aria-expanded]').nth(0),
-                'value': 'Select a cost center'
-            },
-            'expense_type_dropdown': {
-                'trigger': page.locator('button[aria-controls^="radix-"][aria-expanded]').nth(1),
-                'value': 'Select a cost center first',
-                'disabled': True
-            },
-            'type_radio': {
-                'debit': page.locator('input[type="radio"][value="Debit"]'),
-                'credit': page.locator('input[type="radio"][value="Credit"]')
-            },
-            'file_upload': {
-                'input': page.locator('input[type="file"]'),
-                'select_files_btn': page.locator('button:has-text("Select Files")'),
-                'uploaded_files_section': page.locator('//div[@class="mt-4 space-y-2"]'),
-                'drop_zone': page.locator('label[for="file"]'),
-                'drop_text': page.locator('label[for="file"] span:has-text("Click to upload or drag and drop")'),
-                'selected_files_section': page.locator('div.text-sm.font-medium:has-text("Selected Files") + div'),
-                'selected_files': page.locator('div.flex.items-center.justify-between.p-2.bg-blue-50.rounded-md'),
-                'file_name': page.locator('div.text-sm.font-medium.text-blue-700'),
-                'file_size': page.locator('div.text-xs.text-blue-600'),
-                'remove_file_btn': page.locator('button:has(svg.lucide-trash-2)'),
-                'file_icon': page.locator('svg.lucide-file-text')
-            },
-            'warning_messages': {
-                'file_already_selected': page.locator('div.bg-red-50.border-red-200.text-red-800:has-text("File already selected")')
-            },
-            'cancel_btn': page.locator('button:has-text("Cancel")'),
-            'add_invoice_btn': page.locator('button:has-text("Add Invoice")'),
-            'error_message': page.locator('div.bg-red-50.border-red-200.text-red-800:has-text("Failed to fetch")')
-        }
+class InvoicesPage(BasePage):
+    path = "/invoices"
+    
+    # Common locators based on DOM
+    search_input = LazyLocator("input[placeholder='Search invoices...']")
+    refresh_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="Refresh"))
+    new_invoice_btn = LazyLocator(lambda self: self.page.get_by_role("button", name="New Invoice"))
+    
+    # Counter locator based on DOM
+    total_invoices_counter = LazyLocator("div:has-text('Total Invoices') + div.text-2xl.font-bold")
+    
+    # Table headers based on DOM
+    table_headers = {
+        "name": "Name",
+        "expense_type": "Expense Type",
+        "type": "Type",
+        "date_added": "Date Added",
+        "actions": "Actions"
+    }
+    
+    # New Invoice Overlay locators, built on first use
+    overlay = LazyLocator(lambda self: {
+        'container': self.page.locator('div[data-slot="card"]').filter(has_text='New Invoice'),
+        'title': self.page.locator('div[data-slot="card-title"]:has-text("New Invoice")'),
+        'close_btn': self.page.locator('div[data-slot="card-title"] svg.lucide-x'),
+        'description': self.page.locator('div[data-slot="card-description"]'),
+        'cost_center_dropdown': {
+            'trigger': self.page.locator('button[aria-controls^="radix-"][aria-expanded]').nth(0),
+            'value': 'Select a cost center'
+        },
+        'expense_type_dropdown': {
+            'trigger': self.page.locator('button[aria-controls^="radix-"][aria-expanded]').nth(1),
+            'value': 'Select a cost center first',
+            'disabled': True
+        },
+        'type_radio': {
+            'debit': self.page.locator('input[type="radio"][value="Debit"]'),
+            'credit': self.page.locator('input[type="radio"][value="Credit"]')
+        },
+        'file_upload': {
+            'input': self.page.locator('input[type="file"]'),
+            'select_files_btn': self.page.locator('button:has-text("Select Files")'),
+            'uploaded_files_section': self.page.locator('//div[@class="mt-4 space-y-2"]'),
+            'drop_zone': self.page.locator('label[for="file"]'),
+            'drop_text': self.page.locator('label[for="file"] span:has-text("Click to upload or drag and drop")'),
+            'selected_files_section': self.page.locator('div.text-sm.font-medium:has-text("Selected Files") + div'),
+            'selected_files': self.page.locator('div.flex.items-center.justify-between.p-2.bg-blue-50.rounded-md'),
+            'file_name': self.page.locator('div.text-sm.font-medium.text-blue-700'),
+            'file_size': self.page.locator('div.text-xs.text-blue-600'),
+            'remove_file_btn': self.page.locator('button:has(svg.lucide-trash-2)'),
+            'file_icon': self.page.locator('svg.lucide-file-text')
+        },
+        'warning_messages': {
+            'file_already_selected': self.page.locator('div.bg-red-50.border-red-200.text-red-800:has-text("File already selected")')
+        },
+        'cancel_btn': self.page.locator('button:has-text("Cancel")'),
+        'add_invoice_btn': self.page.locator('button:has-text("Add Invoice")'),
+        'error_message': self.page.locator('div.bg-red-50.border-red-200.text-red-800:has-text("Failed to fetch")')
+    })
+    
+    # Overlay dropdowns, built with the overlay on first use
+    cost_center_select = LazyLocator(lambda self: DropdownComponent(
+        self.page, self.overlay['cost_center_dropdown']['trigger'], "cost_centers",
+        api_url_parts=("cost-centers",), metric_name="invoices.cost_center.select"))
+    expense_type_select = LazyLocator(lambda self: DropdownComponent(
+        self.page, self.overlay['expense_type_dropdown']['trigger'], "expense_types",
+        api_url_parts=("expense-type",), metric_name="invoices.expense_type.select"))
+    
+    ready_indicator = LazyLocator(lambda self: self.new_invoice_btn)
+    
+    def __init__(self, page: Page, base_url: str = None):
+        super().__init__(page, base_url)
+        self.table = TableComponent(page)
 
     def navigate(self, url=None):
         """
@@ -174,7 +188,7 @@ class InvoicesPage:
     
     def wait_for_upload_complete(self, filename: str, timeout: float = 30000):
         """
-        Wait for file upload to complete by checking multiple indicators
+        Wait for a selected file to show up in the Selected Files list
         
         Args:
             filename: Name of the file being uploaded (without path)
@@ -183,51 +197,61 @@ class InvoicesPage:
         Returns:
             bool: True if upload is complete, False if timeout
         """
-        timeout_seconds = timeout / 1000  # Convert to seconds
-        start_time = time.time()
+        try:
+            self.get_file_locator_by_name(filename).first.wait_for(state='visible', timeout=timeout)
+            print(f"File upload complete: {filename}")
+            return True
+        except Exception:
+            print(f"Timeout waiting for file upload to complete: {filename}")
+            return False
+
+    def select_files(self, files, timeout: float = 30000, wait: bool = True) -> int:
+        """
+        Add files to the New Invoice form with a single set_input_files call
         
-        # Try multiple ways to detect successful upload
-        while (time.time() - start_time) < timeout_seconds:
-            try:
-                # Check if the file input has the file set
-                file_input = self.page.locator('input[type="file"]#file')
-                input_value = file_input.input_value()
-                if filename in input_value:
-                    print(f"File upload complete: {filename}")
-                    return True
-                    
-                # Check if the filename appears in the UI
-                filename_element = self.page.get_by_text(filename, exact=True).first
-                if filename_element.is_visible():
-                    print(f"File upload complete (UI indicator): {filename}")
-                    return True
-                    
-                # Check for any success/upload complete indicators
-                success_indicators = [
-                    'upload complete',
-                    'file uploaded',
-                    'successfully uploaded'
-                ]
-                
-                for indicator in success_indicators:
-                    if self.page.get_by_text(indicator, exact=False).is_visible():
-                        print(f"File upload complete (success indicator): {indicator}")
-                        return True
-                        
-                # Small delay before next check
-                self.page.wait_for_timeout(500)
-                
-            except Exception as e:
-                # If any check fails, continue trying until timeout
-                print(f"Upload check failed, retrying... Error: {str(e)}")
-                self.page.wait_for_timeout(500)
+        Args:
+            files: File paths and/or in-memory payloads
+                   ({'name': ..., 'mimeType': ..., 'buffer': bytes})
+            timeout: Maximum time to wait in milliseconds for the files to be listed
+            wait: Whether to wait for the files to be listed
+            
+        Returns:
+            int: Number of files listed in the Selected Files section afterwards
+        """
+        files = list(files)
+        if not files:
+            return self.get_uploaded_files_count()
         
-        print(f"Timeout waiting for file upload to complete: {filename}")
-        return False
+        file_input = self.overlay['file_upload']['input'].first
+        selected_files = self.overlay['file_upload']['selected_files']
+        initial_count = selected_files.count()
+        
+        if len(files) == 1 or file_input.evaluate("el => el.multiple"):
+            file_input.set_input_files(files)
+        else:
+            # The input only takes one file at a time; still no file chooser round trips
+            for file in files:
+                file_input.set_input_files(file)
+        
+        if not wait:
+            return selected_files.count()
+        
+        # One wait: all files listed, or the app rejected one of them (duplicate, bad type)
+        expected_count = initial_count + len(files)
+        rejected = self.overlay['warning_messages']['file_already_selected'].or_(
+            self.page.locator('div.bg-red-50:has-text("File type not supported")'))
+        try:
+            selected_files.nth(expected_count - 1).or_(rejected).first.wait_for(state='visible', timeout=timeout)
+        except Exception as e:
+            print(f"Warning: Selected files were not listed within {timeout/1000} seconds: {str(e)}")
+        
+        count = selected_files.count()
+        print(f"Selected {len(files)} file(s), {count} listed in the form")
+        return count
 
     def upload_invoice_file(self, file_path: str, wait_for_complete: bool = True):
         """
-        Upload a file to the invoice form using Playwright's file chooser pattern
+        Add a file to the invoice form by setting it on the file input
         
         Args:
             file_path: Path to the file to upload
@@ -239,16 +263,7 @@ class InvoicesPage:
             filename = os.path.basename(file_path)
             print(f"Uploading file: {filename} ({file_size:.2f} MB)")
             
-            # Use Playwright's file chooser pattern with a more specific locator
-            with self.page.expect_file_chooser() as fc_info:
-                # Click the specific drop zone element that has the text about drag and drop
-                drop_zone = self.page.locator('label[for="file"].cursor-pointer')
-                drop_zone.wait_for(state='visible')
-                drop_zone.click()
-            
-            # Get the file chooser and set the file
-            file_chooser = fc_info.value
-            file_chooser.set_files(file_path)
+            self.overlay['file_upload']['input'].first.set_input_files(file_path)
             
             if wait_for_complete:
                 # Adjust timeout based on file size (1 second per MB, minimum 5 seconds)
@@ -263,6 +278,30 @@ class InvoicesPage:
             # Screenshot on failure is handled by the test framework
             # self.page.screenshot(path="file_upload_error.png")
             raise
+
+    def upload_invoices(self, files, timeout: float = 120000) -> dict:
+        """
+        Select all files at once, submit them and track the upload requests
+        
+        Cost center, expense type and invoice type must already be selected.
+        
+        Args:
+            files: File paths and/or in-memory payloads (see select_files)
+            timeout: Maximum time to wait in milliseconds for all uploads to finish
+            
+        Returns:
+            dict: Upload summary with total bytes, duration, throughput and per-file results
+        """
+        files = list(files)
+        file_count = self.select_files(files)
+        with UploadTracker(self.page) as tracker:
+            self.click_add_invoice(expected_file_count=file_count)
+            tracker.wait_for_files(file_count, timeout=timeout)
+        
+        summary = tracker.summary()
+        print(f"Uploaded {summary['files']} file(s), {summary['bytes']} bytes in "
+              f"{summary['duration_ms']}ms ({summary['throughput_kbps']} KB/s, {summary['failed']} failed)")
+        return summary
             
     def select_invoice_type(self, invoice_type='debit'):
         """
@@ -302,7 +341,7 @@ class InvoicesPage:
         add_invoice_btn.scroll_into_view_if_needed()
         
         # Wait for the button to be clickable
-        self.page.wait_for_timeout(1000)  # Small delay to ensure button is ready
+        expect(add_invoice_btn).to_be_enabled(timeout=30000)
         
         # Click the button
         add_invoice_btn.click()
@@ -317,10 +356,6 @@ class InvoicesPage:
             # Take a screenshot for debugging
             self.page.screenshot(path="overlay_not_hidden.png")
         
-        # Additional wait to ensure everything is settled
-        self.page.wait_for_load_state('networkidle')
-        self.page.wait_for_timeout(1000)  # Small delay for any final UI updates
-        
     def is_overlay_visible(self):
         """Check if the new invoice overlay is visible"""
         return self.overlay['title'].is_visible()
@@ -474,47 +509,20 @@ class InvoicesPage:
         
         Args:
             cost_center_name: (Optional) Name of the cost center to select. If None, selects the first option.
+            
+        Returns:
+            str: Name of the selected cost center
         """
         try:
-            # Click the cost center dropdown
-            dropdown_trigger = self.overlay['cost_center_dropdown']['trigger']
-            dropdown_trigger.click()
-            
-            # Wait for the dropdown items to appear with a longer timeout
-            listbox = self.page.locator('div[role="listbox"]')
-            listbox.wait_for(state='visible', timeout=10000)
-            
-            # Get all available options
-            options = self.page.locator('div[role="option"]').all()
-            if not options:
-                raise ValueError("No cost center options available in the dropdown")
-                
-            # If no specific name provided, select the first option
-            if cost_center_name is None:
-                option = options[0]
-                cost_center_name = option.text_content()
-                print(f"Selecting first available cost center: {cost_center_name}")
-            else:
-                # Try to find the specific option
-                option = self.page.locator(f'div[role="option"]:has-text("{cost_center_name}")').first
-                
-            # Click the option
-            option.scroll_into_view_if_needed()
-            option.click(force=True)
-            
-            # Wait for the dropdown to close
-            listbox.wait_for(state='hidden', timeout=10000)
-            
-            # Small delay to ensure the selection is processed
-            self.page.wait_for_timeout(500)
-            
-            return cost_center_name
+            selected = self.cost_center_select.select(cost_center_name)
+            # The expense type options are filtered by the selected cost center
+            self.expense_type_select.invalidate()
+            print(f"Selected cost center: {selected}")
+            return selected
             
         except Exception as e:
             # Screenshot on failure is handled by the test framework
-            # self.page.screenshot(path="cost_center_selection_error.png")
             print(f"Error selecting cost center: {str(e)}")
-            print(f"Available options: {[el.text_content() for el in self.page.locator('div[role="option"]').all()]}")
             raise
             
     def select_expense_type(self, expense_type_name: str = None):
@@ -523,79 +531,24 @@ class InvoicesPage:
         
         Args:
             expense_type_name: (Optional) Name of the expense type to select. If None, selects the first option.
+                               Falls back to the first option if the name is not found.
+            
+        Returns:
+            str: Name of the selected expense type
         """
         try:
-            print("Clicking expense type dropdown...")
-            # Wait for the dropdown to be clickable and click it
-            self.overlay['expense_type_dropdown']['trigger'].click()
-            
-            # Wait for the dropdown options to be visible with a longer timeout
-            listbox = self.page.locator('div[role="listbox"]')
-            listbox.wait_for(state='visible', timeout=30000)
-            
-            # Wait a moment for options to load
-            self.page.wait_for_timeout(1000)
-            
-            # Get all available options with better error handling
-            options = self.page.locator('div[role="option"]').all()
-            if not options:
-                available_text = self.page.locator('div[role="listbox"]').text_content()
-                raise ValueError(f"No expense type options found in dropdown. Available text: {available_text}")
-            
-            # Log all available options for debugging
-            option_texts = [el.text_content().strip() for el in options]
-            print(f"Available expense types: {option_texts}")
-            
-            # If no specific name provided, select the first option
-            if expense_type_name is None:
-                option = options[0]
-                expense_type_name = option.text_content().strip()
-                print(f"Selecting first available expense type: {expense_type_name}")
-            else:
-                # Try to find the specific option (case insensitive)
-                option = self.page.locator(f'div[role="option"]').filter(has_text=expense_type_name).first
-                if not option.is_visible():
-                    print(f"Expense type '{expense_type_name}' not found. Available options: {option_texts}")
-                    # Fall back to first option if specific one not found
-                    option = options[0]
-                    expense_type_name = option.text_content().strip()
-                    print(f"Falling back to first available expense type: {expense_type_name}")
-            
-            # Click the option with retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    print(f"Attempt {attempt + 1} to select expense type: {expense_type_name}")
-                    option.scroll_into_view_if_needed()
-                    option.click(force=True)
-                    # Verify selection was successful
-                    self.page.wait_for_selector('div[role="listbox"]', state='hidden', timeout=5000)
-                    print(f"Successfully selected expense type: {expense_type_name}")
-                    break
-                except Exception as click_error:
-                    if attempt == max_retries - 1:  # Last attempt
-                        print(f"Failed to select expense type after {max_retries} attempts: {str(click_error)}")
-                        raise
-                    print(f"Retrying selection (attempt {attempt + 1}): {str(click_error)}")
-                    self.page.wait_for_timeout(1000)  # Wait before retry
-            
-            # Small delay to ensure the selection is processed
-            self.page.wait_for_timeout(500)
-            
-            return expense_type_name.strip()
+            selected = self.expense_type_select.select(expense_type_name, fallback_to_first=True,
+                                                       timeout=30000)
+            print(f"Selected expense type: {selected}")
+            return selected
             
         except Exception as e:
             # Take a screenshot for debugging
             screenshot_path = f"expense_type_selection_error_{int(time.time())}.png"
             self.page.screenshot(path=screenshot_path)
             print(f"Screenshot saved as: {screenshot_path}")
-            
-            # Log detailed error information
             print(f"Error selecting expense type: {str(e)}")
-            print(f"Available options: {[el.text_content().strip() for el in self.page.locator('div[role="option"]').all()]}")
             print(f"Page URL: {self.page.url}")
-            print(f"Page title: {self.page.title()}")
-            
             raise
             
     # ===== Multiple File Upload Methods =====
@@ -693,31 +646,30 @@ class InvoicesPage:
         """
         return self.page.locator(f'div.bg-red-50:has-text("{filename}: File type not supported. Please use PDF, JPEG, or PNG.")')
     
-    def upload_multiple_files(self, *file_paths: str, wait_for_complete: bool = True) -> bool:
+    def upload_multiple_files(self, *files: Union[str, FilePayload], wait_for_complete: bool = True) -> bool:
         """
         Upload multiple files to the invoice form.
         
         Args:
-            *file_paths: One or more file paths to upload
+            *files: One or more file paths and/or in-memory payloads
+                    ({'name': ..., 'mimeType': ..., 'buffer': bytes})
             wait_for_complete: Whether to wait for all uploads to complete
             
         Returns:
             bool: True if all files were uploaded successfully, False otherwise
         """
-        if not file_paths:
+        if not files:
             return False
             
         try:
             # Store the current count of uploaded files
             initial_count = self.get_uploaded_files_count()
             
-            # Upload each file
-            for file_path in file_paths:
-                self.upload_invoice_file(file_path, wait_for_complete=wait_for_complete)
+            # Add all files in one go
+            actual_count = self.select_files(files, wait=wait_for_complete)
                 
             # Verify all files were added
-            expected_count = initial_count + len(file_paths)
-            actual_count = self.get_uploaded_files_count()
+            expected_count = initial_count + len(files)
             
             if actual_count != expected_count:
                 print(f"Warning: Expected {expected_count} files, but found {actual_count} files after upload")
@@ -8,22 +8,39 @@ from tests.Invoices.page_object.invoices_page import InvoicesPage
 from pages.expense_types.expense_types_page import ExpenseTypesPage
 from tests.config.test_config import URLS
 from playwright.sync_api import Route
+from tests.utils.invoice_documents import invoice_document, invalid_document, KB, MB
 
 # Get the absolute path to the sample documents
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 SAMPLE_DOC_DIR = os.path.join(BASE_DIR, "sample_doc")
 
-# Define the test files we'll be using
-test_files = [
-    os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", "InvoiceExample_5.png"),
-    os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", "InvoiceExample_5 copy.png"),
-    os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", "InvoiceExample_5 copy 7.png")
-]
+# Upload documents are generated in memory; each scenario name describes how the
+# files of that scenario relate to each other (content, file type and name)
+SAME_CONTENT_SCENARIOS = {
+    "same_file_type_content_but_different_name",
+    "same_file_type_content_and_name",
+    "different_file_type_and_name_but_same_content"
+}
+SMALL_FILE_SIZE = 200 * KB
+LARGE_FILE_SIZE = int(1.5 * MB)  # 8 of these exceed the 10MB upload limit
 
-# Verify the sample documents exist
-for file_path in test_files:
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Required file not found at: {file_path}")
+def sample_documents(scenario: str, file_names: list) -> list:
+    """Generate the documents of an upload scenario as in-memory file payloads"""
+    documents = []
+    for index, rel_path in enumerate(file_names):
+        name = os.path.basename(rel_path)
+        if scenario == "invalid_file_type":
+            documents.append(invalid_document(name))
+            continue
+        size = LARGE_FILE_SIZE if name.startswith("InvoiceExample_5") else SMALL_FILE_SIZE
+        if scenario in SAME_CONTENT_SCENARIOS:
+            seed = scenario
+        else:
+            # Different content also means different sizes
+            seed = f"{scenario}/{rel_path}"
+            size += index * 16 * KB
+        documents.append(invoice_document(name, name.rsplit(".", 1)[-1], size, seed=seed))
+    return documents
 
 @pytest.mark.invoices
 class TestMultipleFileUploads:
@@ -154,11 +171,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files using the page object method
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", file_name)
-            for file_name in self.TEST_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_content_but_different_name", self.TEST_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -197,11 +211,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files using the page object method
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", file_name)
-            for file_name in self.TEST_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_content_but_different_name", self.TEST_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -242,16 +253,13 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload the same file twice using the page object method
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_and_name", file_name)
-            for file_name in DUPLICATE_FILES
-        ]
+        files = sample_documents("same_file_type_content_and_name", DUPLICATE_FILES)
         
         # First upload
-        self.invoices_page.upload_multiple_files(file_paths[0])
+        self.invoices_page.upload_multiple_files(files[0])
         
         # Second upload of the same file
-        self.invoices_page.upload_multiple_files(file_paths[1])
+        self.invoices_page.upload_multiple_files(files[1])
         
         # 7. Verify the warning message is shown for duplicate file
         expect(self.invoices_page.overlay['warning_messages']['file_already_selected']).to_be_visible(timeout=10000), \
@@ -263,7 +271,7 @@ class TestMultipleFileUploads:
             f"Expected 1 file to be displayed, but found {len(uploaded_files)}"
             
         # 9. Verify the file is displayed in the selected files section
-        file_name = os.path.basename(file_paths[0])  # Get the file name from the path
+        file_name = files[0]["name"]
         file_locator = self.invoices_page.get_file_locator_by_name(file_name)
         expect(file_locator).to_be_visible(timeout=10000)
         
@@ -295,11 +303,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files with same name but different extensions
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_and_name_but_different_content", file_name)
-            for file_name in SAME_NAME_DIFF_EXT_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_and_name_but_different_content", SAME_NAME_DIFF_EXT_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -344,11 +349,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files with different names and extensions but same content
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "different_file_type_and_name_but_same_content", file_name)
-            for file_name in DIFFERENT_NAME_AND_EXT_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("different_file_type_and_name_but_same_content", DIFFERENT_NAME_AND_EXT_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -393,11 +395,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files with same name but different content
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "different_content_but_same_file_type_and_name", rel_path)
-            for rel_path in SAME_NAME_DIFF_CONTENT_PATHS
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("different_content_but_same_file_type_and_name", SAME_NAME_DIFF_CONTENT_PATHS)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         # The files have the same name but different content (sizes)
@@ -452,11 +451,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files with different content but same file type using the page object method
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_but_different_content_name", file_name)
-            for file_name in DIFFERENT_CONTENT_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_but_different_content_name", DIFFERENT_CONTENT_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -501,11 +497,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files with same name but different content and type
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_name_but_different_content_and_file_type", file_name)
-            for file_name in SAME_NAME_DIFF_CONTENT_TYPE_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_name_but_different_content_and_file_type", SAME_NAME_DIFF_CONTENT_TYPE_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -550,11 +543,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files using the page object method
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "different_file_type_name_and_content", file_name)
-            for file_name in DIFFERENT_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("different_file_type_name_and_content", DIFFERENT_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -604,11 +594,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files that will exceed 10MB in total
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", file_name)
-            for file_name in LARGE_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_content_but_different_name", LARGE_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -653,11 +640,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "different_file_type_name_and_content", file_name)
-            for file_name in DIFFERENT_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("different_file_type_name_and_content", DIFFERENT_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -713,14 +697,11 @@ class TestMultipleFileUploads:
         # 3. Verify the New Invoice overlay is open
         assert self.invoices_page.is_overlay_visible(), "New Invoice overlay is not visible"
         
-        # 4. Prepare file paths for upload
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_and_name_but_different_content", file_name)
-            for file_name in SAME_NAME_FILES
-        ]
+        # 4. Prepare the files for upload
+        files = sample_documents("same_file_type_and_name_but_different_content", SAME_NAME_FILES)
         
         # 5. Start uploading files
-        self.invoices_page.upload_multiple_files(*file_paths)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 6. Click Cancel button
         self.invoices_page.cancel_new_invoice()
@@ -742,7 +723,7 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 12. Upload multiple files again
-        self.invoices_page.upload_multiple_files(*file_paths)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 13. Verify the files were uploaded successfully
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -785,12 +766,12 @@ class TestMultipleFileUploads:
         # 5. Select the expense type we just created
         self.invoices_page.select_expense_type(expense_type_name)
         
-        # 6. Prepare the invalid file path (webp format which is not supported)
+        # 6. Prepare the invalid file (webp format which is not supported)
         invalid_file = "InvoiceExample_2.webp"
-        invalid_file_path = os.path.join(SAMPLE_DOC_DIR, "invalid_filet_ype", invalid_file)
+        invalid_files = sample_documents("invalid_file_type", [invalid_file])
         
         # 7. Try to upload the invalid file
-        self.invoices_page.upload_multiple_files(invalid_file_path)
+        self.invoices_page.upload_multiple_files(*invalid_files)
         
         # 8. Verify the specific error message is shown for invalid file type
         error_message = self.invoices_page.get_file_type_error_message(invalid_file)
@@ -831,11 +812,8 @@ class TestMultipleFileUploads:
         self.invoices_page.select_expense_type(expense_type_name)
         
         # 6. Upload multiple files in specific order
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", file_name)
-            for file_name in ORDERED_FILES
-        ]
-        self.invoices_page.upload_multiple_files(*file_paths)
+        files = sample_documents("same_file_type_content_but_different_name", ORDERED_FILES)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 7. Verify files appear in the same order as uploaded
         uploaded_files = self.invoices_page.get_uploaded_file_names()
@@ -856,8 +834,8 @@ class TestMultipleFileUploads:
         
         # 11. Add a new file and verify it's appended to the end
         new_file = "InvoiceExample_5 copy 3.png"
-        new_file_path = os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", new_file)
-        self.invoices_page.upload_multiple_files(new_file_path)
+        new_files = sample_documents("same_file_type_content_but_different_name", [new_file])
+        self.invoices_page.upload_multiple_files(*new_files)
         
         # 12. Verify the new file is appended to the end
         updated_files = self.invoices_page.get_uploaded_file_names()
@@ -907,14 +885,11 @@ class TestMultipleFileUploads:
         # 5. Select the expense type we just created
         self.invoices_page.select_expense_type(expense_type_name)
         
-        # 6. Prepare file paths for upload
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_and_name_but_different_content", file_name)
-            for file_name in NETWORK_TEST_FILES
-        ]
+        # 6. Prepare the files for upload
+        files = sample_documents("same_file_type_and_name_but_different_content", NETWORK_TEST_FILES)
         
         # 7. Start file upload
-        self.invoices_page.upload_multiple_files(*file_paths)
+        self.invoices_page.upload_multiple_files(*files)
         
         # 8. Simulate network disconnection during upload
         self.page.context.set_offline(True)
@@ -965,14 +940,11 @@ class TestMultipleFileUploads:
         # 5. Select the expense type we just created
         self.invoices_page.select_expense_type(expense_type_name)
         
-        # 6. Prepare file paths for upload
-        file_paths = [
-            os.path.join(SAMPLE_DOC_DIR, "mulitple_files", "same_file_type_content_but_different_name", file_name)
-            for file_name in NETWORK_TEST_FILES
-        ]
+        # 6. Prepare the files for upload
+        files = sample_documents("same_file_type_content_but_different_name", NETWORK_TEST_FILES)
 
         # 7. Start file upload
-        self.invoices_page.upload_multiple_files(*file_paths)
+        self.invoices_page.upload_multiple_files(*files)
 
         # --- CRITICAL CHANGE: Set up the Abort Handler BEFORE the click ---
         
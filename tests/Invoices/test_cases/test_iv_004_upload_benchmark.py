@@ -0,0 +1,29 @@
+import pytest
+from tests.Invoices.upload_benchmark import run_upload_benchmark, save_trend, print_results
+from tests.utils.invoice_documents import KB, MB
+
+# Reduced sweep for CI; run the module directly for the full one
+BENCHMARK_COUNTS = (1, 5, 20)
+BENCHMARK_SIZES = (100 * KB, 1 * MB)
+
+
+@pytest.mark.invoices
+@pytest.mark.benchmark
+class TestInvoiceUploadBenchmark:
+    def test_upload_benchmark_against_stand_in(self, page, stand_in):
+        """Measure upload readiness, overlay close and backend latency across file counts and sizes"""
+        results = run_upload_benchmark(page, stand_in.base_url, BENCHMARK_COUNTS, BENCHMARK_SIZES)
+        print_results(results)
+        save_trend(results, target="stand-in")
+        
+        # 20 x 1MB exceeds the 10MB limit and is skipped
+        assert len(results) == 5, f"Expected 5 benchmark points, got {len(results)}"
+        
+        failed = [r for r in results if r.error or r.failed]
+        assert not failed, f"Benchmark points failed: {[(r.file_count, r.file_size, r.error) for r in failed]}"
+        
+        for result in results:
+            assert result.ready_ms is not None and result.close_ms is not None, \
+                f"Missing timings for {result.file_count} x {result.file_size} bytes"
+            assert result.backend_ms is not None, \
+                f"No upload requests tracked for {result.file_count} x {result.file_size} bytes"
@@ -0,0 +1,227 @@
+"""
+Invoice upload benchmark.
+
+Sweeps the number of files against the file size and, for every point, measures
+through InvoicesPage:
+    ready_ms:   selecting the files until the "Upload N Files" button is enabled
+    close_ms:   InvoicesPage.click_add_invoice, from the click until the overlay closes
+    backend_ms: wall-clock span of the upload requests (browser resource timing)
+
+Points whose total size exceeds the app's 10MB limit are skipped. Every run is
+appended to a JSON-lines trend file and a CSV file in test_reports/ so numbers
+can be compared across commits.
+
+Run against the local stand-in (deterministic, used in CI):
+    python -m tests.Invoices.upload_benchmark --counts 1,5,10 --sizes 100KB,1MB
+Run against a deployed environment:
+    python -m tests.Invoices.upload_benchmark --env staging
+"""
+import argparse
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from playwright.sync_api import Page, expect, sync_playwright
+
+from pages.login.login_page import LoginPage
+from tests.Invoices.page_object.invoices_page import InvoicesPage
+from tests.config.test_config import CREDENTIALS, get_environment_config
+from tests.page_components.upload_tracker import UploadTracker
+from tests.utils.invoice_documents import KB, MB, invoice_documents
+from tests.utils.metrics import record_metric
+from tests.utils.trend import append_trend, print_table
+
+DEFAULT_COUNTS = (1, 2, 5, 10, 20)
+DEFAULT_SIZES = (100 * KB, 500 * KB, 1 * MB, 2 * MB, 5 * MB, 10 * MB)
+
+# Total size the New Invoice form accepts (see get_total_upload_size_mb)
+MAX_TOTAL_BYTES = 10 * MB
+
+TREND_FILE = "upload_benchmark_trend"
+TREND_FIELDS = ["file_count", "file_size", "total_bytes", "ready_ms", "close_ms", "backend_ms",
+                "throughput_kbps", "failed", "error"]
+
+
+@dataclass
+class UploadBenchmarkPoint:
+    """Measurements of one (file count, file size) point"""
+    file_count: int
+    file_size: int
+    total_bytes: int
+    ready_ms: Optional[float] = None
+    close_ms: Optional[float] = None
+    backend_ms: Optional[float] = None
+    throughput_kbps: Optional[float] = None
+    failed: int = 0
+    error: Optional[str] = None
+    per_file: List[Dict] = field(default_factory=list, repr=False)
+
+
+def parse_size(value: str) -> int:
+    """Parse '100KB', '1.5MB' or a plain byte count"""
+    value = value.strip().upper()
+    for suffix, factor in (("MB", MB), ("KB", KB), ("B", 1)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * factor)
+    return int(value)
+
+
+def sweep_points(counts: Iterable[int] = DEFAULT_COUNTS, sizes: Iterable[int] = DEFAULT_SIZES,
+                 max_total_bytes: int = MAX_TOTAL_BYTES) -> List[Tuple[int, int]]:
+    """Return the (file count, file size) points within the upload limit"""
+    return [(count, size) for count in counts for size in sizes if count * size <= max_total_bytes]
+
+
+def measure_upload(invoices_page: InvoicesPage, file_count: int, file_size: int,
+                   file_type: str = "png", timeout: float = 120000) -> UploadBenchmarkPoint:
+    """
+    Upload file_count generated invoices of file_size bytes and time each phase
+
+    Args:
+        invoices_page: InvoicesPage on a logged-in session
+        file_count: Number of files to upload at once
+        file_size: Size of every file in bytes
+        file_type: Generated document type ('png', 'jpg' or 'pdf')
+        timeout: Maximum time to wait in milliseconds for each phase
+
+    Returns:
+        UploadBenchmarkPoint: The measurements (error is set if a phase failed)
+    """
+    page = invoices_page.page
+    point = UploadBenchmarkPoint(file_count, file_size, file_count * file_size)
+    documents = invoice_documents(file_count, file_type=file_type, size=file_size,
+                                  prefix=f"bench_{file_count}x{file_size // KB}kb")
+    try:
+        invoices_page.navigate()
+        invoices_page.wait_until_ready()
+        invoices_page.new_invoice_btn.click()
+        invoices_page.overlay['title'].wait_for(state='visible', timeout=timeout)
+        invoices_page.select_cost_center()
+        invoices_page.select_expense_type()
+
+        button_text = "Add Invoice" if file_count == 1 else f"Upload {file_count} Files"
+        upload_btn = page.locator(f'button:has-text("{button_text}")')
+
+        start = time.perf_counter()
+        invoices_page.select_files(documents, timeout=timeout)
+        expect(upload_btn).to_be_enabled(timeout=timeout)
+        point.ready_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        with UploadTracker(page) as tracker:
+            start = time.perf_counter()
+            invoices_page.click_add_invoice(expected_file_count=file_count)
+            point.close_ms = round((time.perf_counter() - start) * 1000, 2)
+            if invoices_page.overlay['title'].is_visible():
+                raise RuntimeError("New Invoice overlay did not close after submitting")
+            tracker.wait_for_files(file_count, timeout=timeout)
+
+        summary = tracker.summary()
+        point.backend_ms = summary['duration_ms']
+        point.throughput_kbps = summary['throughput_kbps']
+        point.failed = summary['failed']
+        point.per_file = summary['per_file']
+    except Exception as e:
+        point.error = str(e).splitlines()[0]
+        print(f"Benchmark point {file_count} x {file_size} bytes failed: {point.error}")
+
+    if point.error:
+        return point
+    tags = {"files": file_count, "file_size": file_size}
+    for name in ("ready_ms", "close_ms", "backend_ms"):
+        value = getattr(point, name)
+        if value is not None:
+            record_metric(f"invoices.upload_benchmark.{name[:-3]}", value, **tags)
+    return point
+
+
+def run_upload_benchmark(page: Page, base_url: str, counts: Iterable[int] = DEFAULT_COUNTS,
+                         sizes: Iterable[int] = DEFAULT_SIZES, credentials: Dict[str, str] = None,
+                         file_type: str = "png", timeout: float = 120000) -> List[UploadBenchmarkPoint]:
+    """
+    Log in and measure every point of the count x size sweep
+
+    Args:
+        page: Playwright page object (not logged in)
+        base_url: Base URL of the app (the stand-in's or a deployed environment's)
+        counts: File counts to sweep
+        sizes: File sizes in bytes to sweep
+        credentials: Login credentials (default: CREDENTIALS['DEFAULT'])
+        file_type: Generated document type
+        timeout: Maximum time to wait in milliseconds for each phase
+
+    Returns:
+        List[UploadBenchmarkPoint]: One result per point within the upload limit
+    """
+    credentials = credentials or CREDENTIALS["DEFAULT"]
+    login_page = LoginPage(page, base_url=base_url)
+    login_page.navigate()
+    login_page.login(credentials["email"], credentials["password"])
+    page.wait_for_url("**/dashboard", timeout=timeout)
+
+    invoices_page = InvoicesPage(page, base_url=base_url)
+    points = sweep_points(counts, sizes)
+    results = []
+    for index, (file_count, file_size) in enumerate(points, 1):
+        print(f"[{index}/{len(points)}] Uploading {file_count} x {file_size // KB}KB")
+        results.append(measure_upload(invoices_page, file_count, file_size, file_type, timeout))
+    return results
+
+
+def save_trend(results: List[UploadBenchmarkPoint], target: str, report_dir: str = "test_reports") -> Path:
+    """Append the run to test_reports/upload_benchmark_trend.jsonl and .csv (see tests.utils.trend)"""
+    return append_trend(TREND_FILE, results, target, TREND_FIELDS, label="Upload benchmark",
+                        report_dir=report_dir)
+
+
+def print_results(results: List[UploadBenchmarkPoint]) -> None:
+    print_table(results, [("Files", "file_count", ">5"), ("Size", lambda r: f"{r.file_size // KB}KB", ">8"),
+                          ("Ready ms", "ready_ms", ">10"), ("Close ms", "close_ms", ">10"),
+                          ("Backend ms", "backend_ms", ">11"), ("KB/s", "throughput_kbps", ">10"),
+                          ("Error", lambda r: r.error or "", "")])
+
+
+def main():
+    from tests.stand_in.server import StandInServer
+
+    parser = argparse.ArgumentParser(description="Benchmark invoice uploads across file counts and sizes")
+    parser.add_argument("--counts", default=",".join(map(str, DEFAULT_COUNTS)),
+                        help="Comma-separated file counts (default: %(default)s)")
+    parser.add_argument("--sizes", default="100KB,500KB,1MB,2MB,5MB,10MB",
+                        help="Comma-separated file sizes, e.g. 100KB,1MB (default: %(default)s)")
+    parser.add_argument("--file-type", default="png", choices=["png", "jpg", "pdf"])
+    parser.add_argument("--env", default=None,
+                        help="Environment from ENVIRONMENTS to run against (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Stand-in API latency")
+    parser.add_argument("--upload-kbps", type=float, default=None, help="Stand-in upload bandwidth")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    counts = [int(c) for c in args.counts.split(",")]
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+
+    stand_in = None
+    if args.env:
+        base_url, target = get_environment_config(args.env)["base_url"], args.env
+    else:
+        stand_in = StandInServer(latency_ms=args.latency_ms, upload_kbps=args.upload_kbps).start()
+        stand_in.seed("cost_centers", 1, "Benchmark Cost Center")
+        stand_in.seed("expense_types", 1, "Benchmark Expense Type")
+        base_url, target = stand_in.base_url, "stand-in"
+
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=not args.headed)
+            page = browser.new_page()
+            results = run_upload_benchmark(page, base_url, counts, sizes, file_type=args.file_type)
+            browser.close()
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    print_results(results)
+    save_trend(results, target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Performance budgets per route.
+
+Routes are keyed like URLS in test_config.py. Each metric has:
+    max:            hard budget; any value above it fails
+    tolerance_pct:  allowed increase over the rolling baseline (median of recent runs)
+    min_delta:      increases smaller than this never count as a regression (noise floor)
+    unit:           for display only
+
+Route entries only need the limits that differ from DEFAULT_BUDGET.
+"""
+from copy import deepcopy
+from typing import Any, Dict, Optional
+
+DEFAULT_BUDGET = {
+    "load_time": {"max": 5000, "tolerance_pct": 20, "min_delta": 250, "unit": "ms"},
+    "lcp": {"max": 2500, "tolerance_pct": 20, "min_delta": 200, "unit": "ms"},
+    "cls": {"max": 0.1, "tolerance_pct": 50, "min_delta": 0.02, "unit": ""},
+    "transfer_bytes": {"max": 3 * 1024 * 1024, "tolerance_pct": 10, "min_delta": 50 * 1024, "unit": "B"},
+    "requests": {"max": 120, "tolerance_pct": 10, "min_delta": 5, "unit": ""},
+    "js_bytes": {"max": 1536 * 1024, "tolerance_pct": 5, "min_delta": 20 * 1024, "unit": "B"},
+}
+
+ROUTE_BUDGETS = {
+    # Marketing homepage: image heavy
+    "HOME": {
+        "transfer_bytes": {"max": 5 * 1024 * 1024},
+        "requests": {"max": 150},
+    },
+    "LOGIN": {
+        "load_time": {"max": 3000},
+        "lcp": {"max": 2000},
+        "transfer_bytes": {"max": 1536 * 1024},
+        "requests": {"max": 60},
+        "js_bytes": {"max": 1024 * 1024},
+    },
+    "DASHBOARD": {},
+    "COST_CENTERS": {},
+    "EXPENSE_TYPE": {},
+    "INVOICES": {},
+}
+
+# Throttle profiles (tests/utils/throttling.py) multiply the time budgets; page weight and
+# layout shift do not depend on connection or CPU speed
+PROFILE_BUDGET_FACTORS = {
+    "fast-3g": {"load_time": 6, "lcp": 5},
+    "slow-4g": {"load_time": 2.5, "lcp": 2},
+    "mid-tier-mobile": {"load_time": 3.5, "lcp": 3},
+}
+
+# Rolling baseline: median of the last BASELINE_WINDOW passing runs of a route (under
+# the same throttle profile), used once at least BASELINE_MIN_RUNS exist
+BASELINE_WINDOW = 10
+BASELINE_MIN_RUNS = 3
+BASELINE_FILE = "test_reports/perf_baseline.jsonl"
+
+
+def get_budget(route: str, profile: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Return the budget of a route (URLS key) with the defaults filled in
+
+    Args:
+        route: URLS key
+        profile: Throttle profile name the route is measured under, None for full speed
+    """
+    budget = deepcopy(DEFAULT_BUDGET)
+    for metric, limits in ROUTE_BUDGETS.get(route, {}).items():
+        budget.setdefault(metric, {}).update(limits)
+    for metric, factor in PROFILE_BUDGET_FACTORS.get(profile, {}).items():
+        budget[metric]["max"] *= factor
+        budget[metric]["min_delta"] *= factor
+    return budget
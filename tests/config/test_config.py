@@ -42,9 +42,15 @@ class TestConfig:
     RECORD_VIDEO = False  # Set to True to record test videos
     SCREENSHOT_ON_FAILURE = True  # Take screenshots on test failure
     TRACE_ON = False  # Enable Playwright tracing
+    COLLECT_WEB_VITALS = True  # Observe LCP/CLS/INP/FCP/TTFB on every page and save them per test
     
     # Environment settings
     ENVIRONMENT = "dev"  # dev, staging, prod
+    
+    # Test data cleanup settings
+    CLEANUP_AFTER_SESSION = True  # Delete entities created by the suite at session end
+    CLEANUP_STALE_DAYS = 2  # Also purge test-named leftovers older than this (None to disable)
+    CLEANUP_MAX_WORKERS = 8  # Concurrent API delete requests
 
 # Environment-specific configurations
 ENVIRONMENTS = {
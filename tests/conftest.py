@@ -19,6 +19,16 @@ from tests.config.test_config import (
     BASE_URL
 )
 from tests.utils.screenshot_utils import take_screenshot
+from tests.utils.metrics import record_metric, save_metrics, set_print_samples, summarize
+from tests.utils.result_log import close_result_log, run_id, write_session_report
+from tests.utils.web_vitals import WebVitalsCollector
+from tests.utils.throttling import Throttler
+from tests.utils.code_coverage import CoverageCollector, write_coverage_report
+from tests.utils.long_tasks import LongTaskTracker, write_long_task_report
+from tests.utils.step_timeline import StepTimeline
+from tests.utils.perf_trace import PerfTrace
+from tests.page_components.dialog_manager import DialogManager
+from tests.utils.cleanup_registry import cleanup_registry as _cleanup_registry, CleanupRegistry
 
 # Constants
 LOGIN_URL = URLS["LOGIN"]
@@ -362,12 +372,239 @@ def page(browser, request):
     test_name = request.node.name
     page.test_name = test_name
     
+    # Record entities the test creates so they are deleted at session end
+    _cleanup_registry.track(page)
+    
+    # Observe Web Vitals on every document the test loads
+    if TestConfig.COLLECT_WEB_VITALS:
+        WebVitalsCollector.for_page(page)
+    
+    # Collect JS/CSS coverage per route for --js-coverage runs
+    if request.config.getoption("--js-coverage", False):
+        try:
+            CoverageCollector.for_page(page)
+        except RuntimeError as e:
+            print(f"Coverage not collected for {test_name}: {str(e)}")
+    
+    # Attribute long tasks to page-object steps for --long-tasks runs
+    if request.config.getoption("--long-tasks", False):
+        LongTaskTracker.for_page(page)
+    
+    # Record per-step CDP performance counters for --step-timeline runs
+    if request.config.getoption("--step-timeline", False):
+        try:
+            StepTimeline.for_page(page)
+        except RuntimeError as e:
+            print(f"Step timeline not recorded for {test_name}: {str(e)}")
+    
+    # Throttle network and CPU for @pytest.mark.throttle("<profile>") tests or --throttle runs
+    throttle_marker = request.node.get_closest_marker("throttle")
+    throttle_profile = throttle_marker.args[0] if throttle_marker else request.config.getoption("--throttle", None)
+    if throttle_profile:
+        try:
+            Throttler.for_page(page).apply(throttle_profile)
+        except RuntimeError as e:
+            context.close()
+            pytest.skip(str(e))
+    
     # Yield the page to the test
     yield page
     
-    # Close the context after the test
+    collector = getattr(page, "_web_vitals", None)
+    if collector:
+        try:
+            collector.save(request.node.nodeid)
+        except Exception as e:
+            print(f"Could not save Web Vitals for {test_name}: {str(e)}")
+    
+    long_tasks = getattr(page, "_long_tasks", None)
+    if long_tasks:
+        try:
+            long_tasks.close()
+        except Exception as e:
+            print(f"Could not stop long-task tracking for {test_name}: {str(e)}")
+    
+    step_timeline = getattr(page, "_step_timeline", None)
+    if step_timeline:
+        try:
+            step_timeline.stop()
+            step_timeline.save(request.node.nodeid)
+        except Exception as e:
+            print(f"Could not save step timeline for {test_name}: {str(e)}")
+    
+    coverage = getattr(page, "_coverage", None)
+    if coverage:
+        try:
+            coverage.save(request.node.nodeid)
+        except Exception as e:
+            print(f"Could not save coverage for {test_name}: {str(e)}")
+    
+    # Report dialogs that no page object or test expected
+    dialog_manager = getattr(page, "_dialog_manager", None)
+    if dialog_manager and dialog_manager.unexpected:
+        print(f"Warning: {len(dialog_manager.unexpected)} unexpected dialog(s) in {test_name}:")
+        for dialog in dialog_manager.unexpected:
+            print(f"  - [{dialog['type']}] {dialog['message']} ({dialog['url']})")
+    
+    # Keep the session cookies for API cleanup, then close the context
+    _cleanup_registry.capture_auth(context)
     context.close()
 
+# This fixture provides the page-scoped dialog manager
+@pytest.fixture(scope="function")
+def dialog_manager(page: Page) -> DialogManager:
+    """
+    Provides the single dialog listener for the test page.
+    
+    Usage:
+        confirmation = dialog_manager.accept_next("confirm", message="delete")
+        ...click something that opens the confirm...
+        assert dialog_manager.wait_for(confirmation)
+    """
+    return DialogManager.for_page(page)
+
+# This fixture provides the page's Web Vitals collector
+@pytest.fixture(scope="function")
+def web_vitals(page: Page) -> WebVitalsCollector:
+    """
+    Provides the Web Vitals observed on the test page (installed by the page
+    fixture; also works with COLLECT_WEB_VITALS off as long as it is requested
+    before the first navigation).
+    
+    Usage:
+        vitals = web_vitals.latest("DASHBOARD")
+        assert vitals["lcp"] < 2500
+    """
+    return WebVitalsCollector.for_page(page)
+
+# This fixture provides the page's JS/CSS coverage collector
+@pytest.fixture(scope="function")
+def code_coverage(page: Page) -> CoverageCollector:
+    """
+    Collects JS/CSS coverage per route on the test page (Chromium only; also
+    installed on every page by --js-coverage). Request it before the first
+    navigation; the coverage is saved with the test and merged into the session
+    report.
+    
+    Usage:
+        code_coverage.take()  # credit what ran so far to the current route
+    """
+    try:
+        return CoverageCollector.for_page(page)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+# This fixture provides the page's long task tracker
+@pytest.fixture(scope="function")
+def long_tasks(page: Page) -> LongTaskTracker:
+    """
+    Attributes main-thread blocking (Long Tasks / Long Animation Frames) on the
+    test page to the page-object steps that caused it (also installed on every
+    page by --long-tasks). Request it before the first navigation.
+    
+    Usage:
+        cost_centers_page.search("Marketing")
+        assert long_tasks.samples[-1]["blocking_ms"] < 200
+    """
+    return LongTaskTracker.for_page(page)
+
+# This fixture provides the page's step timeline
+@pytest.fixture(scope="function")
+def step_timeline(page: Page) -> StepTimeline:
+    """
+    Records CDP performance counters (layouts, style recalcs, script and task
+    time, nodes, JS heap, requests) around every page-object step on the test
+    page (Chromium only; also installed on every page by --step-timeline). The
+    timeline is saved with the test to test_reports/timelines/.
+    
+    Usage:
+        login_page.login(email, password)
+        assert step_timeline.entries[-1]["dominant"] != "layout"
+    """
+    try:
+        return StepTimeline.for_page(page)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+# This fixture provides the page's network/CPU throttler
+@pytest.fixture(scope="function")
+def throttle(page: Page) -> Throttler:
+    """
+    Provides the CDP throttler of the test page (Chromium only). The page is
+    already throttled if the test has @pytest.mark.throttle("<profile>").
+    
+    Usage:
+        throttle.apply("mid-tier-mobile")
+        ...measure...
+        throttle.reset()
+    """
+    try:
+        return Throttler.for_page(page)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+
+# This fixture provides the session-wide registry of created entities
+@pytest.fixture(scope="function")
+def cleanup_registry() -> CleanupRegistry:
+    """
+    Provides the registry of entities to delete at session end.
+    
+    Usage:
+        cleanup_registry.register("cost_center", name)
+    """
+    return _cleanup_registry
+
+# This fixture provides the local stand-in app
+@pytest.fixture(scope="session")
+def stand_in():
+    """
+    Runs the local stand-in app for the session, seeded with one cost center
+    and expense type.
+    
+    Usage:
+        invoices_page = InvoicesPage(page, base_url=stand_in.base_url)
+    """
+    from tests.stand_in.server import StandInServer
+    
+    with StandInServer() as server:
+        server.seed("cost_centers", 1, "Stand-in Cost Center")
+        server.seed("expense_types", 1, "Stand-in Expense Type")
+        yield server
+
+# This fixture provides the fake SMS gateway
+@pytest.fixture(scope="function")
+def sms_gateway(page: Page):
+    """
+    Answers the page's phone send-otp / verify-otp requests with a local fake
+    SMS gateway (a route stub; the product currently has no phone verification).
+    
+    Usage:
+        sms_gateway.set_delay(2)  # optional delivery delay in seconds
+        code = sms_gateway.wait_for_code("+1", "1234567890")
+    """
+    from tests.stand_in.sms_gateway import FakeSmsGateway
+    
+    gateway = FakeSmsGateway().attach(page)
+    yield gateway
+    gateway.detach()
+
+# This fixture provides the fake payment provider
+@pytest.fixture(scope="function")
+def payment_provider(page: Page):
+    """
+    Serves the hosted payment form and tokenization endpoint locally, so payment
+    setup runs without the third-party checkout.
+    
+    Usage:
+        payment_provider.latency = 1.5  # optional tokenization latency in seconds
+        page.goto(payment_provider.checkout_url(success_url=stand_in.url("/create-account")))
+    """
+    from tests.stand_in.payment_provider import FakePaymentProvider
+    
+    provider = FakePaymentProvider().attach(page)
+    yield provider
+    provider.detach()
+
 # This fixture provides a logged-in page
 @pytest.fixture(scope="function")
 def logged_in_page(page: Page, request):
@@ -601,6 +838,71 @@ def pytest_runtest_makereport(item, call):
     rep = outcome.get_result()
     setattr(item, f"rep_{rep.when}", rep)
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Record a Chromium performance trace around the body of @pytest.mark.perf_trace tests"""
+    marker = item.get_closest_marker("perf_trace")
+    browser, page = item.funcargs.get("browser"), item.funcargs.get("page")
+    trace = None
+    if marker and browser and page:
+        try:
+            trace = PerfTrace(browser, page, **marker.kwargs).start()
+        except RuntimeError as e:
+            print(f"Performance trace not recorded for {item.name}: {str(e)}")
+    
+    yield
+    
+    if trace:
+        try:
+            trace.stop(item.nodeid)
+        except Exception as e:
+            print(f"Could not save performance trace for {item.name}: {str(e)}")
+
+def pytest_configure(config):
+    """Fix the result log run id before any xdist workers are started, so they share it"""
+    run_id()
+    set_print_samples(config.getoption("--print-metrics", False))
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """xdist controller: adopt the API URLs and auth a finished worker learned, for the stale purge"""
+    state = getattr(node, "workeroutput", {}).get("cleanup_api")
+    if state:
+        _cleanup_registry.merge_api_state(state)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Delete test data created during the session and persist performance metrics and results"""
+    is_worker = hasattr(session.config, "workerinput")
+    if TestConfig.CLEANUP_AFTER_SESSION:
+        try:
+            # Workers delete what they created; the controller alone purges stale leftovers
+            cleanup = _cleanup_registry.cleanup(max_workers=TestConfig.CLEANUP_MAX_WORKERS,
+                                                stale_days=None if is_worker else TestConfig.CLEANUP_STALE_DAYS)
+            if cleanup["duration_ms"]:
+                record_metric("cleanup.duration", cleanup["duration_ms"],
+                              deleted=cleanup["deleted"], stale=cleanup["stale"],
+                              failed=len(cleanup["failed"]))
+        except Exception as e:
+            print(f"Test data cleanup failed: {e}")
+        if is_worker:
+            session.config.workeroutput["cleanup_api"] = _cleanup_registry.api_state()
+    
+    summary = summarize()
+    if summary:
+        print("\nPerformance metrics summary:")
+        for name, stats in sorted(summary.items()):
+            print(f"  {name}: n={stats['count']} p50={stats['p50']}{stats['unit']} "
+                  f"p95={stats['p95']}{stats['unit']} max={stats['max']}{stats['unit']}")
+    write_long_task_report()
+    save_metrics()
+    
+    if is_worker:
+        # xdist worker: flush its own log; the controller merges all of them
+        close_result_log()
+    else:
+        write_session_report()
+        write_coverage_report()
+
 # This fixture provides a homepage
 @pytest.fixture(scope="function")
 def home_page(page: Page) -> Page:
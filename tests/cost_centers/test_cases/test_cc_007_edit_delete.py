@@ -2,6 +2,7 @@ import pytest
 from playwright.sync_api import expect, Page
 from pages.cost_centers.cost_centers_page import CostCentersPage
 from tests.config.test_config import URLS
+from tests.page_components.dialog_manager import DialogManager
 from dataInput.cost_centers.test_data import (
     credentials,
     edit_delete_test_data
@@ -258,19 +259,15 @@ class TestEditDeleteOptions:
             print("Triple dot button is visible, attempting to click...")
             triple_dot_button.click()
             
-            # Set up a dialog handler to accept the confirmation
-            def handle_dialog(dialog):
-                print(f"Dialog message: {dialog.message}")
-                dialog.accept()  # Clicks 'OK' or 'Delete' on the dialog
-            
-            # Listen for the dialog before clicking delete
-            self.page.on('dialog', handle_dialog)
+            # Queue acceptance of the confirmation on the page's single dialog listener
+            confirmation = DialogManager.for_page(self.page).accept_next("confirm")
             
             # Click the Delete option
             self.page.get_by_role("menuitem", name="Delete").click()
             
-            # Wait for the dialog to be handled and the deletion to complete
-            self.page.wait_for_timeout(1000)  # Small delay for the update
+            # Wait for the dialog to be handled
+            if not DialogManager.for_page(self.page).wait_for(confirmation, timeout=5000):
+                print("Warning: No dialog was handled during deletion")
             
             print("✓ Deletion confirmed via dialog")
             
@@ -81,17 +81,8 @@ class TestMultipleCostCenterCreations:
                 search_input.fill(cost_center_name)
                 self.page.wait_for_timeout(1000)
                 
-                # Set up the dialog handler before any dialog appears
-                dialog_handled = False
-                
-                def handle_dialog(dialog):
-                    nonlocal dialog_handled
-                    print(f"Dialog message: {dialog.message}")
-                    dialog.accept()  # Clicks 'OK' or 'Delete' on the dialog
-                    dialog_handled = True
-                
-                # Listen for the dialog before clicking delete
-                self.page.once('dialog', handle_dialog)
+                # Queue the confirmation on the page's single dialog listener
+                confirmation = self.cost_centers_page.dialogs.accept_next("confirm")
                 
                 # Click the triple dot menu for the first row
                 first_row = self.page.locator("tbody tr").first
@@ -101,11 +92,7 @@ class TestMultipleCostCenterCreations:
                 self.page.get_by_role("menuitem", name="Delete").click()
                 
                 # Wait for the dialog to be handled
-                start_time = time.time()
-                while not dialog_handled and (time.time() - start_time) < 5:  # Wait up to 5 seconds
-                    self.page.wait_for_timeout(100)
-                
-                if not dialog_handled:
+                if not self.cost_centers_page.dialogs.wait_for(confirmation, timeout=5000):
                     print("Warning: No dialog was handled during deletion")
                 
                 # Wait for the deletion to complete
@@ -508,6 +508,7 @@ class TestBookDemoSection:
                 field_id = field_locator.get_attribute('id')
                 assert label_for == field_id, f"Label for {field} is not properly associated with input"
     
+    @pytest.mark.perf_trace
     def test_form_performance(self, page):
         """Verify form performance under various conditions."""
         home_page = HomePage(page)
@@ -0,0 +1,353 @@
+"""
+Direct API latency benchmark.
+
+Measures the backend endpoints behind cost centers, expense types and invoices
+without a browser in the loop, so backend regressions show up separately from
+frontend rendering cost. A browser logs in once and opens each list page to
+discover the API's collection URLs, query parameters and auth (Authorization
+header and session cookies); after that every request goes through an
+authenticated async APIRequestContext.
+
+For each concurrency level the benchmark runs a batch of each operation:
+    list:    first page at each page size
+    search:  list filtered by a name prefix
+    create:  new entities (cost centers and expense types)
+    delete:  the entities the create batch made
+and reports latency percentiles, throughput and error rate per operation. Every run
+is appended to test_reports/api_benchmark_trend.jsonl (and .csv) and compared
+with the previous run against the same target.
+
+Run against the local stand-in:
+    python -m tests.load.api_benchmark --concurrency 1,5,10,25 --requests 50
+Run against a deployed environment:
+    python -m tests.load.api_benchmark --env staging --concurrency 1,5,10
+"""
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from playwright.async_api import APIRequestContext, async_playwright
+from playwright.sync_api import sync_playwright
+
+from pages.login.login_page import LoginPage
+from tests.config.test_config import CREDENTIALS, get_environment_config
+from tests.load.load_runner import LatencyHistogram
+from tests.utils.metrics import record_metric
+from tests.utils.trend import append_trend, last_run, print_table
+
+# Resource -> (list page path, URL part identifying its API calls; see cleanup_registry.RESOURCES)
+RESOURCES = {
+    "cost_center": ("/cost-center", "cost-centers"),
+    "expense_type": ("/expense-type", "expense-type"),
+    "invoice": ("/invoices", "invoices"),
+}
+
+# Invoices are created by file upload; tests/Invoices/upload_benchmark.py covers that path
+WRITABLE = ("cost_center", "expense_type")
+
+PAGE_SIZE_PARAMS = ("pageSize", "page_size", "limit", "per_page", "size")
+SEARCH_PARAM = "search"
+
+DEFAULT_CONCURRENCY = (1, 5, 10, 25)
+DEFAULT_PAGE_SIZES = (10, 50, 100)
+NAME_PREFIX = "API Bench"
+
+TREND_FILE = "api_benchmark_trend"
+TREND_FIELDS = ["resource", "operation", "concurrency", "page_size", "count", "errors", "error_rate",
+                "p50", "p90", "p95", "p99", "max", "throughput_rps"]
+
+
+@dataclass
+class ApiTarget:
+    """Discovered API of one environment"""
+    base_url: str
+    collection_urls: Dict[str, str]
+    headers: Dict[str, str] = field(default_factory=dict)
+    storage_state: Dict[str, Any] = field(default_factory=dict)
+    list_queries: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+
+@dataclass
+class BenchmarkResult:
+    """One operation of one resource at one concurrency level"""
+    resource: str
+    operation: str
+    concurrency: int
+    page_size: Optional[int] = None
+    count: int = 0
+    errors: int = 0
+    error_rate: float = 0.0
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p95: Optional[float] = None
+    p99: Optional[float] = None
+    max: Optional[float] = None
+    throughput_rps: Optional[float] = None
+    error_samples: List[str] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        size = f"[{self.page_size}]" if self.page_size else ""
+        return f"{self.resource}.{self.operation}{size}@{self.concurrency}"
+
+
+def discover_api(base_url: str, credentials: Dict[str, str] = None, headless: bool = True,
+                 timeout: float = 30000) -> ApiTarget:
+    """Log in through the browser and record each resource's list API call and the auth it sends"""
+    credentials = credentials or CREDENTIALS["DEFAULT"]
+    target = ApiTarget(base_url=base_url.rstrip("/"), collection_urls={})
+
+    def on_response(response):
+        request = response.request
+        if request.method != "GET" or request.resource_type not in ("fetch", "xhr") or not response.ok:
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        for resource, (_, url_part) in RESOURCES.items():
+            if url_part in urlsplit(response.url).path and resource not in target.collection_urls:
+                parts = urlsplit(response.url)
+                target.collection_urls[resource] = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+                target.list_queries[resource] = dict(parse_qsl(parts.query))
+                if request.headers.get("authorization"):
+                    target.headers["Authorization"] = request.headers["authorization"]
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=headless)
+        try:
+            context = browser.new_context()
+            page = context.new_page()
+            page.on("response", on_response)
+            login_page = LoginPage(page, base_url=base_url)
+            login_page.navigate()
+            login_page.login(credentials["email"], credentials["password"])
+            page.wait_for_url("**/dashboard", timeout=timeout)
+            for resource, (path, _) in RESOURCES.items():
+                page.goto(f"{target.base_url}{path}")
+                page.wait_for_load_state("networkidle", timeout=timeout)
+            target.storage_state = context.storage_state()
+        finally:
+            browser.close()
+
+    missing = [r for r in RESOURCES if r not in target.collection_urls]
+    if missing:
+        print(f"Warning: no list API call observed for {', '.join(missing)}; skipping them")
+    return target
+
+
+def _with_query(url: str, params: Dict[str, Any]) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(params), ""))
+
+
+def _entities(payload: Any) -> List[Dict[str, Any]]:
+    if isinstance(payload, dict):
+        for key in ("data", "items", "results", "content", "rows"):
+            if isinstance(payload.get(key), list):
+                return payload[key]
+        payload = payload.get("data", payload)
+    if isinstance(payload, list):
+        return [p for p in payload if isinstance(p, dict)]
+    return [payload] if isinstance(payload, dict) else []
+
+
+class ApiBenchmark:
+    """Runs the operation batches at each concurrency level against one ApiTarget"""
+
+    def __init__(self, target: ApiTarget, concurrency: Iterable[int] = DEFAULT_CONCURRENCY,
+                 requests: int = 50, page_sizes: Iterable[int] = DEFAULT_PAGE_SIZES, timeout: float = 30000):
+        """
+        Args:
+            target: Discovered API (see discover_api)
+            concurrency: Concurrency levels to sweep
+            requests: Requests per operation batch
+            page_sizes: Page sizes of the list operation
+            timeout: Request timeout in milliseconds
+        """
+        self.target = target
+        self.concurrency = list(concurrency)
+        self.requests = requests
+        self.page_sizes = list(page_sizes)
+        self.timeout = timeout
+        self.results: List[BenchmarkResult] = []
+        self._run_tag = datetime.now().strftime("%H%M%S")
+        self._cost_center: Optional[str] = None
+
+    def run(self) -> List[BenchmarkResult]:
+        return asyncio.run(self._run())
+
+    async def _run(self) -> List[BenchmarkResult]:
+        async with async_playwright() as playwright:
+            api = await playwright.request.new_context(
+                extra_http_headers=self.target.headers, storage_state=self.target.storage_state,
+                ignore_https_errors=True, timeout=self.timeout)
+            try:
+                for level in self.concurrency:
+                    for resource in self.target.collection_urls:
+                        await self._resource_batches(api, resource, level)
+            finally:
+                await api.dispose()
+        return self.results
+
+    async def _resource_batches(self, api: APIRequestContext, resource: str, level: int) -> None:
+        collection_url = self.target.collection_urls[resource]
+        query = dict(self.target.list_queries.get(resource, {}))
+        size_param = next((p for p in PAGE_SIZE_PARAMS if p in query), "pageSize")
+
+        for page_size in self.page_sizes:
+            url = _with_query(collection_url, dict(query, **{size_param: page_size}))
+            await self._batch(resource, "list", level, [lambda url=url: api.get(url)] * self.requests,
+                              page_size=page_size)
+
+        search_url = _with_query(collection_url, dict(query, **{SEARCH_PARAM: NAME_PREFIX.split()[0]}))
+        await self._batch(resource, "search", level, [lambda: api.get(search_url)] * self.requests)
+
+        if resource not in WRITABLE:
+            return
+        payload = await self._payload(api, resource)
+        if payload is None:
+            print(f"Warning: no existing cost center to assign; skipping {resource} create and delete")
+            return
+        names = [f"{NAME_PREFIX} {self._run_tag}-{level}-{index}" for index in range(self.requests)]
+        created: List[str] = []
+
+        async def create(name: str):
+            response = await api.post(collection_url, data=dict(payload, name=name))
+            if response.ok:
+                entity_id = next((e.get("id") or e.get("_id") for e in _entities(await response.json())), None)
+                if entity_id is None:
+                    # Not deletable by the delete batch; the cleanup's NAME_PREFIX pattern removes it
+                    raise RuntimeError(f"HTTP {response.status} without an id for '{name}'")
+                created.append(str(entity_id))
+            return response
+
+        await self._batch(resource, "create", level, [lambda name=name: create(name) for name in names])
+        await self._batch(resource, "delete", level,
+                          [lambda entity_id=entity_id: api.delete(f"{collection_url}/{entity_id}")
+                           for entity_id in created])
+
+    async def _payload(self, api: APIRequestContext, resource: str) -> Optional[Dict[str, Any]]:
+        """Create payload without the name; expense types get an existing cost center (None if there is none)"""
+        payload = {"name": NAME_PREFIX}
+        if resource == "expense_type":
+            if self._cost_center is None and "cost_center" in self.target.collection_urls:
+                response = await api.get(self.target.collection_urls["cost_center"])
+                names = [e.get("name") for e in _entities(await response.json())] if response.ok else []
+                self._cost_center = next((n for n in names if n and not n.startswith(NAME_PREFIX)), None)
+            if self._cost_center is None:
+                return None
+            payload["costCenter"] = self._cost_center
+        return payload
+
+    async def _batch(self, resource: str, operation: str, level: int, calls: List, page_size: int = None) -> None:
+        """Run the calls with at most `level` in flight and record one BenchmarkResult"""
+        if not calls:
+            return
+        histogram = LatencyHistogram()
+        error_samples: List[str] = []
+        semaphore = asyncio.Semaphore(level)
+
+        async def timed(call):
+            async with semaphore:
+                start = time.perf_counter()
+                error = None
+                try:
+                    response = await call()
+                    if not response.ok:
+                        error = f"HTTP {response.status}"
+                except Exception as e:
+                    error = str(e).splitlines()[0][:200] if str(e) else type(e).__name__
+                histogram.add((time.perf_counter() - start) * 1000, ok=error is None)
+                if error and len(error_samples) < 5:
+                    error_samples.append(error)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(timed(call) for call in calls))
+        elapsed = time.perf_counter() - started
+
+        stats = histogram.to_dict()
+        result = BenchmarkResult(
+            resource=resource, operation=operation, concurrency=level, page_size=page_size,
+            count=stats["count"], errors=stats["errors"], error_rate=stats["error_rate"],
+            p50=stats["p50"], p90=stats["p90"], p95=stats["p95"], p99=stats["p99"], max=stats["max"],
+            throughput_rps=round(stats["count"] / elapsed, 2) if elapsed else None, error_samples=error_samples)
+        self.results.append(result)
+        record_metric(f"api.{resource}.{operation}.p95", result.p95, concurrency=level, page_size=page_size)
+        print(f"  {result.key}: p50 {result.p50}ms p95 {result.p95}ms, {result.throughput_rps} req/s, "
+              f"{result.error_rate * 100:.1f}% errors")
+
+
+def print_results(results: List[BenchmarkResult], previous: Dict[str, Dict] = None) -> None:
+    """Print the results, with the p95 change against the previous run where available"""
+    previous = previous or {}
+
+    def change(r: BenchmarkResult) -> Optional[str]:
+        before = previous.get(r.key, {}).get("p95")
+        return f"{(r.p95 - before) / before * 100:+.1f}%" if before and r.p95 is not None else None
+
+    print_table(results, [("Operation", "key", "<36"), ("Count", "count", ">6"),
+                          ("Err%", lambda r: f"{r.error_rate * 100:.1f}%", ">6"), ("p50", "p50", ">9"),
+                          ("p95", "p95", ">9"), ("p99", "p99", ">9"), ("req/s", "throughput_rps", ">8"),
+                          ("p95 vs prev", change, ">12")])
+
+
+def previous_run(target: str, report_dir: str = "test_reports") -> Dict[str, Dict]:
+    """Results of the last saved run against the target, keyed like BenchmarkResult.key"""
+    last = last_run(TREND_FILE, target, report_dir)
+    if not last:
+        return {}
+    return {BenchmarkResult(**{k: v for k, v in r.items() if k in BenchmarkResult.__dataclass_fields__}).key: r
+            for r in last["results"]}
+
+
+def save_trend(results: List[BenchmarkResult], target: str, report_dir: str = "test_reports") -> Path:
+    """Append the run to test_reports/api_benchmark_trend.jsonl and .csv (see tests.utils.trend)"""
+    return append_trend(TREND_FILE, results, target, TREND_FIELDS, key="results", label="API benchmark",
+                        report_dir=report_dir)
+
+
+def main():
+    from tests.stand_in.server import StandInServer
+
+    parser = argparse.ArgumentParser(description="Benchmark the backend API across concurrency levels")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="Comma-separated concurrency levels (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per operation batch")
+    parser.add_argument("--page-sizes", default=",".join(map(str, DEFAULT_PAGE_SIZES)),
+                        help="Comma-separated list page sizes (default: %(default)s)")
+    parser.add_argument("--env", default=None,
+                        help="Environment from ENVIRONMENTS to run against (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Stand-in API latency")
+    parser.add_argument("--headed", action="store_true", help="Show the browser used for login")
+    args = parser.parse_args()
+
+    stand_in = None
+    if args.env:
+        base_url, target = get_environment_config(args.env)["base_url"], args.env
+    else:
+        stand_in = StandInServer(latency_ms=args.latency_ms).start()
+        stand_in.seed("cost_centers", 200, f"{NAME_PREFIX} Seed")
+        stand_in.seed("expense_types", 200, f"{NAME_PREFIX} Seed")
+        stand_in.seed("invoices", 200, f"{NAME_PREFIX} Seed")
+        base_url, target = stand_in.base_url, "stand-in"
+
+    try:
+        api_target = discover_api(base_url, headless=not args.headed)
+        benchmark = ApiBenchmark(api_target, concurrency=[int(c) for c in args.concurrency.split(",")],
+                                 requests=args.requests,
+                                 page_sizes=[int(s) for s in args.page_sizes.split(",")])
+        results = benchmark.run()
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    print_results(results, previous_run(target))
+    save_trend(results, target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Scripted user journeys for the load runner.
+
+A journey is a function taking a VirtualUser. It drives the regular page objects
+and wraps every user-visible action in vu.step(name) so the runner can time it.
+Page-object methods that report failure by returning False are turned into
+errors here, so they count towards the step's error rate.
+"""
+from typing import Callable, Dict
+
+from pages.cost_centers.cost_centers_page import CostCentersPage
+from pages.expense_types.expense_types_page import ExpenseTypesPage
+from pages.login.login_page import LoginPage
+from tests.Invoices.page_object.invoices_page import InvoicesPage
+from tests.utils.invoice_documents import KB, invoice_document
+
+# Queries matching the names the stand-in is seeded with (and common real data)
+SEARCH_TERMS = ["Load", "Test", "Cost", "Invoice", "1", "zzz-no-match"]
+
+
+def login(vu) -> None:
+    """Log in and land on the dashboard"""
+    with vu.step("login"):
+        login_page = LoginPage(vu.page, base_url=vu.base_url)
+        login_page.navigate()
+        login_page.login(vu.credentials["email"], vu.credentials["password"])
+        vu.page.wait_for_url("**/dashboard", timeout=vu.timeout)
+
+
+def browse(vu) -> None:
+    """Open the cost centers, expense types and invoices lists"""
+    for step, page_class in (("cost_centers.open", CostCentersPage),
+                             ("expense_types.open", ExpenseTypesPage),
+                             ("invoices.open", InvoicesPage)):
+        with vu.step(step):
+            page_class(vu.page, base_url=vu.base_url).open(timeout=vu.timeout)
+        vu.think()
+
+
+def search(vu) -> None:
+    """Search the cost centers and expense types lists"""
+    cost_centers = CostCentersPage(vu.page, base_url=vu.base_url)
+    with vu.step("cost_centers.open"):
+        cost_centers.open(timeout=vu.timeout)
+    with vu.step("cost_centers.search"):
+        cost_centers.search(vu.random.choice(SEARCH_TERMS))
+    vu.think()
+
+    expense_types = ExpenseTypesPage(vu.page, base_url=vu.base_url)
+    with vu.step("expense_types.open"):
+        expense_types.open(timeout=vu.timeout)
+    with vu.step("expense_types.search"):
+        expense_types.search(vu.random.choice(SEARCH_TERMS))
+
+
+def create(vu) -> None:
+    """Create a cost center, find it and delete it again"""
+    name = vu.unique_name("Load CC")
+    cost_centers = CostCentersPage(vu.page, base_url=vu.base_url)
+    with vu.step("cost_centers.open"):
+        cost_centers.open(timeout=vu.timeout)
+    with vu.step("cost_centers.create"):
+        cost_centers.new_cost_center_btn.click()
+        cost_centers.name_input.wait_for(state="visible", timeout=vu.timeout)
+        cost_centers.fill_name_field(name)
+        cost_centers.submit_form()
+        cost_centers.search(name)
+        if not cost_centers.is_item_in_table(name, timeout=vu.timeout):
+            raise AssertionError(f"Created cost center '{name}' not listed")
+    vu.think()
+    with vu.step("cost_centers.delete"):
+        if not cost_centers.delete_item(name):
+            raise AssertionError(f"Could not delete cost center '{name}'")
+
+
+def upload(vu) -> None:
+    """Upload one small generated invoice"""
+    invoices = InvoicesPage(vu.page, base_url=vu.base_url)
+    with vu.step("invoices.open"):
+        invoices.open(timeout=vu.timeout)
+    with vu.step("invoices.prepare"):
+        invoices.new_invoice_btn.click()
+        invoices.overlay['title'].wait_for(state="visible", timeout=vu.timeout)
+        invoices.select_cost_center()
+        invoices.select_expense_type()
+    vu.think()
+    with vu.step("invoices.upload"):
+        document = invoice_document(vu.unique_name("load_invoice") + ".png", size=100 * KB,
+                                    seed=vu.random.randrange(1 << 16))
+        summary = invoices.upload_invoices([document], timeout=vu.timeout)
+        if summary["failed"]:
+            raise AssertionError(f"Upload failed: {summary['per_file']}")
+
+
+JOURNEYS: Dict[str, Callable] = {
+    "browse": browse,
+    "search": search,
+    "create": create,
+    "upload": upload,
+}
@@ -0,0 +1,358 @@
+"""
+Virtual-user load runner.
+
+Drives N concurrent browser sessions through the scripted journeys in
+tests/load/journeys.py. Users start one by one over the ramp-up period, log in,
+then repeatedly pick a weighted random journey and pause for a random think time
+between actions until the run duration is over. Every step is timed into a
+latency histogram with its error count; the report is printed and written to
+test_reports/load_<timestamp>.json.
+
+Playwright's sync API is bound to the thread that started it, so each virtual
+user runs in its own thread with its own Playwright instance and browser
+(budget roughly 150MB of memory per user).
+
+Run against the local stand-in:
+    python -m tests.load.load_runner --users 20 --ramp-up 30 --duration 120
+Run against a deployed environment:
+    python -m tests.load.load_runner --env staging --users 50 --journeys browse=3,search=3,upload=1
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from playwright.sync_api import sync_playwright
+
+from tests.config.test_config import CREDENTIALS, TestConfig, get_environment_config
+from tests.load.journeys import JOURNEYS, login
+from tests.utils.metrics import record_metric
+
+
+@dataclass
+class LoadProfile:
+    """Shape of a load run"""
+    users: int = 10
+    ramp_up: float = 30.0  # seconds until the last user has started
+    duration: float = 120.0  # seconds of the whole run, ramp-up included
+    think_time: Tuple[float, float] = (1.0, 3.0)  # seconds, uniformly distributed
+    journeys: Dict[str, float] = field(default_factory=lambda: {"browse": 3, "search": 3, "create": 1, "upload": 1})
+    step_timeout: float = 30000  # milliseconds
+    headless: bool = True
+
+
+class LatencyHistogram:
+    """Latency samples of one step, bucketed for the report"""
+
+    BUCKETS_MS = (100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.errors = 0
+
+    def add(self, duration_ms: float, ok: bool = True) -> None:
+        self.samples.append(duration_ms)
+        if not ok:
+            self.errors += 1
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+        return round(ordered[index], 2)
+
+    def buckets(self) -> Dict[str, int]:
+        """Sample count per latency bucket ('<=100', ..., '>30000')"""
+        counts = {f"<={b}": 0 for b in self.BUCKETS_MS}
+        counts[f">{self.BUCKETS_MS[-1]}"] = 0
+        for sample in self.samples:
+            bound = next((b for b in self.BUCKETS_MS if sample <= b), None)
+            counts[f"<={bound}" if bound else f">{self.BUCKETS_MS[-1]}"] += 1
+        return counts
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": round(max(self.samples), 2) if self.samples else None,
+            "histogram": self.buckets()
+        }
+
+
+class LoadResults:
+    """Thread-safe collector of step timings, errors and journey counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, Counter] = {}
+        self.journeys: Counter = Counter()
+        self.active_users = 0
+        self.peak_users = 0
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def record(self, step: str, duration_ms: float, error: str = None) -> None:
+        with self._lock:
+            self.steps.setdefault(step, LatencyHistogram()).add(duration_ms, ok=error is None)
+            if error:
+                self.errors.setdefault(step, Counter())[error] += 1
+
+    def journey_done(self, name: str) -> None:
+        with self._lock:
+            self.journeys[name] += 1
+
+    def user_started(self) -> None:
+        with self._lock:
+            self.active_users += 1
+            self.peak_users = max(self.peak_users, self.active_users)
+
+    def user_stopped(self) -> None:
+        with self._lock:
+            self.active_users -= 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(h.count for h in self.steps.values())
+
+    @property
+    def error_rate(self) -> float:
+        total = self.total_requests
+        return sum(h.errors for h in self.steps.values()) / total if total else 0.0
+
+    def summary(self, profile: LoadProfile = None, target: str = None) -> Dict:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        return {
+            "target": target,
+            "profile": asdict(profile) if profile else None,
+            "elapsed_s": round(elapsed, 1),
+            "peak_users": self.peak_users,
+            "steps_total": self.total_requests,
+            "steps_per_s": round(self.total_requests / elapsed, 2) if elapsed else None,
+            "error_rate": round(self.error_rate, 4),
+            "journeys": dict(self.journeys),
+            "steps": {name: histogram.to_dict() for name, histogram in sorted(self.steps.items())},
+            "errors": {name: dict(errors.most_common(5)) for name, errors in self.errors.items()}
+        }
+
+    def print_report(self) -> None:
+        print(f"\n{'Step':<24} {'Count':>6} {'Err%':>6} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for name, histogram in sorted(self.steps.items()):
+            stats = histogram.to_dict()
+            print(f"{name:<24} {stats['count']:>6} {stats['error_rate'] * 100:>5.1f}% "
+                  + " ".join(f"{stats[k]:>9}" for k in ("p50", "p90", "p95", "p99", "max")))
+        print(f"\nPeak users: {self.peak_users}, steps: {self.total_requests}, "
+              f"error rate: {self.error_rate * 100:.2f}%, journeys: {dict(self.journeys)}")
+        for name, errors in self.errors.items():
+            for message, count in errors.most_common(3):
+                print(f"  {name}: {count}x {message}")
+
+    def save(self, profile: LoadProfile = None, target: str = None, report_dir: str = "test_reports") -> Path:
+        output_dir = Path(report_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / f"load_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.summary(profile, target), f, indent=2)
+        print(f"Load test report saved to: {filepath}")
+        return filepath
+
+
+class VirtualUser:
+    """One simulated user: a browser page plus the helpers the journeys use"""
+
+    def __init__(self, user_id: int, page, base_url: str, credentials: Dict[str, str],
+                 results: LoadResults, profile: LoadProfile, stop_event: threading.Event):
+        self.user_id = user_id
+        self.page = page
+        self.base_url = base_url
+        self.credentials = credentials
+        self.results = results
+        self.profile = profile
+        self.timeout = profile.step_timeout
+        self.random = random.Random(user_id)
+        self._stop_event = stop_event
+        self._counter = 0
+
+    @contextmanager
+    def step(self, name: str):
+        """Time the enclosed actions as one step; errors are recorded and re-raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            message = str(e).splitlines()[0][:200] if str(e) else type(e).__name__
+            self.results.record(name, (time.perf_counter() - start) * 1000, error=message)
+            raise
+        self.results.record(name, (time.perf_counter() - start) * 1000)
+
+    def think(self) -> None:
+        """Pause like a user reading the page (returns early when the run is over)"""
+        self._stop_event.wait(self.random.uniform(*self.profile.think_time))
+
+    def unique_name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix} {self.user_id}-{self._counter}-{int(time.time())}"
+
+    def pick_journey(self) -> str:
+        names = list(self.profile.journeys)
+        return self.random.choices(names, weights=[self.profile.journeys[n] for n in names])[0]
+
+
+class LoadRunner:
+    """Runs a LoadProfile against one base URL"""
+
+    def __init__(self, base_url: str, profile: LoadProfile = None, credentials: Dict[str, str] = None,
+                 target: str = None):
+        """
+        Args:
+            base_url: Base URL of the app (the stand-in's or a deployed environment's)
+            profile: Shape of the run (default: LoadProfile())
+            credentials: Login credentials shared by all users (default: CREDENTIALS['DEFAULT'])
+            target: Label of the system under test in the report
+        """
+        self.base_url = base_url
+        self.profile = profile or LoadProfile()
+        self.credentials = credentials or CREDENTIALS["DEFAULT"]
+        self.target = target or base_url
+        self.results = LoadResults()
+        self._stop_event = threading.Event()
+
+        unknown = set(self.profile.journeys) - set(JOURNEYS)
+        if unknown:
+            raise ValueError(f"Unknown journeys: {sorted(unknown)}. Available: {sorted(JOURNEYS)}")
+
+    def _virtual_user(self, user_id: int, start_delay: float) -> None:
+        if self._stop_event.wait(start_delay):
+            return
+        with sync_playwright() as playwright:
+            browser = getattr(playwright, TestConfig.BROWSER).launch(headless=self.profile.headless)
+            context = browser.new_context(viewport=TestConfig.VIEWPORT)
+            page = context.new_page()
+            vu = VirtualUser(user_id, page, self.base_url, self.credentials, self.results,
+                             self.profile, self._stop_event)
+            self.results.user_started()
+            try:
+                login(vu)
+                while not self._stop_event.is_set():
+                    journey = vu.pick_journey()
+                    try:
+                        JOURNEYS[journey](vu)
+                        self.results.journey_done(journey)
+                    except Exception:
+                        # Already recorded by the failing step; start over from a clean page
+                        self.results.journey_done(f"{journey}.failed")
+                    vu.think()
+            except Exception as e:
+                print(f"Virtual user {user_id} stopped: {str(e).splitlines()[0] if str(e) else e}")
+            finally:
+                self.results.user_stopped()
+                context.close()
+                browser.close()
+
+    def run(self) -> LoadResults:
+        """Start all users over the ramp-up period and stop them after the duration"""
+        profile = self.profile
+        interval = profile.ramp_up / max(1, profile.users - 1) if profile.users > 1 else 0
+        print(f"Starting {profile.users} virtual users over {profile.ramp_up}s for {profile.duration}s "
+              f"against {self.target}")
+
+        self.results = LoadResults()
+        self._stop_event.clear()
+        threads = [threading.Thread(target=self._virtual_user, args=(i + 1, i * interval),
+                                    name=f"vu-{i + 1}", daemon=True)
+                   for i in range(profile.users)]
+        for thread in threads:
+            thread.start()
+
+        deadline = time.time() + profile.duration
+        while time.time() < deadline and any(t.is_alive() for t in threads):
+            time.sleep(min(5.0, max(0.0, deadline - time.time())))
+            print(f"  {self.results.active_users} active users, {self.results.total_requests} steps, "
+                  f"{self.results.error_rate * 100:.1f}% errors")
+        self._stop_event.set()
+
+        # Let users finish their current step before reporting
+        for thread in threads:
+            thread.join(timeout=profile.step_timeout / 1000 * 2)
+        self.results.finished_at = time.time()
+
+        for name, histogram in self.results.steps.items():
+            if histogram.count:
+                record_metric(f"load.{name}.p95", histogram.percentile(95),
+                              count=histogram.count, error_rate=round(histogram.error_rate, 4))
+        return self.results
+
+
+def parse_journeys(value: str) -> Dict[str, float]:
+    """Parse 'browse=3,search=2,upload' into journey weights (weight defaults to 1)"""
+    weights = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, weight = item.partition("=")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+def main():
+    from tests.stand_in.server import StandInServer
+
+    parser = argparse.ArgumentParser(description="Run concurrent virtual users through scripted journeys")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--ramp-up", type=float, default=30, help="Seconds until all users have started")
+    parser.add_argument("--duration", type=float, default=120, help="Total run time in seconds")
+    parser.add_argument("--think-time", default="1-3", help="Think time range in seconds, e.g. 1-3")
+    parser.add_argument("--journeys", default="browse=3,search=3,create=1,upload=1",
+                        help="Weighted journeys (default: %(default)s)")
+    parser.add_argument("--env", default=None,
+                        help="Environment from ENVIRONMENTS to run against (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Stand-in API latency")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    low, _, high = args.think_time.partition("-")
+    profile = LoadProfile(users=args.users, ramp_up=args.ramp_up, duration=args.duration,
+                          think_time=(float(low), float(high or low)),
+                          journeys=parse_journeys(args.journeys), headless=not args.headed)
+
+    stand_in = None
+    if args.env:
+        base_url, target = get_environment_config(args.env)["base_url"], args.env
+    else:
+        stand_in = StandInServer(latency_ms=args.latency_ms).start()
+        stand_in.seed("cost_centers", 25, "Load Cost Center")
+        stand_in.seed("expense_types", 25, "Load Expense Type")
+        stand_in.seed("invoices", 50, "Load Invoice")
+        base_url, target = stand_in.base_url, "stand-in"
+
+    try:
+        results = LoadRunner(base_url, profile, target=target).run()
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    results.print_report()
+    results.save(profile, target)
+
+
+if __name__ == "__main__":
+    main()
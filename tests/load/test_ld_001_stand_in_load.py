@@ -0,0 +1,29 @@
+import pytest
+from tests.load.load_runner import LoadProfile, LoadRunner
+
+# Small profile that fits a CI job; the CLI runs the 20-50 user profiles
+SMOKE_PROFILE = LoadProfile(
+    users=3,
+    ramp_up=3,
+    duration=30,
+    think_time=(0.2, 0.5),
+    journeys={"browse": 2, "search": 2, "create": 1, "upload": 1}
+)
+
+
+@pytest.mark.load
+class TestStandInLoad:
+    def test_concurrent_users_against_stand_in(self, stand_in):
+        """Run a few concurrent virtual users through all journeys and check error rate and coverage"""
+        runner = LoadRunner(stand_in.base_url, SMOKE_PROFILE, target="stand-in")
+        results = runner.run()
+        results.print_report()
+        results.save(SMOKE_PROFILE, "stand-in")
+        
+        assert results.peak_users == SMOKE_PROFILE.users, \
+            f"Expected {SMOKE_PROFILE.users} concurrent users, peaked at {results.peak_users}"
+        assert "login" in results.steps and results.steps["login"].errors == 0, "Virtual users could not log in"
+        assert results.error_rate < 0.05, f"Error rate too high: {results.error_rate * 100:.1f}%"
+        
+        for histogram in results.steps.values():
+            assert histogram.percentile(95) is not None
@@ -0,0 +1,23 @@
+import pytest
+from tests.load.api_benchmark import ApiBenchmark, discover_api, print_results, save_trend
+
+
+@pytest.mark.load
+class TestApiBenchmark:
+    def test_api_sweep_against_stand_in(self, stand_in):
+        """Discover the API through a login, sweep two concurrency levels and check every operation ran cleanly"""
+        target = discover_api(stand_in.base_url)
+        assert set(target.collection_urls) == {"cost_center", "expense_type", "invoice"}, \
+            f"List API calls not discovered: {target.collection_urls}"
+
+        results = ApiBenchmark(target, concurrency=(1, 5), requests=10, page_sizes=(10, 50)).run()
+        print_results(results)
+        save_trend(results, "stand-in-smoke")
+
+        operations = {(r.resource, r.operation) for r in results}
+        for resource in ("cost_center", "expense_type"):
+            for operation in ("list", "search", "create", "delete"):
+                assert (resource, operation) in operations, f"{resource} {operation} was not benchmarked"
+        for result in results:
+            assert result.errors == 0, f"{result.key} failed: {result.error_samples}"
+            assert result.p95 is not None and result.throughput_rps
@@ -1,6 +1,8 @@
 from playwright.sync_api import expect, Page
 import time
 from conftest import LOGIN_URL
+from tests.config.performance_budgets import get_budget
+from tests.utils.throttling import profile_name
 
 def test_login_page_load_time(login_page: Page):
     """Test login page load performance"""
@@ -25,8 +27,9 @@ def test_login_page_load_time(login_page: Page):
         expect(password_field).to_be_visible()
         expect(login_button).to_be_visible()
         
-        # Assert load time is reasonable
-        assert load_time < 5, "Page load time is too long"
+        # Assert load time is within the login budget (scaled for --throttle runs)
+        max_load_time = get_budget("LOGIN", profile_name(login_page))["load_time"]["max"] / 1000
+        assert load_time < max_load_time, f"Page load time is too long (budget {max_load_time:.1f}s)"
         
         print("\n=== Test completed successfully ===")
         
@@ -0,0 +1,151 @@
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Pattern, Union
+from playwright.sync_api import Page, Dialog
+
+
+@dataclass(eq=False)
+class DialogExpectation:
+    """A queued instruction for how to handle an upcoming dialog"""
+    dialog_type: Optional[str] = None
+    message: Optional[Pattern] = None
+    action: str = "accept"
+    prompt_text: Optional[str] = None
+    handled: bool = False
+    handled_message: Optional[str] = None
+
+    def matches(self, dialog: Dialog) -> bool:
+        if self.dialog_type and dialog.type != self.dialog_type:
+            return False
+        if self.message and not self.message.search(dialog.message):
+            return False
+        return True
+
+
+class DialogManager:
+    """Single page-scoped 'dialog' listener with an expectation queue.
+
+    Page objects queue what they expect ("accept the next confirm whose text matches
+    X") instead of registering a new listener per call, so bulk loops keep a constant
+    cost per dialog. Every dialog is logged; dialogs nobody expected are dismissed and
+    reported.
+    """
+
+    def __init__(self, page: Page, unexpected_action: str = "dismiss"):
+        self.page = page
+        self.unexpected_action = unexpected_action
+        self.expectations = deque()
+        self.log: List[Dict] = []
+        self.unexpected: List[Dict] = []
+        page.on("dialog", self._on_dialog)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "DialogManager":
+        """Return the dialog manager attached to the page, creating it on first use"""
+        manager = getattr(page, "_dialog_manager", None)
+        if manager is None:
+            manager = cls(page)
+            page._dialog_manager = manager
+        return manager
+
+    def expect(self, dialog_type: str = None, message: Union[str, Pattern] = None,
+               action: str = "accept", prompt_text: str = None) -> DialogExpectation:
+        """Queue handling for the next dialog matching the type and message
+
+        Args:
+            dialog_type: 'alert', 'confirm', 'prompt' or 'beforeunload' (None matches any)
+            message: Regex (string or compiled) the dialog message must contain
+            action: 'accept' or 'dismiss'
+            prompt_text: Text to enter when accepting a prompt
+
+        Returns:
+            DialogExpectation: Becomes handled=True once a matching dialog was processed
+        """
+        if isinstance(message, str):
+            message = re.compile(message, re.IGNORECASE)
+        expectation = DialogExpectation(dialog_type, message, action, prompt_text)
+        self.expectations.append(expectation)
+        return expectation
+
+    def accept_next(self, dialog_type: str = "confirm", message: Union[str, Pattern] = None) -> DialogExpectation:
+        """Accept the next dialog of the given type whose message matches"""
+        return self.expect(dialog_type, message, action="accept")
+
+    def dismiss_next(self, dialog_type: str = "confirm", message: Union[str, Pattern] = None) -> DialogExpectation:
+        """Dismiss the next dialog of the given type whose message matches"""
+        return self.expect(dialog_type, message, action="dismiss")
+
+    def cancel(self, expectation: DialogExpectation) -> None:
+        """Drop an expectation that will not be needed anymore"""
+        if expectation in self.expectations:
+            self.expectations.remove(expectation)
+
+    def wait_for(self, expectation: DialogExpectation, timeout: float = 10000) -> bool:
+        """Wait until the expectation has been fulfilled by a dialog
+
+        Args:
+            expectation: Expectation returned by expect/accept_next/dismiss_next
+            timeout: Maximum time to wait in milliseconds
+
+        Returns:
+            bool: True if a matching dialog was handled, False on timeout (the
+                  expectation is removed from the queue in that case)
+        """
+        deadline = time.time() + timeout / 1000
+        while not expectation.handled and time.time() < deadline:
+            # Waiting through Playwright lets the dialog event be dispatched
+            self.page.wait_for_timeout(50)
+        if not expectation.handled:
+            self.cancel(expectation)
+        return expectation.handled
+
+    def _on_dialog(self, dialog: Dialog) -> None:
+        entry = {
+            "type": dialog.type,
+            "message": dialog.message,
+            "url": self.page.url,
+            "timestamp": datetime.now().isoformat()
+        }
+        expectation = next((e for e in self.expectations if e.matches(dialog)), None)
+        if expectation is not None:
+            self.expectations.remove(expectation)
+            action = expectation.action
+        else:
+            action = self.unexpected_action
+            self.unexpected.append(entry)
+            print(f"Warning: Unexpected {dialog.type} dialog: {dialog.message}")
+
+        entry["action"] = action
+        entry["expected"] = expectation is not None
+        self.log.append(entry)
+        print(f"Dialog ({dialog.type}) message: {dialog.message} -> {action}")
+
+        try:
+            if action == "accept":
+                if expectation is not None and expectation.prompt_text is not None:
+                    dialog.accept(expectation.prompt_text)
+                else:
+                    dialog.accept()
+            else:
+                dialog.dismiss()
+        finally:
+            if expectation is not None:
+                expectation.handled = True
+                expectation.handled_message = dialog.message
+
+    def report(self) -> Dict:
+        """Return a summary of handled, unexpected and still-pending dialogs"""
+        return {
+            "total": len(self.log),
+            "unexpected": list(self.unexpected),
+            "pending_expectations": len(self.expectations)
+        }
+
+    def close(self) -> None:
+        """Stop listening for dialogs on the page"""
+        self.page.remove_listener("dialog", self._on_dialog)
+        if getattr(self.page, "_dialog_manager", None) is self:
+            self.page._dialog_manager = None
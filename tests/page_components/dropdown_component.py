@@ -0,0 +1,204 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+from playwright.sync_api import Page, Locator, Response, expect
+from tests.utils.metrics import record_metric
+
+# Reads every option of an open listbox in one round trip
+_READ_OPTIONS_JS = """listbox => Array.from(listbox.querySelectorAll('[role="option"]')).map(el => ({
+    text: (el.textContent || '').trim(),
+    disabled: el.getAttribute('aria-disabled') === 'true' || el.hasAttribute('data-disabled')
+}))"""
+
+_MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+@dataclass
+class DropdownOption:
+    index: int
+    text: str
+    disabled: bool = False
+
+
+class OptionCache:
+    """Page-scoped cache of dropdown option lists.
+
+    Entries are dropped when the page navigates, and an entry is dropped when a
+    create/update/delete API response for its resource arrives, so the lists never
+    outlive the data they were read from.
+    """
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._entries: Dict[str, List[DropdownOption]] = {}
+        self._url_parts: Dict[str, Sequence[str]] = {}
+        page.on("framenavigated", self._on_navigated)
+        page.on("response", self._on_response)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "OptionCache":
+        """Return the option cache attached to the page, creating it on first use"""
+        cache = getattr(page, "_option_cache", None)
+        if cache is None:
+            cache = cls(page)
+            page._option_cache = cache
+        return cache
+
+    def get(self, key: str) -> Optional[List[DropdownOption]]:
+        return self._entries.get(key)
+
+    def put(self, key: str, options: List[DropdownOption], url_parts: Sequence[str] = ()) -> None:
+        self._entries[key] = options
+        self._url_parts[key] = url_parts
+
+    def invalidate(self, key: str = None) -> None:
+        """Drop one entry, or all of them when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _on_navigated(self, frame) -> None:
+        if frame == self.page.main_frame:
+            self.invalidate()
+
+    def _on_response(self, response: Response) -> None:
+        if response.request.method not in _MUTATING_METHODS or response.status >= 400:
+            return
+        for key, url_parts in list(self._url_parts.items()):
+            if any(part in response.url for part in url_parts):
+                self.invalidate(key)
+
+
+class DropdownComponent:
+    """Radix select/combobox whose options are read once and then picked directly.
+
+    Opening the dropdown the first time reads all option texts in a single evaluate
+    and caches them for the page (see OptionCache). Later selections pick the option
+    by its cached index, or by typing its text, without scanning the list again.
+    """
+
+    def __init__(self, page: Page, trigger: Locator, cache_key: str,
+                 api_url_parts: Sequence[str] = (), metric_name: str = None):
+        """
+        Args:
+            page: Playwright page object
+            trigger: Locator of the button that opens the dropdown
+            cache_key: Name of the option list in the page's cache (e.g., 'cost_centers')
+            api_url_parts: Substrings of the API URLs whose create/delete responses
+                           change the options (e.g., ['cost-centers'])
+            metric_name: Name under which selection latency is recorded (None to skip)
+        """
+        self.page = page
+        self.trigger = trigger
+        self.cache_key = cache_key
+        self.api_url_parts = tuple(api_url_parts)
+        self.metric_name = metric_name
+
+    @property
+    def cache(self) -> OptionCache:
+        return OptionCache.for_page(self.page)
+
+    @property
+    def listbox(self) -> Locator:
+        """The open listbox, located through the trigger's aria-controls when set"""
+        controls = self.trigger.get_attribute("aria-controls")
+        if controls:
+            return self.page.locator(f'[role="listbox"][id="{controls}"]')
+        return self.page.locator('div[role="listbox"]')
+
+    def invalidate(self) -> None:
+        """Forget the cached options (e.g., after a parent dropdown changed them)"""
+        self.cache.invalidate(self.cache_key)
+
+    def open(self, timeout: float = 10000) -> Locator:
+        """Open the dropdown and return its listbox"""
+        if self.trigger.get_attribute("aria-expanded") != "true":
+            self.trigger.click(timeout=timeout)
+        listbox = self.listbox
+        listbox.wait_for(state="visible", timeout=timeout)
+        return listbox
+
+    def close(self) -> None:
+        if self.trigger.get_attribute("aria-expanded") == "true":
+            self.page.keyboard.press("Escape")
+
+    def _read_options(self, listbox: Locator, timeout: float) -> List[DropdownOption]:
+        # Options may be fetched after the listbox opens
+        listbox.locator('[role="option"]').first.wait_for(state="attached", timeout=timeout)
+        raw = listbox.evaluate(_READ_OPTIONS_JS)
+        options = [DropdownOption(index, o["text"], o["disabled"]) for index, o in enumerate(raw)]
+        self.cache.put(self.cache_key, options, self.api_url_parts)
+        return options
+
+    def options(self, timeout: float = 10000) -> List[str]:
+        """Return the option texts, opening the dropdown only if they are not cached"""
+        options = self.cache.get(self.cache_key)
+        if options is None:
+            options = self._read_options(self.open(timeout), timeout)
+            self.close()
+        return [o.text for o in options]
+
+    @staticmethod
+    def _match(options: List[DropdownOption], text: Optional[str]) -> Optional[DropdownOption]:
+        enabled = [o for o in options if not o.disabled]
+        if text is None:
+            return enabled[0] if enabled else None
+        wanted = text.strip().lower()
+        return (next((o for o in enabled if o.text.lower() == wanted), None)
+                or next((o for o in enabled if wanted in o.text.lower()), None))
+
+    def select(self, text: str = None, typeahead: bool = False, fallback_to_first: bool = False,
+               timeout: float = 10000) -> str:
+        """Select an option and return its text
+
+        Args:
+            text: Option to select (exact match first, then substring; case-insensitive).
+                  None selects the first enabled option.
+            typeahead: Type the option text and press Enter instead of clicking it
+            fallback_to_first: Select the first option when text matches none
+            timeout: Maximum time in milliseconds for each wait
+
+        Returns:
+            str: Text of the selected option
+
+        Raises:
+            ValueError: If no option matches (and fallback_to_first is False)
+        """
+        start = time.perf_counter()
+        cached = self.cache.get(self.cache_key) is not None
+
+        for attempt in range(2):
+            listbox = self.open(timeout)
+            options = self.cache.get(self.cache_key) or self._read_options(listbox, timeout)
+            option = self._match(options, text)
+            if option is None and fallback_to_first:
+                print(f"Option '{text}' not found in {self.cache_key}, selecting the first one")
+                option = self._match(options, None)
+            if option is None:
+                self.close()
+                available = [o.text for o in options]
+                raise ValueError(f"No option matching '{text}' in {self.cache_key}. Available: {available}")
+
+            if typeahead:
+                self.page.keyboard.type(option.text)
+                self.page.keyboard.press("Enter")
+            else:
+                listbox.locator('[role="option"]').nth(option.index).click()
+            listbox.wait_for(state="hidden", timeout=timeout)
+
+            try:
+                expect(self.trigger).to_contain_text(option.text, timeout=2000)
+                break
+            except AssertionError:
+                if attempt:
+                    raise
+                # The list changed under the cache; read it again once
+                print(f"Cached {self.cache_key} options were stale, re-reading")
+                self.invalidate()
+                cached = False
+
+        if self.metric_name:
+            record_metric(self.metric_name, (time.perf_counter() - start) * 1000,
+                          option=option.text, cached=cached)
+        return option.text
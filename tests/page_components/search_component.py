@@ -0,0 +1,85 @@
+import time
+from urllib.parse import unquote_plus
+from playwright.sync_api import Page, Locator, TimeoutError
+from tests.page_components.table_watcher import TableWatcher
+from tests.utils.metrics import record_metric
+
+
+class SearchComponent:
+    """Search box bound to a table, synchronized on the search API response.
+
+    The query is filled in one step and the search completes as soon as the
+    backend response for that query has arrived and the table has re-rendered,
+    instead of typing character by character and sleeping.
+    """
+
+    def __init__(self, page: Page, search_input: Locator, api_url_part: str,
+                 watcher: TableWatcher, metric_name: str = "search.latency"):
+        """
+        Args:
+            page: Playwright page object
+            search_input: Locator of the search text box
+            api_url_part: Substring identifying the list/search API URL (e.g., 'cost-centers')
+            watcher: TableWatcher for the table that displays the results
+            metric_name: Name under which query-to-results latency is recorded
+        """
+        self.page = page
+        self.search_input = search_input
+        self.api_url_part = api_url_part
+        self.watcher = watcher
+        self.metric_name = metric_name
+        self.last_latency_ms = None
+
+    def _is_search_response(self, response, query: str) -> bool:
+        """Check whether a response belongs to the search request for the query"""
+        if self.api_url_part not in response.url or response.request.method != "GET":
+            return False
+        if response.request.resource_type not in ("fetch", "xhr"):
+            return False
+        if not query:
+            return True
+        return query.lower() in unquote_plus(response.url).lower()
+
+    def search(self, query: str, submit: bool = True, timeout: float = 10000,
+               settle_timeout: float = 1500) -> float:
+        """Run a search and wait until its results are rendered
+
+        Args:
+            query: Text to search for ('' clears the search)
+            submit: Whether to press Enter after filling the query
+            timeout: Maximum time in milliseconds to wait for the search response
+            settle_timeout: Maximum time in milliseconds to wait for the table to re-render
+                            after the response; identical results are accepted once it expires
+
+        Returns:
+            float: Query-to-results latency in milliseconds (0 when clearing an empty search);
+                   query-to-response when the results did not change
+        """
+        self.search_input.wait_for(state="visible", timeout=timeout)
+        if self.search_input.input_value() == query:
+            if not query:
+                # Nothing to clear
+                return 0.0
+            # Re-running the same query: clear it first so the app issues a fresh request
+            self.search_input.fill("")
+
+        before = self.watcher.fingerprint()
+        start = time.perf_counter()
+
+        with self.page.expect_response(lambda r: self._is_search_response(r, query), timeout=timeout):
+            self.search_input.fill(query)
+            if submit:
+                self.search_input.press("Enter")
+        response_ms = (time.perf_counter() - start) * 1000
+
+        try:
+            self.watcher.wait_for_change(from_fingerprint=before, timeout=settle_timeout)
+            changed = True
+        except TimeoutError:
+            # The response rendered the same rows as before (e.g., repeating a search);
+            # the settle wait is not part of the latency
+            changed = False
+
+        self.last_latency_ms = (time.perf_counter() - start) * 1000 if changed else response_ms
+        record_metric(self.metric_name, self.last_latency_ms, query=query, changed=changed)
+        return self.last_latency_ms
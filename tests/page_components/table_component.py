@@ -1,5 +1,9 @@
+import re
 from playwright.sync_api import Page, expect
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from pages.base_page import step
+
+ROW_SELECTOR = 'tr[data-slot="table-row"]'
 
 class TableComponent:
     def __init__(self, page: Page, table_selector: str = 'table[data-slot="table"]'):
@@ -13,7 +17,7 @@ class TableComponent:
         self.page.locator('tbody[data-slot="table-body"]').wait_for(state='visible')
         
         # Get all rows with the data-slot="table-row" attribute
-        rows = self.page.locator('tr[data-slot="table-row"]').all()
+        rows = self.page.locator(ROW_SELECTOR).all()
         
         # If no rows found, try alternative selector
         if not rows:
@@ -124,3 +128,61 @@ class TableComponent:
         row = self.get_row_by_text(text)
         expect(row).to_be_visible(timeout=timeout)
         return row
+    
+    # Pagination (instrumented as steps so hooks can attribute their cost)
+    @property
+    def page_info(self):
+        return self.page.locator("div.text-sm.font-medium.text-gray-900:has-text('Page')").first
+    
+    def get_page_position(self) -> Tuple[int, int]:
+        """Current page and page count from the "Page X of Y" text"""
+        match = re.search(r'Page (\d+) of (\d+)', self.page_info.inner_text())
+        if not match:
+            raise ValueError(f"Could not parse page info: {self.page_info.inner_text()}")
+        return int(match.group(1)), int(match.group(2))
+    
+    def _change_page(self, title: str, timeout: float):
+        before = self.page_info.inner_text()
+        self.page.locator(f'button[title="{title}"]:visible').first.click()
+        expect(self.page_info).not_to_have_text(before, timeout=timeout)
+        return self.get_page_position()
+    
+    @step
+    def next_page(self, timeout: float = 10000) -> Tuple[int, int]:
+        """Go to the next page and wait for the page info to update"""
+        return self._change_page("Next page", timeout)
+    
+    @step
+    def previous_page(self, timeout: float = 10000) -> Tuple[int, int]:
+        """Go to the previous page and wait for the page info to update"""
+        return self._change_page("Previous page", timeout)
+    
+    # Rows per page
+    @property
+    def first_row(self):
+        return self.page.locator(ROW_SELECTOR).first
+    
+    @property
+    def page_size_select(self):
+        return self.page.locator("div.bg-gray-50.border-t select").first
+    
+    def get_page_size_options(self) -> List[int]:
+        """Page sizes offered by the "Rows per page" select"""
+        values = self.page_size_select.locator("option").evaluate_all("options => options.map(o => o.value)")
+        return [int(value) for value in values if value.isdigit()]
+    
+    def get_page_size(self) -> int:
+        return int(self.page_size_select.input_value())
+    
+    @step
+    def set_page_size(self, size: int, timeout: float = 10000) -> int:
+        """Select the number of rows per page (use wait_for_row_count for the re-render)"""
+        if self.get_page_size() != size:
+            self.page_size_select.select_option(str(size), timeout=timeout)
+        return size
+    
+    def wait_for_row_count(self, count: int, timeout: float = 10000) -> None:
+        """Wait until at least `count` rows are rendered, checking on every animation frame"""
+        self.page.wait_for_function(
+            "([selector, count]) => document.querySelectorAll(selector).length >= count",
+            arg=[ROW_SELECTOR, count], polling="raf", timeout=timeout)
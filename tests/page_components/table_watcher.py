@@ -0,0 +1,164 @@
+from playwright.sync_api import Page, TimeoutError
+from typing import Dict, Optional
+
+# Resolves a promise from inside the page as soon as the table body satisfies the
+# requested condition. A MutationObserver is attached to the table (or the body when
+# the table is not rendered yet) so the check only runs when the DOM actually changes.
+_WATCH_SCRIPT = """
+([tableSelector, rowSelector, mode, text, exact, fromCount, fromFingerprint, timeout]) => new Promise(resolve => {
+    const started = performance.now();
+    const needle = (text || '').toLowerCase();
+
+    const rows = () => {
+        const table = document.querySelector(tableSelector);
+        return table ? Array.from(table.querySelectorAll(rowSelector)) : [];
+    };
+    // Exact matches compare single cells, since a row's text runs all of its cells together
+    const cellText = cell => (cell.textContent || '').trim().toLowerCase();
+    const rowMatches = row => exact
+        ? Array.from(row.querySelectorAll('td')).some(cell => cellText(cell) === needle)
+        : cellText(row).includes(needle);
+    const fingerprint = current => {
+        let hash = 0;
+        const source = current.length + '|' + current.map(r => r.textContent || '').join('\\u0001');
+        for (let i = 0; i < source.length; i++) {
+            hash = ((hash << 5) - hash + source.charCodeAt(i)) | 0;
+        }
+        return current.length + ':' + (hash >>> 0).toString(16);
+    };
+    const state = () => {
+        const current = rows();
+        return {
+            count: current.length,
+            fingerprint: fingerprint(current),
+            matched: needle ? current.some(rowMatches) : false
+        };
+    };
+    const satisfied = s => {
+        switch (mode) {
+            case 'appear': return s.matched;
+            case 'disappear': return !s.matched;
+            case 'count': return s.count !== fromCount;
+            case 'fingerprint': return s.fingerprint !== fromFingerprint;
+        }
+        return false;
+    };
+
+    let observer = null;
+    let timer = null;
+    const finish = (s, ok) => {
+        if (observer) observer.disconnect();
+        if (timer) clearTimeout(timer);
+        resolve({ ok, count: s.count, fingerprint: s.fingerprint, elapsed: performance.now() - started });
+    };
+
+    const initial = state();
+    if (satisfied(initial)) {
+        finish(initial, true);
+        return;
+    }
+
+    observer = new MutationObserver(() => {
+        const s = state();
+        if (satisfied(s)) finish(s, true);
+    });
+    const root = document.querySelector(tableSelector) || document.body;
+    // Observe the whole document when the table is not mounted yet, since React may
+    // replace the table element when switching between empty and populated states.
+    observer.observe(root === document.body ? document.body : root.parentElement || root, {
+        childList: true, subtree: true, characterData: true
+    });
+    timer = setTimeout(() => finish(state(), false), timeout);
+})
+"""
+
+
+class TableWatcher:
+    """Event-driven waits on table contents using an in-page MutationObserver.
+
+    Replaces sleep-and-retry polling loops: each wait is a single round trip that
+    resolves as soon as the DOM reaches the requested state.
+    """
+
+    def __init__(self, page: Page, table_selector: str = 'table[data-slot="table"]',
+                 row_selector: str = 'tbody tr'):
+        self.page = page
+        self.table_selector = table_selector
+        self.row_selector = row_selector
+
+    def _watch(self, mode: str, text: str = None, exact: bool = False,
+               from_count: int = None, from_fingerprint: str = None,
+               timeout: float = 10000) -> Dict:
+        return self.page.evaluate(
+            _WATCH_SCRIPT,
+            [self.table_selector, self.row_selector, mode, text, exact,
+             from_count, from_fingerprint, timeout]
+        )
+
+    def snapshot(self) -> Dict:
+        """Return the current row count and content fingerprint of the table"""
+        return self._watch('fingerprint', from_fingerprint='', timeout=0)
+
+    def fingerprint(self) -> str:
+        """Return a hash of the current table rows, used to detect re-renders"""
+        return self.snapshot()['fingerprint']
+
+    def row_count(self) -> int:
+        """Return the number of rendered rows in the table body"""
+        return self.snapshot()['count']
+
+    def wait_for_row(self, text: str, timeout: float = 10000, exact: bool = False) -> Dict:
+        """Wait until a row containing the given text is rendered
+
+        Args:
+            text: Text the row should contain (case insensitive)
+            timeout: Maximum time to wait in milliseconds
+            exact: Whether a cell must match the text exactly instead of the row containing it
+
+        Returns:
+            Dict with 'count', 'fingerprint' and 'elapsed' (ms) for the final table state
+
+        Raises:
+            TimeoutError: If no matching row appears within the timeout
+        """
+        result = self._watch('appear', text=text, exact=exact, timeout=timeout)
+        if not result['ok']:
+            raise TimeoutError(f"Row with text '{text}' did not appear in the table within {timeout}ms")
+        return result
+
+    def wait_for_row_gone(self, text: str, timeout: float = 10000, exact: bool = False) -> Dict:
+        """Wait until no row containing the given text is rendered
+
+        Raises:
+            TimeoutError: If a matching row is still present after the timeout
+        """
+        result = self._watch('disappear', text=text, exact=exact, timeout=timeout)
+        if not result['ok']:
+            raise TimeoutError(f"Row with text '{text}' was still in the table after {timeout}ms")
+        return result
+
+    def wait_for_count_change(self, from_count: Optional[int] = None, timeout: float = 10000) -> Dict:
+        """Wait until the number of rows differs from from_count (defaults to the current count)
+
+        Raises:
+            TimeoutError: If the row count does not change within the timeout
+        """
+        if from_count is None:
+            from_count = self.row_count()
+        result = self._watch('count', from_count=from_count, timeout=timeout)
+        if not result['ok']:
+            raise TimeoutError(f"Table row count stayed at {from_count} for {timeout}ms")
+        return result
+
+    def wait_for_change(self, from_fingerprint: Optional[str] = None, timeout: float = 10000) -> Dict:
+        """Wait until the table contents differ from the given fingerprint
+
+        Raises:
+            TimeoutError: If the table does not re-render within the timeout
+        """
+        if from_fingerprint is None:
+            from_fingerprint = self.fingerprint()
+        result = self._watch('fingerprint', from_fingerprint=from_fingerprint, timeout=timeout)
+        if not result['ok']:
+            raise TimeoutError(f"Table contents did not change within {timeout}ms")
+        return result
@@ -0,0 +1,215 @@
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from playwright.sync_api import Page, Request, TimeoutError
+from tests.utils.metrics import record_metric
+
+_FILENAME_RE = re.compile(rb'filename="([^"]*)"')
+
+# Content types of raw (non-multipart) file uploads
+_UPLOAD_CONTENT_TYPES = ("application/pdf", "application/octet-stream", "image/")
+
+# Playwright cannot wait for either of two events, so waits are on requestfinished;
+# an upload that fails instead is noticed at the end of the current slice
+_FAILED_UPLOAD_CHECK_MS = 1000
+
+
+@dataclass
+class UploadedFile:
+    """Per-file result of a tracked upload"""
+    name: str
+    bytes: int
+    duration_ms: Optional[float] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+    @property
+    def throughput_kbps(self) -> Optional[float]:
+        """Upload throughput in KB/s (None until the request finished)"""
+        if not self.duration_ms:
+            return None
+        return round(self.bytes / 1024 / (self.duration_ms / 1000), 2)
+
+
+@dataclass
+class _TrackedRequest:
+    request: Request
+    files: List[UploadedFile] = field(default_factory=list)
+    done: bool = False
+
+
+def _multipart_files(body: bytes, content_type: str) -> List[UploadedFile]:
+    """Split a multipart/form-data body into its file parts (name and size)"""
+    match = re.search(r'boundary="?([^";]+)"?', content_type or "")
+    if not body or not match:
+        return []
+    boundary = b"--" + match.group(1).encode()
+    files = []
+    for part in body.split(boundary):
+        headers, _, content = part.partition(b"\r\n\r\n")
+        name = _FILENAME_RE.search(headers)
+        if name:
+            # Each part ends with the CRLF that precedes the next boundary
+            content = content[:-2] if content.endswith(b"\r\n") else content
+            files.append(UploadedFile(name.group(1).decode("utf-8", "replace"), len(content)))
+    return files
+
+
+class UploadTracker:
+    """Tracks upload requests from the page's network events.
+
+    Every multipart (or raw file) POST/PUT to the upload endpoint is recorded when
+    it starts; JSON creates and updates on the same endpoint are not uploads. The
+    per-file sizes come from the request body and the duration from the browser's
+    resource timing once the request finishes or fails. Waiting for N uploads is a
+    single wait on the network events, however many files are in flight.
+    """
+
+    def __init__(self, page: Page, url_part: str = "invoices", metric_prefix: str = "invoices.upload"):
+        """
+        Args:
+            page: Playwright page object
+            url_part: Substring identifying the upload API URL
+            metric_prefix: Prefix of the metrics recorded for finished uploads
+        """
+        self.page = page
+        self.url_part = url_part
+        self.metric_prefix = metric_prefix
+        self.requests: List[_TrackedRequest] = []
+        self._listening = False
+
+    def _is_upload(self, request: Request) -> bool:
+        if request.method not in ("POST", "PUT"):
+            return False
+        content_type = request.headers.get("content-type", "").lower()
+        is_file_body = content_type.startswith("multipart/form-data") or content_type.startswith(_UPLOAD_CONTENT_TYPES)
+        return self.url_part in request.url and is_file_body
+
+    def _find(self, request: Request) -> Optional[_TrackedRequest]:
+        return next((t for t in self.requests if t.request is request), None)
+
+    def _on_request(self, request: Request) -> None:
+        if not self._is_upload(request):
+            return
+        body = request.post_data_buffer or b""
+        files = _multipart_files(body, request.headers.get("content-type", ""))
+        if not files:
+            # Raw body upload (e.g., PUT of a single file)
+            files = [UploadedFile(request.url.rstrip("/").rsplit("/", 1)[-1].split("?")[0], len(body))]
+        self.requests.append(_TrackedRequest(request, files))
+
+    def _finish(self, request: Request, error: Optional[str] = None) -> None:
+        tracked = self._find(request)
+        if tracked is None or tracked.done:
+            return
+        status = None
+        if error is None:
+            response = request.response()
+            status = response.status if response else None
+        timing = request.timing
+        duration = timing.get("responseEnd", -1)
+        if duration is None or duration < 0:
+            duration = None
+        for uploaded in tracked.files:
+            uploaded.status = status
+            uploaded.error = error
+            uploaded.duration_ms = round(duration, 2) if duration is not None else None
+            if uploaded.duration_ms:
+                record_metric(f"{self.metric_prefix}.duration", uploaded.duration_ms,
+                              file=uploaded.name, bytes=uploaded.bytes)
+                record_metric(f"{self.metric_prefix}.throughput", uploaded.throughput_kbps,
+                              unit="KB/s", file=uploaded.name)
+        tracked.done = True
+
+    def _on_request_finished(self, request: Request) -> None:
+        self._finish(request)
+
+    def _on_request_failed(self, request: Request) -> None:
+        self._finish(request, error=request.failure or "failed")
+
+    def start(self) -> "UploadTracker":
+        """Start listening for upload requests (clears earlier results)"""
+        self.requests = []
+        if not self._listening:
+            self.page.on("request", self._on_request)
+            self.page.on("requestfinished", self._on_request_finished)
+            self.page.on("requestfailed", self._on_request_failed)
+            self._listening = True
+        return self
+
+    def stop(self) -> None:
+        """Stop listening for upload requests"""
+        if self._listening:
+            self.page.remove_listener("request", self._on_request)
+            self.page.remove_listener("requestfinished", self._on_request_finished)
+            self.page.remove_listener("requestfailed", self._on_request_failed)
+            self._listening = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _complete(self, file_count: int) -> bool:
+        finished = [t for t in self.requests if t.done]
+        return sum(len(t.files) for t in finished) >= file_count and len(finished) == len(self.requests)
+
+    @property
+    def files(self) -> List[UploadedFile]:
+        """Per-file results of all tracked upload requests"""
+        return [uploaded for tracked in self.requests for uploaded in tracked.files]
+
+    def wait_for_files(self, file_count: int, timeout: float = 60000) -> List[UploadedFile]:
+        """Wait until uploads covering file_count files have finished (or failed)
+
+        Args:
+            file_count: Number of files expected to be uploaded
+            timeout: Maximum time to wait in milliseconds for all of them
+
+        Returns:
+            List[UploadedFile]: Per-file results
+
+        Raises:
+            TimeoutError: If the uploads did not finish within the timeout
+        """
+        deadline = time.time() + timeout / 1000
+        while not self._complete(file_count):
+            remaining_ms = (deadline - time.time()) * 1000
+            if remaining_ms <= 0:
+                raise TimeoutError(f"Uploads of {file_count} file(s) did not finish within {timeout}ms "
+                                   f"({sum(1 for t in self.requests if t.done)}/{len(self.requests)} requests done)")
+            # The tracker's listeners were added first, so the finished upload is already
+            # recorded when the predicate runs
+            try:
+                self.page.wait_for_event("requestfinished", predicate=lambda _: self._complete(file_count),
+                                         timeout=min(remaining_ms, _FAILED_UPLOAD_CHECK_MS))
+            except TimeoutError:
+                pass
+        return self.files
+
+    def summary(self) -> Dict:
+        """Return total bytes, wall-clock span and aggregate throughput of the tracked uploads"""
+        files = self.files
+        total_bytes = sum(f.bytes for f in files)
+        starts = [t.request.timing.get("startTime") for t in self.requests if t.done]
+        ends = [t.request.timing.get("startTime", 0) + max(0, t.request.timing.get("responseEnd", 0))
+                for t in self.requests if t.done]
+        span_ms = round(max(ends) - min(starts), 2) if starts and ends else None
+        return {
+            "files": len(files),
+            "failed": sum(1 for f in files if not f.ok),
+            "bytes": total_bytes,
+            "duration_ms": span_ms,
+            "throughput_kbps": round(total_bytes / 1024 / (span_ms / 1000), 2) if span_ms else None,
+            "per_file": [
+                {"name": f.name, "bytes": f.bytes, "duration_ms": f.duration_ms,
+                 "throughput_kbps": f.throughput_kbps, "status": f.status, "error": f.error}
+                for f in files
+            ]
+        }
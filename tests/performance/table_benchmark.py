@@ -0,0 +1,325 @@
+"""
+Table render-time benchmark.
+
+Grows the number of cost centers and expense types (10, 100, 1,000, 10,000 by
+default) and, at every dataset size, measures each page size the "Rows per page"
+select offers through the list page objects and their TableComponent:
+    first_row_ms:    navigation until the first row is visible
+    full_render_ms:  navigation until a full page at this page size is rendered
+                     (includes picking the page size right after the first render)
+    page_change_ms:  clicking Next until the second page is rendered
+    search_ms:       filling a search until its results are rendered
+
+Data is seeded directly into the local stand-in's store, or created through the
+app's own API on a deployed environment (and deleted again after the run). Every
+run is appended to test_reports/table_benchmark_trend.jsonl (and .csv).
+
+Run against the local stand-in:
+    python -m tests.performance.table_benchmark --rows 10,100,1000,10000
+Run against a deployed environment (creates and deletes up to --rows entities):
+    python -m tests.performance.table_benchmark --env staging --rows 10,100 --kinds cost_center
+"""
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from playwright.sync_api import Page, sync_playwright
+
+from pages.cost_centers.cost_centers_page import CostCentersPage
+from pages.expense_types.expense_types_page import ExpenseTypesPage
+from pages.login.login_page import LoginPage
+from tests.config.test_config import CREDENTIALS, get_environment_config
+from tests.utils.cleanup_registry import RESOURCES
+from tests.utils.metrics import record_metric
+from tests.utils.trend import append_trend, print_table
+
+LIST_PAGES = {"cost_center": CostCentersPage, "expense_type": ExpenseTypesPage}
+
+# Resource kind -> stand-in store collection
+STAND_IN_COLLECTIONS = {"cost_center": "cost_centers", "expense_type": "expense_types"}
+
+DEFAULT_ROW_COUNTS = (10, 100, 1000, 10000)
+
+# Used when a list has no "Rows per page" select
+DEFAULT_PAGE_SIZE = 10
+
+NAME_PREFIX = "Table Bench"
+
+TREND_FILE = "table_benchmark_trend"
+TREND_FIELDS = ["kind", "rows", "page_size", "first_row_ms", "full_render_ms", "page_change_ms", "search_ms",
+                "error"]
+
+
+@dataclass
+class TableBenchmarkPoint:
+    """Measurements of one (kind, dataset size, page size) point"""
+    kind: str
+    rows: int
+    page_size: int
+    first_row_ms: Optional[float] = None
+    full_render_ms: Optional[float] = None
+    page_change_ms: Optional[float] = None
+    search_ms: Optional[float] = None
+    error: Optional[str] = None
+
+
+class StandInSeeder:
+    """Grows the benchmark data directly in the stand-in's store"""
+
+    def __init__(self, stand_in):
+        self.stand_in = stand_in
+
+    def create(self, kind: str, count: int, prefix: str) -> int:
+        return self.stand_in.seed(STAND_IN_COLLECTIONS[kind], count, prefix)
+
+    def delete_all(self) -> None:
+        # The stand-in's data lives only as long as the server
+        pass
+
+
+class ApiSeeder:
+    """Grows the benchmark data through the app's API from a logged-in page
+
+    The list API URL and Authorization header are taken from the request the list
+    page makes; created entities are remembered so delete_all can remove them.
+    Expense types get an existing cost center; without one they are not created.
+    """
+
+    def __init__(self, page: Page, base_url: str, timeout: float = 30000):
+        self.page = page
+        self.base_url = base_url
+        self.timeout = timeout
+        self.collection_urls: Dict[str, str] = {}
+        self.headers: Dict[str, str] = {}
+        self.created: List[str] = []
+        # Created without a parseable id, so only the cleanup's NAME_PREFIX pattern removes them
+        self.untracked: List[str] = []
+        self._cost_center: Optional[str] = None
+
+    def _discover(self, kind: str) -> str:
+        if kind not in self.collection_urls:
+            url_part = RESOURCES[kind]
+            with self.page.expect_request(lambda r: url_part in r.url and r.method == "GET"
+                                          and r.resource_type in ("fetch", "xhr"),
+                                          timeout=self.timeout) as request_info:
+                LIST_PAGES[kind](self.page, base_url=self.base_url).navigate()
+            request = request_info.value
+            self.collection_urls[kind] = request.url.split("?", 1)[0]
+            if request.headers.get("authorization"):
+                self.headers["Authorization"] = request.headers["authorization"]
+        return self.collection_urls[kind]
+
+    def _existing_cost_center(self) -> Optional[str]:
+        """Name of a cost center that is not benchmark data (delete_all would remove that)"""
+        if self._cost_center is None:
+            cost_centers = self.page.request.get(self._discover("cost_center"), headers=self.headers,
+                                                 timeout=self.timeout).json()
+            items = cost_centers.get("data", cost_centers) if isinstance(cost_centers, dict) else cost_centers
+            names = [item.get("name") for item in items or [] if isinstance(item, dict)]
+            self._cost_center = next((n for n in names if n and not n.startswith(NAME_PREFIX)), None)
+        return self._cost_center
+
+    def _payload(self, kind: str, name: str) -> Dict:
+        payload = {"name": name, "status": "Active"}
+        if kind == "expense_type":
+            cost_center = self._existing_cost_center()
+            if cost_center is None:
+                raise RuntimeError("No existing cost center to assign to benchmark expense types")
+            payload["costCenter"] = cost_center
+        return payload
+
+    def create(self, kind: str, count: int, prefix: str) -> int:
+        url = self._discover(kind)
+        payload = self._payload(kind, prefix)
+        untracked = []
+        for index in range(count):
+            name = f"{prefix} {index + 1}"
+            response = self.page.request.post(url, data=dict(payload, name=name),
+                                              headers=self.headers, timeout=self.timeout)
+            if not response.ok:
+                raise RuntimeError(f"Creating {kind} failed: HTTP {response.status} {response.text()[:200]}")
+            body = response.json()
+            entity = body.get("data", body) if isinstance(body, dict) else {}
+            entity_id = entity.get("id") or entity.get("_id") if isinstance(entity, dict) else None
+            if entity_id is None:
+                untracked.append(name)
+            else:
+                self.created.append(f"{url}/{entity_id}")
+        if untracked:
+            print(f"Warning: {len(untracked)} {kind} entities were created without an id and cannot be "
+                  f"deleted after the run: {', '.join(untracked[:5])}{', ...' if len(untracked) > 5 else ''}")
+            self.untracked.extend(untracked)
+        return count
+
+    def delete_all(self) -> None:
+        failed = 0
+        for url in self.created:
+            response = self.page.request.delete(url, headers=self.headers, timeout=self.timeout)
+            if not response.ok and response.status != 404:
+                failed += 1
+        failed += len(self.untracked)
+        if failed:
+            print(f"Warning: {failed} benchmark entities could not be deleted; "
+                  f"they match the cleanup's '{NAME_PREFIX}' pattern")
+        self.created = []
+        self.untracked = []
+
+
+def measure_table(list_page, rows: int, page_size: int, search_query: str,
+                  timeout: float = 60000) -> TableBenchmarkPoint:
+    """
+    Load the list page and time its table at one page size
+
+    Args:
+        list_page: CostCentersPage or ExpenseTypesPage on a logged-in session
+        rows: Number of seeded entities (at least this many rows exist)
+        page_size: Rows per page to measure
+        search_query: Query whose results differ from the unfiltered first page
+        timeout: Maximum time to wait in milliseconds for each phase
+
+    Returns:
+        TableBenchmarkPoint: The measurements (error is set if a phase failed)
+    """
+    kind = next(k for k, cls in LIST_PAGES.items() if isinstance(list_page, cls))
+    point = TableBenchmarkPoint(kind, rows, page_size)
+    table = list_page.table
+    try:
+        start = time.perf_counter()
+        list_page.navigate()
+        table.first_row.wait_for(state="visible", timeout=timeout)
+        point.first_row_ms = round((time.perf_counter() - start) * 1000, 2)
+        if table.page_size_select.count():
+            table.set_page_size(page_size, timeout=timeout)
+        table.wait_for_row_count(min(page_size, rows), timeout=timeout)
+        point.full_render_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        if table.get_page_position()[1] > 1:
+            start = time.perf_counter()
+            table.next_page(timeout=timeout)
+            table.wait_for_row_count(min(page_size, max(1, rows - page_size)), timeout=timeout)
+            point.page_change_ms = round((time.perf_counter() - start) * 1000, 2)
+
+        point.search_ms = round(list_page.search_box.search(search_query, timeout=timeout), 2)
+    except Exception as e:
+        point.error = str(e).splitlines()[0]
+        print(f"Table benchmark point {kind} {rows} rows x {page_size} failed: {point.error}")
+
+    for name in ("first_row_ms", "full_render_ms", "page_change_ms", "search_ms"):
+        value = getattr(point, name)
+        if value is not None:
+            record_metric(f"tables.{kind}.{name[:-3]}", value, rows=rows, page_size=page_size)
+    return point
+
+
+def run_table_benchmark(page: Page, base_url: str, seeder, row_counts: Iterable[int] = DEFAULT_ROW_COUNTS,
+                        kinds: Iterable[str] = tuple(LIST_PAGES), page_sizes: Iterable[int] = None,
+                        credentials: Dict[str, str] = None, timeout: float = 60000) -> List[TableBenchmarkPoint]:
+    """
+    Log in, then grow each kind's data to every dataset size and measure every page size
+
+    Args:
+        page: Playwright page object (not logged in)
+        base_url: Base URL of the app (the stand-in's or a deployed environment's)
+        seeder: StandInSeeder or ApiSeeder that creates the data
+        row_counts: Dataset sizes to grow to, ascending
+        kinds: 'cost_center' and/or 'expense_type'
+        page_sizes: Page sizes to measure (default: all the page offers)
+        credentials: Login credentials (default: CREDENTIALS['DEFAULT'])
+        timeout: Maximum time to wait in milliseconds for each phase
+
+    Returns:
+        List[TableBenchmarkPoint]: One result per kind, dataset size and page size
+    """
+    credentials = credentials or CREDENTIALS["DEFAULT"]
+    login_page = LoginPage(page, base_url=base_url)
+    login_page.navigate()
+    login_page.login(credentials["email"], credentials["password"])
+    page.wait_for_url("**/dashboard", timeout=timeout)
+
+    results = []
+    for kind in kinds:
+        list_page = LIST_PAGES[kind](page, base_url=base_url)
+        seeded = 0
+        for rows in sorted(row_counts):
+            prefix = f"{NAME_PREFIX} {rows}"
+            print(f"Seeding {rows - seeded} {kind} entities (total {rows})")
+            try:
+                seeder.create(kind, rows - seeded, prefix)
+            except RuntimeError as e:
+                print(f"Skipping {kind} at {rows} rows and above: {str(e)}")
+                break
+            seeded = rows
+
+            sizes = list(page_sizes or [])
+            if not sizes:
+                list_page.navigate()
+                list_page.table.first_row.wait_for(state="visible", timeout=timeout)
+                select = list_page.table.page_size_select
+                sizes = list_page.table.get_page_size_options() if select.count() else [DEFAULT_PAGE_SIZE]
+            for page_size in sizes:
+                # "<prefix> 1" matches 1, 10-19, 100-199, ...: a different set than the newest rows
+                results.append(measure_table(list_page, rows, page_size, f"{prefix} 1", timeout))
+    return results
+
+
+def print_results(results: List[TableBenchmarkPoint]) -> None:
+    print_table(results, [("Kind", "kind", "<13"), ("Rows", "rows", ">6"), ("Size", "page_size", ">5"),
+                          ("First row", "first_row_ms", ">10"), ("Full", "full_render_ms", ">10"),
+                          ("Page", "page_change_ms", ">10"), ("Search", "search_ms", ">10"),
+                          ("Error", lambda r: r.error or "", "")])
+
+
+def save_trend(results: List[TableBenchmarkPoint], target: str, report_dir: str = "test_reports") -> Path:
+    """Append the run to test_reports/table_benchmark_trend.jsonl and .csv (see tests.utils.trend)"""
+    return append_trend(TREND_FILE, results, target, TREND_FIELDS, label="Table benchmark",
+                        report_dir=report_dir)
+
+
+def main():
+    from tests.stand_in.server import StandInServer
+
+    parser = argparse.ArgumentParser(description="Benchmark list table rendering across dataset and page sizes")
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROW_COUNTS)),
+                        help="Comma-separated dataset sizes (default: %(default)s)")
+    parser.add_argument("--kinds", default=",".join(LIST_PAGES), help="Comma-separated list kinds")
+    parser.add_argument("--page-sizes", default=None, help="Comma-separated page sizes (default: all offered)")
+    parser.add_argument("--env", default=None,
+                        help="Environment from ENVIRONMENTS to run against (default: local stand-in)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Stand-in API latency")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args()
+
+    row_counts = [int(r) for r in args.rows.split(",")]
+    kinds = args.kinds.split(",")
+    page_sizes = [int(s) for s in args.page_sizes.split(",")] if args.page_sizes else None
+
+    stand_in = None
+    if args.env:
+        base_url, target = get_environment_config(args.env)["base_url"], args.env
+    else:
+        stand_in = StandInServer(latency_ms=args.latency_ms).start()
+        stand_in.seed("cost_centers", 1, "Benchmark Cost Center")
+        base_url, target = stand_in.base_url, "stand-in"
+
+    try:
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=not args.headed)
+            page = browser.new_page()
+            seeder = StandInSeeder(stand_in) if stand_in else ApiSeeder(page, base_url)
+            try:
+                results = run_table_benchmark(page, base_url, seeder, row_counts, kinds, page_sizes)
+            finally:
+                seeder.delete_all()
+            browser.close()
+    finally:
+        if stand_in:
+            stand_in.stop()
+
+    print_results(results)
+    save_trend(results, target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import pytest
+from tests.config.test_config import URLS
+from tests.utils.perf_budget import aggregate_navigations, assert_within_budgets
+from tests.utils.throttling import profile_name, throttle_params
+
+PUBLIC_ROUTES = ["HOME", "LOGIN"]
+AUTHENTICATED_ROUTES = ["DASHBOARD", "COST_CENTERS", "EXPENSE_TYPE", "INVOICES"]
+
+
+@pytest.mark.performance
+class TestRouteBudgets:
+    def _measure(self, page, web_vitals, route):
+        """Load the route and return its measurements as {route: {metric: value}}"""
+        page.goto(URLS[route], wait_until="load", timeout=60000)
+        # Let late resources and the final LCP candidate land before reading the values
+        page.wait_for_load_state("networkidle", timeout=30000)
+        vitals = web_vitals.latest(route)
+        assert vitals is not None, f"No Web Vitals were observed for {route} ({page.url})"
+        return aggregate_navigations([vitals])
+
+    @pytest.mark.parametrize("route", PUBLIC_ROUTES)
+    def test_public_route_within_budget(self, page, web_vitals, route):
+        """Public pages stay within their budget and do not regress against the baseline"""
+        # Under --throttle the page fixture throttled the page; check it against that profile
+        assert_within_budgets(self._measure(page, web_vitals, route), profile=profile_name(page))
+
+    @pytest.mark.parametrize("route", AUTHENTICATED_ROUTES)
+    def test_authenticated_route_within_budget(self, logged_in_page, web_vitals, route):
+        """App pages stay within their budget and do not regress against the baseline"""
+        assert_within_budgets(self._measure(logged_in_page, web_vitals, route), profile=profile_name(logged_in_page))
+
+
+@pytest.mark.performance
+class TestThrottledRouteBudgets:
+    """Homepage, login and invoices under each throttle profile, against the profile's budgets"""
+
+    @pytest.mark.parametrize("profile", throttle_params())
+    @pytest.mark.parametrize("route", ["HOME", "LOGIN", "INVOICES"])
+    def test_route_within_throttled_budget(self, page, web_vitals, request, route, profile):
+        if route in AUTHENTICATED_ROUTES:
+            page = request.getfixturevalue("logged_in_page")
+        # The page fixture applied the profile from the parameter's throttle marker
+        assert profile_name(page) == profile
+        page.goto(URLS[route], wait_until="load", timeout=180000)
+        page.wait_for_load_state("networkidle", timeout=60000)
+        vitals = web_vitals.latest(route)
+        assert vitals is not None, f"No Web Vitals were observed for {route} under {profile} ({page.url})"
+        assert_within_budgets(aggregate_navigations([vitals]), profile=profile)
@@ -0,0 +1,25 @@
+import pytest
+from tests.config.test_config import URLS
+from tests.utils.code_coverage import build_report, format_report
+
+APP_ROUTES = ["DASHBOARD", "COST_CENTERS", "EXPENSE_TYPE", "INVOICES"]
+
+
+@pytest.mark.performance
+class TestCodeCoverage:
+    def test_coverage_per_route(self, code_coverage, logged_in_page):
+        """Walk the app routes after login and report unused JS/CSS per route and bundle"""
+        # code_coverage comes first so it is started before logged_in_page loads the login route
+        page = logged_in_page
+        for route in APP_ROUTES:
+            page.goto(URLS[route], wait_until="load")
+            page.wait_for_load_state("networkidle")
+        code_coverage.take()
+        
+        report = build_report(code_coverage.usage)
+        print("\n" + format_report(report))
+        
+        covered_routes = {r["route"] for r in report["routes"]}
+        missing = [route for route in ["LOGIN"] + APP_ROUTES if route not in covered_routes]
+        assert not missing, f"No coverage was credited to: {missing}"
+        assert any(b["kind"] == "js" and b["used"] > 0 for b in report["bundles"]), "No executed JS was recorded"
@@ -0,0 +1,39 @@
+import pytest
+from pages.cost_centers.cost_centers_page import CostCentersPage
+from pages.login.login_page import LoginPage
+from tests.Invoices.page_object.invoices_page import InvoicesPage
+from tests.config.test_config import CREDENTIALS
+
+# Blocking budget per interaction on the stand-in; the real app's numbers are in the session report
+MAX_BLOCKING_MS = 300
+
+
+@pytest.mark.performance
+class TestMainThreadBlocking:
+    def test_table_interactions_blocking_time(self, long_tasks, page, stand_in):
+        """Search, pagination and the New Invoice overlay are attributed their blocking time"""
+        stand_in.seed("cost_centers", 35, "Blocking Cost Center")
+        credentials = CREDENTIALS["DEFAULT"]
+        login_page = LoginPage(page, base_url=stand_in.base_url)
+        login_page.navigate()
+        login_page.login(credentials["email"], credentials["password"])
+        page.wait_for_url("**/dashboard")
+        
+        cost_centers_page = CostCentersPage(page, base_url=stand_in.base_url).open()
+        cost_centers_page.table.next_page()
+        cost_centers_page.table.previous_page()
+        cost_centers_page.search("Blocking Cost Center 3")
+        
+        invoices_page = InvoicesPage(page, base_url=stand_in.base_url).open()
+        invoices_page.open_new_invoice_overlay()
+        
+        samples = {s["step"]: s for s in long_tasks.samples}
+        for step in ("CostCentersPage.search", "TableComponent.next_page", "TableComponent.previous_page",
+                     "InvoicesPage.open_new_invoice_overlay"):
+            assert step in samples, f"No blocking time was attributed to {step}"
+        
+        worst = max(long_tasks.samples, key=lambda s: s["blocking_ms"])
+        print(f"Total blocking time: {long_tasks.total_blocking_ms}ms; worst step {worst['step']} "
+              f"({worst['blocking_ms']}ms)")
+        assert worst["blocking_ms"] < MAX_BLOCKING_MS, \
+            f"{worst['step']} blocked the main thread for {worst['blocking_ms']}ms"
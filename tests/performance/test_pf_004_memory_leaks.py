@@ -0,0 +1,71 @@
+import pytest
+from pages.cost_centers.cost_centers_page import CostCentersPage
+from pages.expense_types.expense_types_page import ExpenseTypesPage
+from pages.login.login_page import LoginPage
+from tests.Invoices.page_object.invoices_page import InvoicesPage
+from tests.config.test_config import CREDENTIALS
+from tests.utils.memory_leaks import LeakDetector
+
+
+@pytest.mark.performance
+@pytest.mark.memory
+class TestMemoryLeaks:
+    @pytest.fixture
+    def leak_detector(self, page, stand_in):
+        """Logged-in stand-in page with a heap sampler attached"""
+        credentials = CREDENTIALS["DEFAULT"]
+        login_page = LoginPage(page, base_url=stand_in.base_url)
+        login_page.navigate()
+        login_page.login(credentials["email"], credentials["password"])
+        page.wait_for_url("**/dashboard")
+        try:
+            detector = LeakDetector(page)
+        except RuntimeError as e:
+            pytest.skip(str(e))
+        yield detector
+        detector.close()
+    
+    def _assert_no_leak(self, report):
+        assert not report.leaked, \
+            f"{report.summary()}; heap snapshots: {', '.join(report.snapshots)}"
+    
+    def test_new_invoice_overlay_cycles(self, leak_detector, page, stand_in, request):
+        """Opening and closing the New Invoice overlay does not retain memory"""
+        invoices_page = InvoicesPage(page, base_url=stand_in.base_url).open()
+        
+        def cycle():
+            invoices_page.open_new_invoice_overlay()
+            invoices_page.close_new_invoice_overlay()
+        
+        self._assert_no_leak(leak_detector.run("new_invoice_overlay", cycle,
+                                               cycles=request.config.getoption("--leak-cycles")))
+    
+    def test_list_navigation_cycles(self, leak_detector, page, stand_in, request):
+        """Navigating between cost centers and expense types does not retain memory"""
+        cost_centers_page = CostCentersPage(page, base_url=stand_in.base_url)
+        expense_types_page = ExpenseTypesPage(page, base_url=stand_in.base_url)
+        cost_centers_page.open()
+        
+        def cycle():
+            # Through the nav links: the app routes client-side, so whatever a list page leaves behind
+            # accumulates in the one document
+            page.get_by_role("link", name="Expense Types").click()
+            expense_types_page.wait_until_ready()
+            page.get_by_role("link", name="Cost Centers").click()
+            cost_centers_page.wait_until_ready()
+        
+        self._assert_no_leak(leak_detector.run("list_navigation", cycle,
+                                               cycles=request.config.getoption("--leak-cycles")))
+    
+    def test_search_cycles(self, leak_detector, page, stand_in, request):
+        """Repeated searches on the cost centers table do not retain memory"""
+        stand_in.seed("cost_centers", 30, "Leak Check Cost Center")
+        cost_centers_page = CostCentersPage(page, base_url=stand_in.base_url).open()
+        queries = iter(range(1, 10 ** 6))
+        
+        def cycle():
+            # A different query each cycle so every search goes to the API
+            cost_centers_page.search(f"Leak Check Cost Center {next(queries) % 30 + 1}")
+        
+        self._assert_no_leak(leak_detector.run("cost_center_search", cycle,
+                                               cycles=request.config.getoption("--leak-cycles")))
@@ -0,0 +1,32 @@
+import time
+import pytest
+from pages.expense_types.expense_types_page import ExpenseTypesPage
+from pages.login.login_page import LoginPage
+from tests.config.test_config import CREDENTIALS
+
+
+@pytest.mark.performance
+class TestStepTimeline:
+    def test_step_timeline_attributes_cost(self, step_timeline, page, stand_in):
+        """Every step of a login + create flow gets its renderer counters and a dominant cost"""
+        credentials = CREDENTIALS["DEFAULT"]
+        login_page = LoginPage(page, base_url=stand_in.base_url)
+        login_page.navigate()
+        login_page.login(credentials["email"], credentials["password"])
+        page.wait_for_url("**/dashboard")
+        
+        expense_types_page = ExpenseTypesPage(page, base_url=stand_in.base_url).open()
+        expense_types_page.click_new_expense_type()
+        expense_types_page.fill_name_field(f"Timeline Expense {int(time.time())}")
+        expense_types_page.cost_center_select.select(fallback_to_first=True)
+        expense_types_page.submit_form()
+        step_timeline.print_timeline()
+        
+        steps = {e["step"]: e for e in step_timeline.entries}
+        for step in ("LoginPage.login", "ExpenseTypesPage.submit_form"):
+            assert step in steps, f"No timeline entry for {step}"
+        
+        submit = steps["ExpenseTypesPage.submit_form"]
+        assert submit["requests"] >= 1, "The submit step made no requests"
+        assert submit["task_ms"] > 0 and submit["nodes"] > 0, f"No renderer counters for the submit step: {submit}"
+        assert submit["dominant"] in ("layout", "script", "other_main_thread", "waiting")
@@ -0,0 +1,37 @@
+import pytest
+from tests.performance.table_benchmark import StandInSeeder, print_results, run_table_benchmark, save_trend
+from tests.stand_in.server import StandInServer
+
+# Reduced sweep for CI; run the module directly for 10,000 rows
+BENCHMARK_ROWS = (10, 1000)
+
+# Full render of the largest page on the stand-in; the trend file tracks the real numbers
+MAX_FULL_RENDER_MS = 5000
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestTableRenderBenchmark:
+    def test_table_render_scaling_on_stand_in(self, page):
+        """Measure first row, full render, page change and search across dataset and page sizes"""
+        # A server of its own, so the seeded thousands of rows do not leak into other tests
+        with StandInServer() as server:
+            server.seed("cost_centers", 1, "Benchmark Cost Center")
+            results = run_table_benchmark(page, server.base_url, StandInSeeder(server), BENCHMARK_ROWS)
+        print_results(results)
+        save_trend(results, target="stand-in")
+        
+        failed = [r for r in results if r.error]
+        assert not failed, f"Benchmark points failed: {[(r.kind, r.rows, r.page_size, r.error) for r in failed]}"
+        
+        for kind in ("cost_center", "expense_type"):
+            sizes = {r.page_size for r in results if r.kind == kind and r.rows == max(BENCHMARK_ROWS)}
+            assert len(sizes) > 1, f"Only page sizes {sizes} were measured for {kind}"
+        
+        for result in results:
+            assert result.first_row_ms is not None and result.search_ms is not None
+            if result.rows > result.page_size:
+                assert result.page_change_ms is not None, \
+                    f"No page change measured for {result.kind} {result.rows} x {result.page_size}"
+            assert result.full_render_ms < MAX_FULL_RENDER_MS, \
+                f"{result.kind} took {result.full_render_ms}ms to render {result.page_size} of {result.rows} rows"
@@ -0,0 +1,138 @@
+import threading
+import time
+import pytest
+from tests.stand_in.imap_server import FakeImapServer
+from tests.utils.email_utils import get_latest_otp_imap
+from tests.utils.imap_client import MailboxClient
+from tests.utils.otp_mailbox import OtpMultiplexer
+
+IMAP_USER = "qa@example.com"
+IMAP_PASS = "secret"
+
+
+@pytest.fixture
+def fake_imap():
+    """Local fake IMAP server, so OTP retrieval can be tested without a real mailbox"""
+    with FakeImapServer(users={IMAP_USER: IMAP_PASS}) as server:
+        yield server
+
+
+@pytest.fixture
+def mailbox(fake_imap):
+    with MailboxClient("127.0.0.1", IMAP_USER, IMAP_PASS, port=fake_imap.port, use_ssl=False) as client:
+        yield client
+
+
+@pytest.fixture
+def multiplexer(fake_imap):
+    client = MailboxClient("127.0.0.1", IMAP_USER, IMAP_PASS, port=fake_imap.port, use_ssl=False)
+    watcher = OtpMultiplexer(client, idle_interval=0.5).start()
+    yield watcher
+    watcher.stop()
+
+
+@pytest.mark.signup
+class TestEmailOtpOffline:
+    def test_otp_already_delivered(self, fake_imap, mailbox):
+        """An OTP that is already in the mailbox is returned and the message marked read"""
+        fake_imap.deliver("qa+1@example.com", "Verify your email", "no code in this one")
+        uid = fake_imap.deliver("qa+1@example.com", "Verify your email", "Your verification code is 482913")
+        
+        assert mailbox.wait_for_otp("qa+1@example.com", timeout_sec=5) == "482913"
+        assert "\\Seen" in fake_imap.message(uid).flags
+    
+    def test_otp_pushed_while_idle(self, fake_imap, mailbox):
+        """An OTP delivered while waiting is picked up via IDLE right after delivery"""
+        delivered_at = {}
+        
+        def deliver():
+            delivered_at["time"] = time.time()
+            fake_imap.deliver("qa+2@example.com", "Verify your email", "Your verification code is 105237")
+        
+        threading.Timer(1.0, deliver).start()
+        otp = mailbox.wait_for_otp("qa+2@example.com", timeout_sec=10)
+        latency = time.time() - delivered_at["time"]
+        
+        assert otp == "105237"
+        assert latency < 1.0, f"OTP took {latency:.2f}s after delivery"
+        assert "IDLE" in fake_imap.commands
+    
+    def test_headers_checked_before_text(self, fake_imap, mailbox):
+        """Only messages whose headers match have their text fetched, and never with a full RFC822 fetch"""
+        other = fake_imap.deliver("qa+3@example.com", "Newsletter", "Promo code 999999")
+        wanted = fake_imap.deliver("qa+3@example.com", "Forget Password Token", "Your token is 246810")
+        
+        otp = mailbox.wait_for_otp("qa+3@example.com", timeout_sec=5, subject_filter="Forget Password Token")
+        
+        assert otp == "246810"
+        text_fetches = [uid for uid, section in fake_imap.fetched if section == "BODY[TEXT]"]
+        assert text_fetches == [wanted]
+        assert other not in text_fetches
+        assert not any(section == "RFC822" for _, section in fake_imap.fetched)
+        assert "\\Seen" not in fake_imap.message(other).flags
+    
+    def test_connection_reused_across_lookups(self, fake_imap):
+        """get_latest_otp_imap keeps one authenticated session for repeated lookups"""
+        for index in range(3):
+            fake_imap.deliver(f"qa+{10 + index}@example.com", "Verify your email", f"Code: 70000{index}")
+            otp = get_latest_otp_imap("127.0.0.1", IMAP_USER, IMAP_PASS, f"qa+{10 + index}@example.com",
+                                      timeout_sec=5, port=fake_imap.port, use_ssl=False)
+            assert otp == f"70000{index}"
+        
+        assert fake_imap.logins == 1, f"Expected one login, got {fake_imap.logins}"
+    
+    def test_reconnects_only_when_dropped(self, fake_imap, mailbox):
+        """Commands reuse the connection without a NOOP probe and reopen it once the server drops it"""
+        fake_imap.deliver("qa+20@example.com", "Verify your email", "Code: 810001")
+        assert mailbox.wait_for_otp("qa+20@example.com", timeout_sec=5) == "810001"
+        mailbox._conn.shutdown()
+        fake_imap.deliver("qa+21@example.com", "Verify your email", "Code: 810002")
+        
+        assert mailbox.wait_for_otp("qa+21@example.com", timeout_sec=5) == "810002"
+        assert "NOOP" not in fake_imap.commands
+        assert fake_imap.logins == 2
+    
+    def test_timeout_when_no_otp(self, mailbox):
+        """A missing OTP raises TimeoutError once the timeout expires"""
+        start = time.time()
+        with pytest.raises(TimeoutError):
+            mailbox.wait_for_otp("nobody@example.com", timeout_sec=1)
+        assert time.time() - start < 3
+    
+    def test_concurrent_waiters_share_one_watcher(self, fake_imap, multiplexer):
+        """Parallel flows each get the OTP sent to their own address over a single login"""
+        waiters = {f"qa+{100 + index}@example.com": multiplexer.expect(f"qa+{100 + index}@example.com",
+                                                                      timeout_sec=10)
+                   for index in range(10)}
+        # Deliver in reverse order so no waiter can rely on arrival order
+        for index, email_to in reversed(list(enumerate(waiters))):
+            fake_imap.deliver(email_to, "Verify your email", f"Your verification code is {300000 + index}")
+        
+        for index, (email_to, waiter) in enumerate(waiters.items()):
+            assert waiter.result() == str(300000 + index), f"Wrong OTP for {email_to}"
+        assert fake_imap.logins == 1
+        assert len(multiplexer.deliveries) == 10
+        assert all(d["delivery_latency_ms"] is not None for d in multiplexer.deliveries)
+    
+    def test_waiter_deadlines_are_independent(self, fake_imap, multiplexer):
+        """An expired waiter fails on its own deadline without affecting the others"""
+        short = multiplexer.expect("qa+200@example.com", timeout_sec=1)
+        long = multiplexer.expect("qa+201@example.com", timeout_sec=10)
+        
+        with pytest.raises(TimeoutError, match="within 1 seconds"):
+            short.result()
+        fake_imap.deliver("qa+201@example.com", "Verify your email", "Your verification code is 551177")
+        assert long.result() == "551177"
+    
+    def test_resent_otp_resolves_waiter_once(self, fake_imap, multiplexer):
+        """Two OTPs to one address resolve its waiter with the newest and leave other waiters alone"""
+        older = fake_imap.deliver("qa+300@example.com", "Verify your email", "Your verification code is 111111")
+        newer = fake_imap.deliver("qa+300@example.com", "Verify your email", "Your verification code is 222222")
+        resent = multiplexer.expect("qa+300@example.com", timeout_sec=10)
+        other = multiplexer.expect("qa+301@example.com", timeout_sec=10)
+        
+        assert resent.result() == "222222"
+        fake_imap.deliver("qa+301@example.com", "Verify your email", "Your verification code is 333333")
+        assert other.result() == "333333"
+        assert "\\Seen" in fake_imap.message(newer).flags
+        assert "\\Seen" not in fake_imap.message(older).flags
@@ -0,0 +1,85 @@
+import time
+import pytest
+from playwright.sync_api import Page
+
+# Origin of the minimal page the phone OTP requests are made from; never reaches the network
+APP_URL = "http://sms-gateway.test/"
+
+
+@pytest.fixture
+def app_page(page: Page, sms_gateway) -> Page:
+    """An empty document on a fake origin, so relative send-otp / verify-otp requests hit the gateway"""
+    page.route(APP_URL, lambda route: route.fulfill(content_type="text/html", body="<html><body></body></html>"))
+    page.goto(APP_URL)
+    return page
+
+
+def post(page: Page, path: str, body: dict) -> dict:
+    """POST JSON from the page like the app does and return the status and response body"""
+    return page.evaluate("""async ([path, body]) => {
+        const response = await fetch(path, {
+            method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify(body)
+        });
+        return {status: response.status, body: await response.json()};
+    }""", [path, body])
+
+
+@pytest.mark.phone_verification
+class TestSmsGatewayOffline:
+    def test_send_and_verify(self, app_page, sms_gateway):
+        """A sent code is received by the test and accepted once by verify-otp"""
+        sms_gateway.code_factory = lambda: "482913"
+        sent = post(app_page, "/send-otp", {"countryCode": "+1", "phoneNumber": "2345678901"})
+        code = sms_gateway.wait_for_code("+1", "2345678901")
+
+        assert sent["status"] == 200
+        assert code == "482913"
+        assert post(app_page, "/verify-otp", {"countryCode": "+1", "phoneNumber": "2345678901",
+                                              "code": "000000"})["status"] == 400
+        assert post(app_page, "/verify-otp", {"countryCode": "+1", "phoneNumber": "2345678901",
+                                              "code": code})["status"] == 200
+        # A code is single use
+        assert post(app_page, "/verify-otp", {"countryCode": "+1", "phoneNumber": "2345678901",
+                                              "code": code})["status"] == 400
+        assert [v.accepted for v in sms_gateway.verifications] == [False, True, False]
+
+    def test_invalid_number_rejected(self, app_page, sms_gateway):
+        """Numbers the provider would not accept get its error and no code"""
+        sent = post(app_page, "/send-otp", {"countryCode": "+1", "phoneNumber": "12-ab"})
+
+        assert sent["status"] == 400
+        assert sent["body"]["message"] == "Failed to send verification code."
+        assert not sms_gateway.messages
+        assert len(sms_gateway.rejected_sends) == 1
+
+    def test_delivery_delay(self, app_page, sms_gateway):
+        """A code is only received once its delivery delay has passed, and never after the timeout"""
+        sms_gateway.set_delay(1)
+        post(app_page, "/send-otp", {"countryCode": "+44", "phoneNumber": "7700900123"})
+        start = time.time()
+        sms_gateway.wait_for_code("+447700900123")
+        assert time.time() - start >= 0.9
+
+        sms_gateway.set_delay(5, phone="+447700900456")
+        post(app_page, "/send-otp", {"countryCode": "+44", "phoneNumber": "7700900456"})
+        with pytest.raises(TimeoutError, match="delivered after"):
+            sms_gateway.wait_for_code("+44", "7700900456", timeout=1)
+
+    def test_expired_code_rejected(self, app_page, sms_gateway):
+        """A code older than code_ttl is rejected"""
+        sms_gateway.code_ttl = 0.5
+        post(app_page, "/send-otp", {"countryCode": "+1", "phoneNumber": "2345678902"})
+        code = sms_gateway.wait_for_code("+1", "2345678902")
+        time.sleep(0.6)
+
+        verified = post(app_page, "/verify-otp", {"countryCode": "+1", "phoneNumber": "2345678902", "code": code})
+        assert verified["status"] == 400
+
+    def test_email_requests_fall_through(self, app_page, sms_gateway):
+        """send-otp requests without a phone number are left to the next handler (the real backend)"""
+        app_page.context.route("**/send-otp", lambda route: route.fulfill(
+            status=200, content_type="application/json", body='{"email": true}'))
+
+        sent = post(app_page, "/send-otp", {"email": "qa@example.com"})
+        assert sent["body"] == {"email": True}
+        assert not sms_gateway.messages
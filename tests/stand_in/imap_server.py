@@ -0,0 +1,321 @@
+"""
+Local fake IMAP server for offline OTP tests.
+
+Implements the subset of IMAP4rev1 the mailbox client uses: LOGIN, SELECT, NOOP,
+UID SEARCH, UID FETCH (header fields, text, full message), UID STORE and IDLE,
+over plain TCP. deliver() drops a message into the mailbox and pushes
+'* N EXISTS' to every connection currently in IDLE.
+"""
+import re
+import select
+import shlex
+import socketserver
+import threading
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+from typing import Dict, List, Optional
+
+_FIELDS_RE = re.compile(r"HEADER\.FIELDS \(([^)]*)\)", re.IGNORECASE)
+
+
+class FakeMessage:
+    def __init__(self, uid: int, raw: bytes, received_at: datetime):
+        self.uid = uid
+        self.raw = raw
+        self.received_at = received_at
+        self.flags = set()
+        header_end = raw.find(b"\r\n\r\n")
+        self.header = raw[:header_end + 4]
+        self.text = raw[header_end + 4:]
+
+    def header_value(self, name: str) -> str:
+        match = re.search(rb"^" + re.escape(name.encode()) + rb":(.*(?:\r\n[ \t].*)*)", self.header,
+                          re.IGNORECASE | re.MULTILINE)
+        return match.group(1).decode(errors="ignore").strip() if match else ""
+
+    def header_fields(self, names: List[str]) -> bytes:
+        wanted = {n.upper() for n in names}
+        lines, keep = [], False
+        for line in self.header.split(b"\r\n"):
+            if line[:1] in (b" ", b"\t"):
+                if keep:
+                    lines.append(line)
+                continue
+            keep = line.split(b":", 1)[0].decode(errors="ignore").upper() in wanted
+            if keep:
+                lines.append(line)
+        return b"\r\n".join(lines) + b"\r\n\r\n"
+
+
+class _ImapHandler(socketserver.StreamRequestHandler):
+    @property
+    def fake(self) -> "FakeImapServer":
+        return self.server.fake
+
+    def _send(self, line: str) -> None:
+        self.wfile.write(line.encode() + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self):
+        self.authenticated = False
+        self.reported = 0
+        self._send("* OK FakeIMAP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                tag, command, args = self._parse(line.decode(errors="ignore").rstrip("\r\n"))
+            except ValueError:
+                self._send("* BAD Could not parse command")
+                continue
+            self.fake.commands.append(command if command != "UID" else f"UID {args.split(' ', 1)[0].upper()}")
+            handler = getattr(self, f"_cmd_{command.lower()}", None)
+            if handler is None:
+                self._send(f"{tag} BAD Unknown command {command}")
+                continue
+            if command not in ("CAPABILITY", "LOGIN", "LOGOUT", "NOOP") and not self.authenticated:
+                self._send(f"{tag} NO Not authenticated")
+                continue
+            if handler(tag, args) is False:
+                return
+
+    @staticmethod
+    def _parse(line: str):
+        tag, _, rest = line.partition(" ")
+        command, _, args = rest.partition(" ")
+        if not tag or not command:
+            raise ValueError(line)
+        return tag, command.upper(), args
+
+    def _report_new(self) -> None:
+        count = len(self.fake.messages)
+        if count != self.reported:
+            self._send(f"* {count} EXISTS")
+            self.reported = count
+
+    # Commands
+    def _cmd_capability(self, tag, args):
+        self._send("* CAPABILITY IMAP4rev1 IDLE UIDPLUS")
+        self._send(f"{tag} OK CAPABILITY completed")
+
+    def _cmd_login(self, tag, args):
+        username, password = (shlex.split(args) + ["", ""])[:2]
+        if self.fake.users.get(username) != password:
+            self._send(f"{tag} NO [AUTHENTICATIONFAILED] Invalid credentials")
+            return
+        self.authenticated = True
+        self.fake.logins += 1
+        self._send(f"{tag} OK LOGIN completed")
+
+    def _cmd_select(self, tag, args):
+        self.reported = len(self.fake.messages)
+        self._send(f"* {self.reported} EXISTS")
+        self._send("* 0 RECENT")
+        self._send("* OK [UIDVALIDITY 1] UIDs valid")
+        self._send(f"* OK [UIDNEXT {self.fake.next_uid}] Predicted next UID")
+        self._send(f"{tag} OK [READ-WRITE] SELECT completed")
+
+    _cmd_examine = _cmd_select
+
+    def _cmd_noop(self, tag, args):
+        if self.authenticated:
+            self._report_new()
+        self._send(f"{tag} OK NOOP completed")
+
+    def _cmd_logout(self, tag, args):
+        self._send("* BYE Logging out")
+        self._send(f"{tag} OK LOGOUT completed")
+        return False
+
+    def _cmd_idle(self, tag, args):
+        self._send("+ idling")
+        while True:
+            readable, _, _ = select.select([self.connection], [], [], 0.05)
+            if readable:
+                line = self.rfile.readline()
+                if not line or line.strip().upper() == b"DONE":
+                    break
+            self._report_new()
+        self._send(f"{tag} OK IDLE terminated")
+
+    def _cmd_uid(self, tag, args):
+        subcommand, _, rest = args.partition(" ")
+        subcommand = subcommand.upper()
+        if subcommand == "SEARCH":
+            try:
+                uids = [str(m.uid) for m in self.fake.search(rest)]
+            except (ValueError, IndexError) as e:
+                self._send(f"{tag} BAD {e}")
+                return
+            self._send("* SEARCH" + ("" if not uids else " " + " ".join(uids)))
+        elif subcommand == "FETCH":
+            uid_set, _, items = rest.partition(" ")
+            for message in self.fake.by_uid_set(uid_set):
+                self._fetch_response(message, items.upper())
+        elif subcommand == "STORE":
+            uid_set, _, change = rest.partition(" ")
+            operation, _, flags = change.partition(" ")
+            flags = set(flags.strip("()").split())
+            for message in self.fake.by_uid_set(uid_set):
+                if operation.upper().startswith("-"):
+                    message.flags -= flags
+                else:
+                    message.flags |= flags
+                self._send(f"* {self.fake.sequence(message)} FETCH (UID {message.uid} "
+                           f"FLAGS ({' '.join(sorted(message.flags))}))")
+        else:
+            self._send(f"{tag} BAD Unsupported UID command")
+            return
+        self._send(f"{tag} OK UID {subcommand} completed")
+
+    def _fetch_response(self, message: FakeMessage, items: str) -> None:
+        fields = _FIELDS_RE.search(items)
+        if fields:
+            section, payload = f"BODY[HEADER.FIELDS ({fields.group(1)})]", message.header_fields(fields.group(1).split())
+        elif "[HEADER]" in items:
+            section, payload = "BODY[HEADER]", message.header
+        elif "[TEXT]" in items:
+            section, payload = "BODY[TEXT]", message.text
+        else:
+            section, payload = "RFC822", message.raw
+        if ".PEEK" not in items:
+            message.flags.add("\\Seen")
+        head = f"* {self.fake.sequence(message)} FETCH (UID {message.uid} {section} {{{len(payload)}}}\r\n"
+        self.wfile.write(head.encode() + payload + b")\r\n")
+        self.wfile.flush()
+        self.fake.fetched.append((message.uid, section))
+
+
+class FakeImapServer:
+    """Runs the fake IMAP server on a local port in a background thread
+
+    Usage:
+        with FakeImapServer(users={"qa@example.com": "secret"}) as imap:
+            imap.deliver("qa+1@example.com", "Verify your email", "Your code is 123456")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, users: Dict[str, str] = None):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            users: Accepted credentials {username: password}
+        """
+        self.host = host
+        self.port = port
+        self.users = users or {"qa@example.com": "secret"}
+        self.messages: List[FakeMessage] = []
+        self.next_uid = 1
+        self.logins = 0
+        self.commands: List[str] = []
+        self.fetched: List[tuple] = []
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self) -> "FakeImapServer":
+        self._server = socketserver.ThreadingTCPServer((self.host, self.port), _ImapHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="fake-imap", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # Mailbox
+    def deliver(self, to: str, subject: str, body: str, sender: str = "no-reply@wize-invoice.test",
+                html: str = None, received_at: datetime = None) -> int:
+        """Add a message to the mailbox and return its UID"""
+        message = EmailMessage()
+        message["From"] = sender
+        message["To"] = to
+        message["Subject"] = subject
+        message["Date"] = format_datetime(received_at or datetime.now(timezone.utc))
+        message["Message-ID"] = make_msgid(domain="fake-imap.test")
+        message.set_content(body)
+        if html:
+            message.add_alternative(html, subtype="html")
+        raw = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+        with self._lock:
+            uid = self.next_uid
+            self.next_uid += 1
+            self.messages.append(FakeMessage(uid, raw, received_at or datetime.now(timezone.utc)))
+        return uid
+
+    def sequence(self, message: FakeMessage) -> int:
+        return self.messages.index(message) + 1
+
+    def by_uid_set(self, uid_set: str) -> List[FakeMessage]:
+        wanted = set()
+        for part in uid_set.split(","):
+            start, _, end = part.partition(":")
+            low = int(start) if start != "*" else self.next_uid - 1
+            high = (int(end) if end and end != "*" else self.next_uid - 1) if end else low
+            wanted.update(range(low, high + 1))
+        return [m for m in list(self.messages) if m.uid in wanted]
+
+    def search(self, criteria: str) -> List[FakeMessage]:
+        """Evaluate ALL/UNSEEN/SEEN/SINCE/TO/FROM/SUBJECT/OR criteria (ANDed)"""
+        tokens = shlex.split(criteria)
+        results, position = list(self.messages), 0
+        while position < len(tokens):
+            test, position = self._criterion(tokens, position)
+            results = [m for m in results if test(m)]
+        return results
+
+    def _criterion(self, tokens: List[str], position: int):
+        """Parse one search key at position; return (predicate, next position)"""
+        key = tokens[position].upper()
+        if key == "OR":
+            left, position = self._criterion(tokens, position + 1)
+            right, position = self._criterion(tokens, position)
+            return (lambda m: left(m) or right(m)), position
+        if key == "ALL":
+            return (lambda m: True), position + 1
+        if key == "UNSEEN":
+            return (lambda m: "\\Seen" not in m.flags), position + 1
+        if key == "SEEN":
+            return (lambda m: "\\Seen" in m.flags), position + 1
+        value = tokens[position + 1]
+        if key == "SINCE":
+            since = datetime.strptime(value, "%d-%b-%Y").date()
+            return (lambda m: m.received_at.date() >= since), position + 2
+        if key in ("TO", "FROM", "SUBJECT"):
+            return (lambda m: value.lower() in m.header_value(key.title()).lower()), position + 2
+        raise ValueError(f"Unsupported search key {key}")
+
+    def message(self, uid: int) -> Optional[FakeMessage]:
+        return next((m for m in self.messages if m.uid == uid), None)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the local fake IMAP server")
+    parser.add_argument("--port", type=int, default=1143)
+    parser.add_argument("--user", default="qa@example.com")
+    parser.add_argument("--password", default="secret")
+    args = parser.parse_args()
+
+    server = FakeImapServer(port=args.port, users={args.user: args.password}).start()
+    print(f"Fake IMAP server listening on {server.host}:{server.port} (user {args.user})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
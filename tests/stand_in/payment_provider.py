@@ -0,0 +1,230 @@
+"""
+Route-level stand-in for the hosted payment provider.
+
+Attaches to a Playwright page (or browser context) and serves a lightweight copy
+of the hosted checkout form plus its tokenization endpoint locally, so the payment
+setup tests no longer load the provider's scripts or reach its API. The outcome of
+each card (success, decline, 3DS challenge) and the tokenization latency are
+configurable; every tokenization is recorded for assertions.
+"""
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlencode, urlsplit
+
+from playwright.sync_api import BrowserContext, Page, Route
+
+CHECKOUT_ORIGIN = "https://checkout.stripe.com"
+
+# Provider hosts the app may load scripts or telemetry from; answered empty offline
+PROVIDER_PATTERNS = ("https://js.stripe.com/**", "https://m.stripe.network/**", "https://r.stripe.com/**",
+                     "https://api.stripe.com/**")
+
+CHECKOUT_PAGE = Path(__file__).parent / "static" / "checkout.html"
+
+SUCCESS = "success"
+DECLINE = "decline"
+CHALLENGE = "challenge"
+
+# Provider test cards with a fixed outcome; any other valid card succeeds
+TEST_CARD_OUTCOMES = {
+    "4000000000000002": DECLINE,
+    "4000000000009995": DECLINE,
+    "4000002760003184": CHALLENGE,
+    "4000002500003155": CHALLENGE,
+}
+
+# (brand, number prefixes, CVC length)
+CARD_BRANDS = (
+    ("amex", ("34", "37"), 4),
+    ("visa", ("4",), 3),
+    ("mastercard", tuple(str(p) for p in range(51, 56)) + tuple(str(p) for p in range(2221, 2721)), 3),
+    ("discover", ("6011", "65"), 3),
+)
+
+
+def luhn_valid(number: str) -> bool:
+    """Check a card number against the Luhn checksum"""
+    if not number.isdigit() or not 12 <= len(number) <= 19:
+        return False
+    total = 0
+    for index, digit in enumerate(int(d) for d in reversed(number)):
+        if index % 2:
+            digit = digit * 2 - 9 if digit > 4 else digit * 2
+        total += digit
+    return total % 10 == 0
+
+
+def card_brand(number: str) -> Optional[str]:
+    for brand, prefixes, _ in CARD_BRANDS:
+        if number.startswith(prefixes):
+            return brand
+    return None
+
+
+@dataclass
+class Tokenization:
+    """One card submitted to the tokenization endpoint"""
+    token: str
+    brand: Optional[str]
+    last4: str
+    outcome: str
+    status: str
+    latency_ms: float
+    at: float
+
+
+class FakePaymentProvider:
+    """Serves the hosted checkout form and tokenization endpoint from Playwright routes
+
+    Usage:
+        provider = FakePaymentProvider(latency=1.5).attach(page)
+        page.goto(provider.checkout_url(success_url=stand_in.url("/create-account")))
+        SignUpPage(page).setup_payment_method(get_payment_method_data())
+    """
+
+    def __init__(self, outcome: str = None, latency: float = 0.0, card_outcomes: Dict[str, str] = None):
+        """
+        Args:
+            outcome: Force this outcome for every valid card (default: by test card number)
+            latency: Seconds the tokenization endpoint takes to answer
+            card_outcomes: Extra {card number: outcome} overrides
+        """
+        self.outcome = outcome
+        self.latency = latency
+        self.card_outcomes = dict(TEST_CARD_OUTCOMES, **(card_outcomes or {}))
+        self.tokenizations: List[Tokenization] = []
+        self.rejected: List[Dict] = []
+        self._pending: Dict[str, Tokenization] = {}
+        self._target: Optional[Union[Page, BrowserContext]] = None
+
+    # Routing
+    def attach(self, target: Union[Page, BrowserContext]) -> "FakePaymentProvider":
+        """Route the checkout origin and the provider hosts of the page or context"""
+        target.route(f"{CHECKOUT_ORIGIN}/**", self._handle_checkout)
+        for pattern in PROVIDER_PATTERNS:
+            target.route(pattern, self._handle_provider_asset)
+        self._target = target
+        return self
+
+    def detach(self) -> None:
+        if self._target is None:
+            return
+        try:
+            self._target.unroute(f"{CHECKOUT_ORIGIN}/**", self._handle_checkout)
+            for pattern in PROVIDER_PATTERNS:
+                self._target.unroute(pattern, self._handle_provider_asset)
+        except Exception:
+            # The page may already be closed at teardown
+            pass
+        self._target = None
+
+    @staticmethod
+    def checkout_url(success_url: str, session_id: str = None) -> str:
+        """URL of a stubbed hosted checkout session that returns to success_url"""
+        session_id = session_id or f"cs_test_{secrets.token_hex(12)}"
+        return f"{CHECKOUT_ORIGIN}/c/pay/{session_id}?{urlencode({'success_url': success_url})}"
+
+    @staticmethod
+    def _reply(route: Route, status: int, body: Dict) -> None:
+        route.fulfill(status=status, content_type="application/json", body=json.dumps(body))
+
+    def _handle_provider_asset(self, route: Route) -> None:
+        if route.request.resource_type == "script":
+            return route.fulfill(status=200, content_type="application/javascript", body="")
+        route.fulfill(status=204, body="")
+
+    def _handle_checkout(self, route: Route) -> None:
+        path = urlsplit(route.request.url).path
+        if path == "/stub/tokenize":
+            return self._tokenize(route)
+        if path == "/stub/confirm":
+            return self._confirm(route)
+        if route.request.method == "GET" and path.startswith("/c/pay/"):
+            return route.fulfill(status=200, content_type="text/html; charset=utf-8",
+                                 body=CHECKOUT_PAGE.read_text(encoding="utf-8"))
+        route.fulfill(status=404, content_type="text/plain", body="Not found")
+
+    # Tokenization
+    def _validate(self, payload: Dict) -> Optional[Dict]:
+        """Return the provider error for invalid card details, None if they are valid"""
+        number = "".join(str(payload.get("number", "")).split())
+        brand = card_brand(number)
+        if not luhn_valid(number) or brand is None:
+            return {"code": "incorrect_number", "message": "Your card number is invalid."}
+
+        try:
+            month, year = (int(part) for part in str(payload.get("expiry", "")).replace(" ", "").split("/"))
+            expires = datetime(2000 + year if year < 100 else year, month, 1)
+        except ValueError:
+            return {"code": "invalid_expiry", "message": "Your card's expiration date is incomplete."}
+        now = datetime.now()
+        if (expires.year, expires.month) < (now.year, now.month):
+            return {"code": "expired_card", "message": "Your card's expiration year is in the past."}
+
+        cvc_length = next(length for name, _, length in CARD_BRANDS if name == brand)
+        cvc = str(payload.get("cvc", "")).strip()
+        if not cvc.isdigit() or len(cvc) != cvc_length:
+            return {"code": "invalid_cvc", "message": "Your card's security code is incomplete."}
+
+        if not str(payload.get("name", "")).strip():
+            return {"code": "invalid_name", "message": "Cardholder name is required."}
+        return None
+
+    def _tokenize(self, route: Route) -> None:
+        start = time.perf_counter()
+        try:
+            payload = json.loads(route.request.post_data or "{}")
+        except ValueError:
+            payload = {}
+        if self.latency:
+            # Waiting through Playwright keeps other routes and events flowing meanwhile
+            route.request.frame.wait_for_timeout(self.latency * 1000)
+
+        error = self._validate(payload)
+        if error:
+            self.rejected.append(dict(error, at=time.time()))
+            return self._reply(route, 400, {"error": error})
+
+        number = "".join(str(payload["number"]).split())
+        outcome = self.outcome or self.card_outcomes.get(number, SUCCESS)
+        status = {SUCCESS: "succeeded", CHALLENGE: "requires_action", DECLINE: "declined"}[outcome]
+        tokenization = Tokenization(
+            token=f"tok_{secrets.token_hex(12)}", brand=card_brand(number), last4=number[-4:],
+            outcome=outcome, status=status, latency_ms=round((time.perf_counter() - start) * 1000, 1),
+            at=time.time())
+        self.tokenizations.append(tokenization)
+        print(f"Fake payment provider: {tokenization.brand} ending {tokenization.last4} -> {status}")
+
+        if outcome == DECLINE:
+            return self._reply(route, 402, {"error": {"code": "card_declined", "message": "Your card was declined."}})
+        if outcome == CHALLENGE:
+            self._pending[tokenization.token] = tokenization
+        self._reply(route, 200, {"status": status, "token": tokenization.token, "brand": tokenization.brand,
+                                 "last4": tokenization.last4})
+
+    def _confirm(self, route: Route) -> None:
+        """Finish a 3DS challenge"""
+        try:
+            payload = json.loads(route.request.post_data or "{}")
+        except ValueError:
+            payload = {}
+        tokenization = self._pending.pop(payload.get("token"), None)
+        if tokenization is None:
+            return self._reply(route, 400, {"error": {"code": "unknown_token", "message": "Unknown payment."}})
+        if payload.get("result") != "complete":
+            tokenization.status = "authentication_failed"
+            return self._reply(route, 402, {"error": {
+                "code": "payment_intent_authentication_failure",
+                "message": "We are unable to authenticate your payment method."}})
+        tokenization.status = "succeeded"
+        self._reply(route, 200, {"status": "succeeded", "token": tokenization.token})
+
+    # Inspection
+    @property
+    def succeeded(self) -> List[Tokenization]:
+        return [t for t in self.tokenizations if t.status == "succeeded"]
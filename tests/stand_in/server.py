@@ -0,0 +1,335 @@
+"""
+Local stand-in for the Wize Invoice app.
+
+A small single-page app plus JSON API served from a background thread. Its DOM
+follows the locators used by the page objects (login, cost centers, expense types,
+invoices), so the page objects run against it unchanged by passing base_url. It
+gives benchmarks and load tests deterministic, network-independent numbers.
+
+Knobs:
+    latency_ms: Delay added to every API response
+    upload_kbps: Bandwidth limit for request bodies (simulates a slow upload link)
+"""
+import json
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Front-end routes all serve the single-page app
+PAGE_ROUTES = {"/", "/login", "/create-account", "/dashboard", "/cost-center", "/expense-type", "/invoices"}
+
+# File signatures the stand-in accepts as invoices
+_INVOICE_SIGNATURES = (b"%PDF", b"\x89PNG", b"\xff\xd8\xff")
+
+_COLLECTIONS = {
+    "cost-centers": "cost_centers",
+    "expense-types": "expense_types",
+    "invoices": "invoices",
+}
+
+
+class StandInStore:
+    """Thread-safe in-memory data of the stand-in"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.collections: Dict[str, List[Dict]] = {name: [] for name in _COLLECTIONS.values()}
+        self.users = {}
+        self.sessions = set()
+
+    def add(self, collection: str, item: Dict) -> Dict:
+        with self.lock:
+            item = dict(item, id=str(self.next_id), createdAt=datetime.now(timezone.utc).isoformat())
+            self.next_id += 1
+            # Newest first, like the real app's lists
+            self.collections[collection].insert(0, item)
+            return item
+
+    def delete(self, collection: str, item_id: str) -> bool:
+        with self.lock:
+            items = self.collections[collection]
+            for index, item in enumerate(items):
+                if item["id"] == item_id:
+                    del items[index]
+                    return True
+        return False
+
+    def query(self, collection: str, search: str = "", page: int = 1, page_size: int = 10) -> Dict:
+        with self.lock:
+            items = list(self.collections[collection])
+        if search:
+            needle = search.lower()
+            items = [i for i in items if needle in i.get("name", "").lower()]
+        start = (max(1, page) - 1) * page_size
+        return {"data": items[start:start + page_size], "total": len(items),
+                "page": page, "pageSize": page_size}
+
+    def seed(self, collection: str, count: int, prefix: str) -> int:
+        """Bulk-insert generated entities (used by scale benchmarks)"""
+        with self.lock:
+            cost_center = next(iter(self.collections["cost_centers"]), None)
+        for index in range(count):
+            item = {"name": f"{prefix} {index + 1}", "status": "Active"}
+            if collection == "expense_types":
+                item["costCenter"] = cost_center["name"] if cost_center else "General"
+            elif collection == "invoices":
+                item.update(type="Debit", expenseType="General", status="Processed", size=0)
+            self.add(collection, item)
+        return count
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "WizeStandIn/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def stand_in(self) -> "StandInServer":
+        return self.server.stand_in
+
+    def log_message(self, format, *args):
+        # Keep test output readable; the stand-in is silent unless verbose
+        if self.stand_in.verbose:
+            super().log_message(format, *args)
+
+    # Helpers
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json",
+              headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        self._send(status, json.dumps(payload).encode(), headers=headers)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        limit = self.stand_in.upload_kbps
+        chunks, remaining, start = [], length, time.perf_counter()
+        while remaining > 0:
+            chunk = self.rfile.read(min(65536, remaining))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            if limit:
+                # Sleep until the bytes read so far fit the configured bandwidth
+                expected = (length - remaining) / (limit * 1024)
+                elapsed = time.perf_counter() - start
+                if expected > elapsed:
+                    time.sleep(expected - elapsed)
+        return b"".join(chunks)
+
+    def _authorized(self) -> bool:
+        token = (self.headers.get("Authorization") or "").replace("Bearer ", "")
+        cookies = dict(c.strip().split("=", 1) for c in (self.headers.get("Cookie") or "").split(";") if "=" in c)
+        return token in self.stand_in.store.sessions or cookies.get("session") in self.stand_in.store.sessions
+
+    def _api_delay(self):
+        if self.stand_in.latency_ms:
+            time.sleep(self.stand_in.latency_ms / 1000)
+
+    # Routing
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path in PAGE_ROUTES:
+            return self._send(200, (STATIC_DIR / "index.html").read_bytes(), "text/html; charset=utf-8")
+        if url.path.startswith("/static/"):
+            target = (STATIC_DIR / url.path[len("/static/"):]).resolve()
+            if STATIC_DIR.resolve() in target.parents and target.is_file():
+                content_type = "application/javascript" if target.suffix == ".js" else "text/css"
+                return self._send(200, target.read_bytes(), content_type)
+        if url.path.startswith("/api/"):
+            return self._api("GET", url)
+        self._send(404, b"Not found", "text/plain")
+
+    def do_POST(self):
+        self._api("POST", urlsplit(self.path))
+
+    def do_DELETE(self):
+        self._api("DELETE", urlsplit(self.path))
+
+    def _api(self, method: str, url):
+        body = self._read_body() if method == "POST" else b""
+        self._api_delay()
+        parts = [p for p in url.path.split("/") if p][1:]  # drop 'api'
+        store = self.stand_in.store
+
+        if parts == ["auth", "login"] and method == "POST":
+            return self._login(body)
+        if parts == ["auth", "logout"]:
+            return self._json(200, {"ok": True}, {"Set-Cookie": "session=; Path=/; Max-Age=0"})
+        if not parts or parts[0] not in _COLLECTIONS:
+            return self._json(404, {"message": "Not found"})
+        if not self._authorized():
+            return self._json(401, {"message": "Unauthorized"})
+
+        collection = _COLLECTIONS[parts[0]]
+        if method == "GET" and len(parts) == 1:
+            query = parse_qs(url.query)
+            return self._json(200, store.query(
+                collection,
+                search=query.get("search", [""])[0],
+                page=int(query.get("page", ["1"])[0]),
+                page_size=int(query.get("pageSize", ["10"])[0])
+            ))
+        if method == "POST" and len(parts) == 2 and parts[1] == "seed":
+            payload = json.loads(body or b"{}")
+            count = store.seed(collection, int(payload.get("count", 0)), payload.get("prefix", "Seed"))
+            return self._json(201, {"created": count})
+        if method == "POST" and len(parts) == 1:
+            if collection == "invoices":
+                return self._create_invoices(body)
+            payload = json.loads(body or b"{}")
+            name = (payload.get("name") or "").strip()
+            if not name:
+                return self._json(400, {"message": "Name is required"})
+            return self._json(201, {"data": store.add(collection, payload)})
+        if method == "DELETE" and len(parts) == 2:
+            if store.delete(collection, parts[1]):
+                return self._json(200, {"ok": True})
+            return self._json(404, {"message": "Not found"})
+        self._json(405, {"message": "Method not allowed"})
+
+    def _login(self, body: bytes):
+        payload = json.loads(body or b"{}")
+        email, password = payload.get("email", "").strip(), payload.get("password", "")
+        expected = self.stand_in.users.get(email)
+        if expected is None or expected != password:
+            return self._json(401, {"message": "Invalid email or password"})
+        token = secrets.token_hex(16)
+        self.stand_in.store.sessions.add(token)
+        self._json(200, {"token": token}, {"Set-Cookie": f"session={token}; Path=/; SameSite=Lax"})
+
+    def _create_invoices(self, body: bytes):
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode() + body)
+        fields, files = {}, []
+        for part in message.iter_parts() if message.is_multipart() else []:
+            name = part.get_param("name", header="content-disposition")
+            filename = part.get_filename()
+            if filename:
+                files.append((filename, part.get_payload(decode=True) or b""))
+            elif name:
+                fields[name] = part.get_content().strip()
+        if not files:
+            return self._json(400, {"message": "No files uploaded"})
+        created = []
+        for filename, content in files:
+            status = "Processed" if content.startswith(_INVOICE_SIGNATURES) else "Failed"
+            created.append(self.stand_in.store.add("invoices", {
+                "name": filename, "size": len(content), "status": status,
+                "type": fields.get("type", "Debit"), "expenseType": fields.get("expenseType", ""),
+                "costCenter": fields.get("costCenter", "")
+            }))
+        self._json(201, {"data": created})
+
+
+class StandInServer:
+    """Runs the stand-in app on a local port in a background thread
+
+    Usage:
+        with StandInServer() as stand_in:
+            page.goto(stand_in.url("/login"))
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0,
+                 upload_kbps: float = None, users: Dict[str, str] = None, verbose: bool = False):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency_ms: Delay added to every API response
+            upload_kbps: Request body bandwidth limit in KB/s (None for unlimited)
+            users: Accepted credentials {email: password}; defaults to the suite's credentials
+            verbose: Whether to log every request
+        """
+        from tests.config.test_config import CREDENTIALS
+
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.upload_kbps = upload_kbps
+        self.verbose = verbose
+        self.users = users or {c["email"]: c["password"] for c in CREDENTIALS.values()}
+        self.store = StandInStore()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, path: str = "") -> str:
+        return f"{self.base_url}{path}"
+
+    def start(self) -> "StandInServer":
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stand-in", daemon=True)
+        self._thread.start()
+        print(f"Stand-in app running at {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def seed(self, kind: str, count: int, prefix: str = "Seed") -> int:
+        """Insert generated entities directly into the store
+
+        Args:
+            kind: 'cost_centers', 'expense_types' or 'invoices'
+            count: Number of entities
+            prefix: Name prefix ('<prefix> <n>')
+        """
+        return self.store.seed(kind, count, prefix)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the local stand-in of the invoice app")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--upload-kbps", type=float, default=None)
+    args = parser.parse_args()
+
+    server = StandInServer(port=args.port, latency_ms=args.latency_ms,
+                           upload_kbps=args.upload_kbps, verbose=True).start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
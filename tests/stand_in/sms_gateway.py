@@ -0,0 +1,201 @@
+"""
+Fake SMS gateway: a reusable route stub for phone OTP requests.
+
+The product currently has no phone verification (test_su_004 stays skipped until
+it does); the stub is kept for when phone fields return, and test_su_006 checks it
+against a minimal page. It attaches to a
+Playwright page (or browser context) and answers the app's phone send-otp /
+verify-otp requests itself, so no real SMS provider is involved. Every
+code sent is captured and available to the test straight away; delivery delays
+can be injected to model a slow provider, and the time until a code is "received"
+is recorded as a metric.
+"""
+import json
+import re
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Union
+
+from playwright.sync_api import BrowserContext, Page, Route
+
+from tests.utils.metrics import record_metric
+
+SEND_OTP_PATTERN = "**/send-otp"
+VERIFY_OTP_PATTERN = "**/verify-otp"
+
+# Local part of the number: digits only, as accepted by the SMS provider
+_PHONE_NUMBER_RE = re.compile(r"^\d{6,14}$")
+
+
+def normalize_phone(country_code: str, phone_number: str = "") -> str:
+    """Join country code and number into one key, e.g. ('+1', '234 567 890') -> '+1234567890'"""
+    return re.sub(r"[\s\-()]", "", f"{country_code}{phone_number}")
+
+
+@dataclass
+class SmsMessage:
+    """A verification code sent through the gateway"""
+    phone: str
+    code: str
+    requested_at: float
+    deliver_at: float
+    verified: bool = False
+
+    @property
+    def delivered(self) -> bool:
+        return time.time() >= self.deliver_at
+
+
+@dataclass
+class VerificationAttempt:
+    phone: str
+    code: str
+    accepted: bool
+    at: float = field(default_factory=time.time)
+
+
+class FakeSmsGateway:
+    """Route-level stand-in for the SMS provider behind phone verification
+
+    Usage:
+        gateway = FakeSmsGateway(delivery_delay=2).attach(page)
+        ...click "Verify" next to the phone number...
+        code = gateway.wait_for_code("+1", "1234567890")
+    """
+
+    def __init__(self, delivery_delay: float = 0.0, code_ttl: float = 300,
+                 code_factory: Callable[[], str] = None):
+        """
+        Args:
+            delivery_delay: Seconds between the send-otp request and the code being received
+            code_ttl: Seconds a code stays valid for verify-otp
+            code_factory: Returns the next code (default: random 6 digits)
+        """
+        self.delivery_delay = delivery_delay
+        self.code_ttl = code_ttl
+        self.code_factory = code_factory or (lambda: f"{secrets.randbelow(10 ** 6):06d}")
+        self.messages: List[SmsMessage] = []
+        self.verifications: List[VerificationAttempt] = []
+        self.rejected_sends: List[Dict] = []
+        self._delays: Dict[str, float] = {}
+        self._target: Optional[Union[Page, BrowserContext]] = None
+
+    # Routing
+    def attach(self, target: Union[Page, BrowserContext]) -> "FakeSmsGateway":
+        """Intercept phone OTP requests made by the page or context"""
+        target.route(SEND_OTP_PATTERN, self._handle_send)
+        target.route(VERIFY_OTP_PATTERN, self._handle_verify)
+        self._target = target
+        return self
+
+    def detach(self) -> None:
+        if self._target is None:
+            return
+        try:
+            self._target.unroute(SEND_OTP_PATTERN, self._handle_send)
+            self._target.unroute(VERIFY_OTP_PATTERN, self._handle_verify)
+        except Exception:
+            # The page may already be closed at teardown
+            pass
+        self._target = None
+
+    @staticmethod
+    def _payload(route: Route) -> Optional[Dict]:
+        """Return the JSON body if this is a phone request, None otherwise"""
+        try:
+            payload = json.loads(route.request.post_data or "{}")
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or "phoneNumber" not in payload:
+            return None
+        return payload
+
+    @staticmethod
+    def _reply(route: Route, status: int, body: Dict) -> None:
+        route.fulfill(status=status, content_type="application/json", body=json.dumps(body))
+
+    def _handle_send(self, route: Route) -> None:
+        payload = self._payload(route)
+        if payload is None:
+            # Email OTPs and anything else go to the real backend
+            return route.fallback()
+
+        number = str(payload.get("phoneNumber", "")).strip()
+        phone = normalize_phone(str(payload.get("countryCode", "")), number)
+        if not _PHONE_NUMBER_RE.match(number):
+            self.rejected_sends.append({"phone": phone, "at": time.time()})
+            return self._reply(route, 400, {"message": "Failed to send verification code."})
+
+        now = time.time()
+        message = SmsMessage(phone, self.code_factory(), now, now + self._delays.get(phone, self.delivery_delay))
+        self.messages.append(message)
+        print(f"Fake SMS gateway: code for {phone} due in {message.deliver_at - now:.2f}s")
+        self._reply(route, 200, {"success": True, "message": "Verification code sent"})
+
+    def _handle_verify(self, route: Route) -> None:
+        payload = self._payload(route)
+        if payload is None:
+            return route.fallback()
+
+        phone = normalize_phone(str(payload.get("countryCode", "")), str(payload.get("phoneNumber", "")))
+        code = str(payload.get("code", ""))
+        message = self.latest(phone)
+        accepted = (message is not None and not message.verified and code == message.code
+                    and time.time() - message.requested_at <= self.code_ttl)
+        self.verifications.append(VerificationAttempt(phone, code, accepted))
+        if not accepted:
+            return self._reply(route, 400, {"message": "Invalid verification code."})
+        message.verified = True
+        self._reply(route, 200, {"success": True, "verified": True})
+
+    # Delivery control
+    def set_delay(self, seconds: float, phone: str = None) -> None:
+        """Set the delivery delay for all numbers, or only for one normalized phone"""
+        if phone is None:
+            self.delivery_delay = seconds
+        else:
+            self._delays[normalize_phone(phone)] = seconds
+
+    # Inspection
+    def latest(self, country_code: str, phone_number: str = "") -> Optional[SmsMessage]:
+        """Return the last message sent to the number, delivered or not"""
+        phone = normalize_phone(country_code, phone_number)
+        return next((m for m in reversed(self.messages) if m.phone == phone), None)
+
+    def wait_for_code(self, country_code: str, phone_number: str = "", timeout: float = 10) -> str:
+        """Return the code sent to the number once its delivery delay has passed
+
+        Args:
+            country_code: Country code, or the full normalized phone number
+            phone_number: Local number (optional when the full number is given)
+            timeout: Seconds to wait for the send request and the delivery
+
+        Raises:
+            TimeoutError: If no code is received within the timeout
+        """
+        phone = normalize_phone(country_code, phone_number)
+        deadline = time.time() + timeout
+        message = self.latest(phone)
+        while message is None:
+            if time.time() >= deadline:
+                raise TimeoutError(f"No SMS code requested for {phone} within {timeout} seconds")
+            self._pump(50)
+            message = self.latest(phone)
+
+        remaining = message.deliver_at - time.time()
+        if remaining > deadline - time.time():
+            raise TimeoutError(f"SMS code for {phone} is delivered after the {timeout} second timeout")
+        if remaining > 0:
+            time.sleep(remaining)
+
+        record_metric("sms.otp.delivery", round((time.time() - message.requested_at) * 1000, 1), phone=phone)
+        return message.code
+
+    def _pump(self, ms: float) -> None:
+        """Let Playwright dispatch pending route callbacks while waiting"""
+        pages = [self._target] if isinstance(self._target, Page) else getattr(self._target, "pages", [])
+        if pages:
+            pages[0].wait_for_timeout(ms)
+        else:
+            time.sleep(ms / 1000)
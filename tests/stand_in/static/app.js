@@ -0,0 +1,462 @@
+// Stand-in single-page app. The markup mirrors the selectors used by the page objects.
+(function () {
+  const app = document.getElementById('app');
+  const ICONS = {
+    loader: '<svg class="lucide lucide-loader-circle animate-spin" viewBox="0 0 24 24"><circle cx="12" cy="12" r="10"/></svg>',
+    x: '<svg class="lucide lucide-x" viewBox="0 0 24 24"><path d="M18 6 6 18M6 6l12 12"/></svg>',
+    trash: '<svg class="lucide lucide-trash-2" viewBox="0 0 24 24"><path d="M3 6h18"/></svg>',
+    file: '<svg class="lucide lucide-file-text" viewBox="0 0 24 24"><path d="M14 2H6v20h12V8z"/></svg>'
+  };
+  const ACCEPTED_TYPES = ['application/pdf', 'image/png', 'image/jpeg'];
+  const MAX_FILE_SIZE = 10 * 1024 * 1024;
+
+  function h(tag, attrs, ...children) {
+    const el = document.createElement(tag);
+    for (const [key, value] of Object.entries(attrs || {})) {
+      if (value === null || value === undefined || value === false) continue;
+      if (key.startsWith('on')) el.addEventListener(key.slice(2), value);
+      else if (key === 'html') el.innerHTML = value;
+      else el.setAttribute(key, value === true ? '' : value);
+    }
+    for (const child of children.flat()) {
+      if (child === null || child === undefined || child === false) continue;
+      el.append(child instanceof Node ? child : document.createTextNode(String(child)));
+    }
+    return el;
+  }
+
+  function token() {
+    const match = document.cookie.match(/(?:^|; )session=([^;]+)/);
+    return match ? match[1] : localStorage.getItem('token');
+  }
+
+  let pending = 0;
+  function setLoading(delta) {
+    pending += delta;
+    const spinner = document.getElementById('global-loader');
+    if (spinner) spinner.classList.toggle('hidden', pending <= 0);
+  }
+
+  async function api(method, path, body) {
+    setLoading(1);
+    try {
+      const options = { method, headers: { Authorization: `Bearer ${token()}` } };
+      if (body instanceof FormData) options.body = body;
+      else if (body !== undefined) {
+        options.body = JSON.stringify(body);
+        options.headers['Content-Type'] = 'application/json';
+      }
+      const response = await fetch(path, options);
+      const data = await response.json().catch(() => ({}));
+      if (!response.ok) throw new Error(data.message || `HTTP ${response.status}`);
+      return data;
+    } finally {
+      setLoading(-1);
+    }
+  }
+
+  function toast(message) {
+    const el = h('div', { class: 'toast', role: 'status' }, message);
+    document.body.append(el);
+    setTimeout(() => el.remove(), 3000);
+  }
+
+  // ===== Login =====
+  function renderLogin() {
+    const error = h('div', { class: 'text-red-500 hidden' });
+    const form = h('form', {
+      onsubmit: async event => {
+        event.preventDefault();
+        error.classList.add('hidden');
+        try {
+          const data = await fetch('/api/auth/login', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ email: form.email.value, password: form.password.value })
+          }).then(async r => ({ ok: r.ok, body: await r.json() }));
+          if (!data.ok) throw new Error(data.body.message);
+          localStorage.setItem('token', data.body.token);
+          location.href = '/dashboard';
+        } catch (e) {
+          error.textContent = e.message;
+          error.classList.remove('hidden');
+        }
+      }
+    },
+      h('h1', {}, 'Login'),
+      h('label', { for: 'email' }, 'Email'),
+      h('input', { id: 'email', name: 'email', type: 'email', autocomplete: 'username' }),
+      h('label', { for: 'password' }, 'Password'),
+      h('input', { id: 'password', name: 'password', type: 'password' }),
+      error,
+      h('button', { type: 'submit' }, 'Login'),
+      h('a', { href: '/forgot-password' }, 'Forgot Password'),
+      h('a', { class: 'text-sm font-medium text-[#11A193]', href: '/create-account' }, 'Sign Up')
+    );
+    app.append(form);
+  }
+
+  // ===== Sign up =====
+  // Only the account form: it is the checkout's return page in the payment tests.
+  // Phone verification was removed from the product and is not served here.
+  function renderSignup() {
+    function field(id, label, attrs, button) {
+      const input = h('input', Object.assign({ id, name: id }, attrs));
+      return { input, row: h('div', {}, h('label', { for: id }, label), h('div', {}, input, button)) };
+    }
+
+    const email = field('email', 'Email', { type: 'email', placeholder: 'name@example.com' },
+      h('button', { type: 'button', disabled: true }, 'Verify'));
+    const emailButton = email.row.querySelector('button');
+    email.input.addEventListener('input', () => { emailButton.disabled = !email.input.value; });
+
+    app.append(h('form', { onsubmit: event => event.preventDefault() },
+      h('h1', {}, 'Create Account'),
+      field('firstName', 'First Name', { placeholder: 'John' }).row,
+      field('lastName', 'Last Name', { placeholder: 'Doe' }).row,
+      email.row,
+      field('password', 'Password', { type: 'password' }).row,
+      field('confirmPassword', 'Confirm Password', { type: 'password' }).row,
+      h('button', { type: 'submit', disabled: true }, 'Create Account'),
+      h('a', { href: '/login' }, 'Login')));
+  }
+
+  // ===== Shared list page =====
+  function listPage(config) {
+    const state = { page: 1, pageSize: 10, search: '', total: 0, items: [] };
+    const counters = h('div', { class: 'counters' });
+    const tbody = h('tbody', { 'data-slot': 'table-body' });
+    const empty = h('div', { class: 'hidden' }, config.emptyText);
+    const pageInfo = h('div', { class: 'text-sm font-medium text-gray-900' });
+    const pageSize = h('select', {
+      class: 'border border-gray-300 rounded-md px-3 py-1.5 text-sm bg-white',
+      onchange: () => { state.pageSize = Number(pageSize.value); state.page = 1; load(); }
+    }, [10, 20, 50, 100].map(n => h('option', { value: n }, n)));
+    const search = h('input', {
+      type: 'text', placeholder: config.searchPlaceholder,
+      oninput: () => { state.search = search.value; state.page = 1; load(); },
+      onkeydown: event => { if (event.key === 'Enter') load(); }
+    });
+
+    let sequence = 0;
+    async function load() {
+      const current = ++sequence;
+      const query = new URLSearchParams({ page: state.page, pageSize: state.pageSize });
+      if (state.search) query.set('search', state.search);
+      const data = await api('GET', `${config.api}?${query}`);
+      // Drop responses of superseded searches
+      if (current !== sequence) return;
+      Object.assign(state, { items: data.data, total: data.total });
+      render();
+    }
+
+    function render() {
+      tbody.replaceChildren(...state.items.map(item =>
+        h('tr', { 'data-slot': 'table-row' }, config.cells(item).map(cell => h('td', { 'data-slot': 'table-cell' }, cell)),
+          h('td', { 'data-slot': 'table-cell' }, config.actions(item, load)))));
+      empty.classList.toggle('hidden', state.items.length > 0);
+      const pages = Math.max(1, Math.ceil(state.total / state.pageSize));
+      pageInfo.textContent = `Page ${state.page} of ${pages}`;
+      counters.replaceChildren(...config.counters(state).map(([label, value, cls]) =>
+        h('div', {}, h('div', { class: 'text-sm font-medium text-gray-500' }, label), h('div', { class: `text-2xl font-bold ${cls || ''}`.trim() }, value))));
+    }
+
+    app.append(
+      h('div', { class: 'toolbar' },
+        h('h1', {}, config.title),
+        h('span', { id: 'global-loader', class: 'hidden', html: ICONS.loader }),
+        h('button', { onclick: () => config.create(load) }, config.newLabel),
+        h('button', { onclick: load }, 'Refresh')),
+      counters,
+      h('div', { class: 'toolbar' }, search),
+      h('table', { 'data-slot': 'table' },
+        h('thead', { 'data-slot': 'table-header' },
+          h('tr', {}, config.headers.map(label => h('th', { 'data-slot': 'table-head' }, label)))),
+        tbody),
+      empty,
+      h('div', { class: 'bg-gray-50 px-6 py-4 border-t border-gray-200' },
+        h('span', {}, 'Rows per page'), pageSize, pageInfo,
+        h('button', { title: 'Previous page', onclick: () => { if (state.page > 1) { state.page--; load(); } } }, 'Previous'),
+        h('button', { title: 'Next page', onclick: () => { if (state.page * state.pageSize < state.total) { state.page++; load(); } } }, 'Next'))
+    );
+    load();
+  }
+
+  // Like Radix dialogs, hide the rest of the page from the accessibility tree while open
+  function openBackdrop(content) {
+    const backdrop = h('div', { class: 'backdrop' }, content);
+    const background = [app, document.querySelector('nav')];
+    background.forEach(el => el.setAttribute('aria-hidden', 'true'));
+    document.body.append(backdrop);
+    return () => {
+      backdrop.remove();
+      background.forEach(el => el.removeAttribute('aria-hidden'));
+    };
+  }
+
+  function modal(title, body, submitLabel, onSubmit) {
+    const error = h('div', { class: 'text-red-500 hidden' });
+    let close = () => {};
+    const form = h('form', {
+      onsubmit: async event => {
+        event.preventDefault();
+        try {
+          await onSubmit(form);
+          close();
+        } catch (e) {
+          error.textContent = e.message;
+          error.classList.remove('hidden');
+        }
+      }
+    }, body, error,
+      h('button', { type: 'button', onclick: () => close() }, 'Cancel'),
+      h('button', { type: 'submit' }, submitLabel));
+    close = openBackdrop(h('div', { role: 'dialog', 'data-slot': 'card' }, h('h2', {}, title), form));
+  }
+
+  // Cost centers and invoices confirm with the native dialog, expense types with an in-app one
+  function deleteAction(item, label, api_path, reload, inApp) {
+    const remove = async () => {
+      await api('DELETE', `${api_path}/${item.id}`);
+      reload();
+    };
+    if (!inApp) {
+      return () => confirm(`Are you sure you want to delete this ${label}?`) && remove();
+    }
+    return () => {
+      const close = openBackdrop(h('div', { role: 'alertdialog', 'data-slot': 'card' },
+        h('h2', {}, `Delete ${label}`),
+        h('p', {}, `Are you sure you want to delete "${item.name}"?`),
+        h('button', { type: 'button', onclick: () => close() }, 'Cancel'),
+        h('button', { type: 'button', onclick: () => { close(); remove(); } }, 'Delete')));
+    };
+  }
+
+  // ===== Cost centers =====
+  function renderCostCenters() {
+    listPage({
+      title: 'Cost Centers', api: '/api/cost-centers', newLabel: 'New Cost Center',
+      searchPlaceholder: 'Search cost centers...', emptyText: 'No cost centers found.',
+      headers: ['Name', 'Status', 'Actions'],
+      cells: item => [h('div', { class: 'font-medium' }, item.name), h('div', { class: 'text-gray-700' }, item.status)],
+      counters: state => [
+        ['Total Cost Centers', state.total],
+        ['Active Centers', state.total, 'text-green-600'],
+        ['Inactive Centers', 0, 'text-red-600']
+      ],
+      actions: (item, reload) => {
+        const menu = h('div', { role: 'menu', class: 'hidden' },
+          h('div', { role: 'menuitem', onclick: () => menu.classList.add('hidden') }, 'Edit'),
+          h('div', { role: 'menuitem', onclick: () => { menu.classList.add('hidden'); deleteAction(item, 'cost center', '/api/cost-centers', reload)(); } }, 'Delete'));
+        return [h('button', { 'aria-haspopup': 'menu', onclick: () => menu.classList.toggle('hidden') }, '⋯'), menu];
+      },
+      create: reload => modal('New Cost Center',
+        [h('label', { for: 'name' }, 'Name'), h('input', { id: 'name', name: 'name', 'data-slot': 'input' })],
+        'Add cost center',
+        async form => {
+          await api('POST', '/api/cost-centers', { name: form.name.value, status: 'Active' });
+          reload();
+        })
+    });
+  }
+
+  // ===== Expense types =====
+  function combobox(id, placeholder, loadOptions, onSelect, disabled) {
+    const wrapper = h('div', { style: 'position: relative' });
+    const hidden = h('select', { 'aria-hidden': 'true', tabindex: '-1', class: 'hidden' });
+    const trigger = h('button', {
+      type: 'button', role: 'combobox', 'aria-controls': `radix-${id}`, 'aria-expanded': 'false', disabled,
+      onclick: async () => {
+        const open = trigger.getAttribute('aria-expanded') === 'true';
+        document.querySelectorAll('[role="listbox"]').forEach(l => l.remove());
+        document.querySelectorAll('[role="combobox"]').forEach(c => c.setAttribute('aria-expanded', 'false'));
+        if (open) return;
+        const options = await loadOptions();
+        hidden.replaceChildren(...options.map(o => h('option', { value: o.id }, o.name)));
+        const listbox = h('div', { role: 'listbox', id: `radix-${id}` }, options.map(option =>
+          h('div', {
+            role: 'option', onclick: () => {
+              trigger.firstChild.textContent = option.name;
+              trigger.setAttribute('aria-expanded', 'false');
+              listbox.remove();
+              onSelect(option);
+            }
+          }, option.name)));
+        trigger.setAttribute('aria-expanded', 'true');
+        wrapper.append(listbox);
+      }
+    }, h('span', {}, placeholder));
+    wrapper.append(trigger, hidden);
+    return { wrapper, trigger };
+  }
+
+  const fetchAll = path => api('GET', `${path}?pageSize=1000`).then(d => d.data);
+
+  function renderExpenseTypes() {
+    listPage({
+      title: 'Expense Types', api: '/api/expense-types', newLabel: 'New Expense Type',
+      searchPlaceholder: 'Search expense types...', emptyText: 'No expense types found.',
+      headers: ['Name', 'Cost Center', 'Created At', 'Actions'],
+      cells: item => [
+        h('div', { class: 'font-medium' }, item.name),
+        h('div', { class: 'text-gray-700' }, item.costCenter),
+        h('div', { class: 'text-gray-700' }, new Date(item.createdAt).toLocaleDateString())
+      ],
+      counters: state => [['Total Expense Types', state.total]],
+      actions: (item, reload) => [
+        h('button', { 'aria-label': 'Edit' }, 'Edit'),
+        h('button', { 'aria-label': 'Delete', onclick: deleteAction(item, 'expense type', '/api/expense-types', reload, true) }, 'Delete')
+      ],
+      create: reload => {
+        let costCenter = null;
+        const select = combobox('cost-center', 'Select a cost center', () => fetchAll('/api/cost-centers'),
+          option => { costCenter = option; });
+        modal('Create New Expense Type',
+          [h('label', { for: 'name' }, 'Name'), h('input', { id: 'name', name: 'name' }), select.wrapper],
+          'Add expense type',
+          async form => {
+            if (!costCenter) throw new Error('Cost center is required');
+            await api('POST', '/api/expense-types', { name: form.name.value, costCenter: costCenter.name });
+            toast('Expense type created successfully');
+            reload();
+          });
+      }
+    });
+  }
+
+  // ===== Invoices =====
+  function formatSize(bytes) {
+    if (bytes >= 1024 * 1024) return `${(bytes / 1024 / 1024).toFixed(2)} MB`;
+    if (bytes >= 1024) return `${(bytes / 1024).toFixed(2)} KB`;
+    return `${bytes} B`;
+  }
+
+  function openInvoiceOverlay(reload) {
+    const files = [];
+    let costCenter = null, expenseType = null;
+    let close = () => {};
+    const warnings = h('div');
+    const list = h('div', { class: 'space-y-1' });
+    const selectedSection = h('div', { class: 'mt-4 space-y-2 hidden' },
+      h('div', { class: 'text-sm font-medium' }, 'Selected Files'), list);
+    const submit = h('button', { type: 'button', disabled: true, onclick: () => upload() }, 'Add Invoice');
+    const selectFiles = h('button', { type: 'button', onclick: () => input.click() }, 'Select Files');
+
+    function warn(message) {
+      warnings.append(h('div', { class: 'bg-red-50 border-red-200 text-red-800' }, message));
+    }
+
+    function renderFiles() {
+      list.replaceChildren(...files.map((file, index) =>
+        h('div', { class: 'flex items-center justify-between p-2 bg-blue-50 rounded-md' },
+          h('div', { class: 'flex items-center gap-2' },
+            h('span', { html: ICONS.file }),
+            h('div', {},
+              h('div', { class: 'text-sm font-medium text-blue-700' }, file.name),
+              h('div', { class: 'text-xs text-blue-600' }, formatSize(file.size)))),
+          h('button', { type: 'button', html: ICONS.trash, onclick: () => { files.splice(index, 1); renderFiles(); } }))));
+      selectedSection.classList.toggle('hidden', files.length === 0);
+      submit.textContent = files.length > 1 ? `Upload ${files.length} Files` : 'Add Invoice';
+      submit.disabled = files.length === 0;
+    }
+
+    const input = h('input', {
+      type: 'file', id: 'file', multiple: true, class: 'hidden',
+      onchange: () => {
+        warnings.replaceChildren();
+        for (const file of input.files) {
+          if (!ACCEPTED_TYPES.includes(file.type)) {
+            warn(`${file.name}: File type not supported. Please use PDF, JPEG, or PNG.`);
+            selectFiles.disabled = true;
+          } else if (file.size > MAX_FILE_SIZE) {
+            warn(`${file.name}: File size must be less than 10MB`);
+          } else if (files.some(f => f.name === file.name && f.size === file.size && f.type === file.type)) {
+            warn(`File already selected: ${file.name}`);
+          } else {
+            files.push(file);
+          }
+        }
+        input.value = '';
+        renderFiles();
+      }
+    });
+
+    async function upload() {
+      submit.disabled = true;
+      submit.textContent = 'Uploading...';
+      warnings.replaceChildren();
+      const type = card.querySelector('input[name="type"]:checked').value;
+      try {
+        // One request per file, all in flight together
+        await Promise.all(files.map(file => {
+          const body = new FormData();
+          body.append('files', file, file.name);
+          body.append('type', type);
+          body.append('costCenter', costCenter ? costCenter.name : '');
+          body.append('expenseType', expenseType ? expenseType.name : '');
+          return api('POST', '/api/invoices', body);
+        }));
+        close();
+        reload();
+      } catch (e) {
+        warn(e.message === 'Failed to fetch' ? 'Failed to fetch' : `Upload failed: ${e.message}`);
+        renderFiles();
+      }
+    }
+
+    const expenseSelect = combobox('expense-type', 'Select a cost center first',
+      async () => (await fetchAll('/api/expense-types')).filter(e => !costCenter || e.costCenter === costCenter.name),
+      option => { expenseType = option; }, true);
+    const costCenterSelect = combobox('cost-center', 'Select a cost center', () => fetchAll('/api/cost-centers'),
+      option => {
+        costCenter = option;
+        expenseSelect.trigger.disabled = false;
+        expenseSelect.trigger.firstChild.textContent = 'Select an expense type';
+      });
+
+    const card = h('div', { 'data-slot': 'card', role: 'dialog' },
+      h('div', { 'data-slot': 'card-title' }, h('h2', {}, 'New Invoice'), h('span', { html: ICONS.x, onclick: () => close() })),
+      h('div', { 'data-slot': 'card-description' }, 'Upload one or more invoice documents'),
+      costCenterSelect.wrapper, expenseSelect.wrapper,
+      h('label', {}, h('input', { type: 'radio', name: 'type', value: 'Debit', checked: true }), 'Debit'),
+      h('label', {}, h('input', { type: 'radio', name: 'type', value: 'Credit' }), 'Credit'),
+      h('label', { for: 'file', class: 'cursor-pointer' }, h('span', {}, 'Click to upload or drag and drop')),
+      input, selectFiles, warnings, selectedSection,
+      h('button', { type: 'button', onclick: () => close() }, 'Cancel'),
+      submit);
+    close = openBackdrop(card);
+  }
+
+  function renderInvoices() {
+    listPage({
+      title: 'Invoices', api: '/api/invoices', newLabel: 'New Invoice',
+      searchPlaceholder: 'Search invoices...', emptyText: 'No invoices found.',
+      headers: ['Name', 'Expense Type', 'Type', 'Date Added', 'Status', 'Actions'],
+      cells: item => [
+        h('div', { class: 'font-medium' }, item.name), item.expenseType, item.type,
+        new Date(item.createdAt).toLocaleDateString(), h('span', {}, item.status)
+      ],
+      counters: state => [['Total Invoices', state.total, 'text-blue-600']],
+      actions: (item, reload) => [
+        h('button', { 'aria-label': 'Delete', onclick: deleteAction(item, 'invoice', '/api/invoices', reload) }, 'Delete')
+      ],
+      create: reload => openInvoiceOverlay(reload)
+    });
+  }
+
+  const routes = {
+    '/login': renderLogin,
+    '/create-account': renderSignup,
+    '/dashboard': () => app.append(h('h1', {}, 'Dashboard')),
+    '/cost-center': renderCostCenters,
+    '/expense-type': renderExpenseTypes,
+    '/invoices': renderInvoices
+  };
+
+  const path = location.pathname === '/' ? '/dashboard' : location.pathname;
+  if (!['/login', '/create-account'].includes(path) && !token()) {
+    location.href = '/login';
+  } else {
+    (routes[path] || routes['/dashboard'])();
+  }
+})();
@@ -0,0 +1,493 @@
+"""
+Registry of entities created by the test suite, deleted in bulk at session end.
+
+Pages created through the ``page`` fixture are tracked automatically: successful
+create (POST) responses for cost centers, expense types and invoices are recorded
+together with the API URL and the auth headers the app used. Tests and page objects
+can also register entities explicitly by name.
+
+At the end of the session everything registered is deleted concurrently through the
+API; whatever cannot be deleted that way (no id or no API access) falls back to
+deletion through the UI page objects. Only entities created on the app at BASE_URL
+are deleted: those created on other hosts (the local stand-in) are skipped, and so
+is their traffic when the registry learns API URLs and auth.
+
+Leftovers from earlier runs that match the suite's naming patterns and are older
+than a given number of days are purged too, walking every page of the list APIs.
+Under xdist each worker deletes what it created and hands its API URLs and auth to
+the controller, which runs the purge once.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from playwright.sync_api import Page, BrowserContext, Response
+
+from tests.config.test_config import BASE_URL, CREDENTIALS
+
+# Resource kind -> substring identifying its API URL
+RESOURCES = {
+    "cost_center": "cost-centers",
+    "expense_type": "expense-type",
+    "invoice": "invoices",
+}
+
+# Names generated by the test suite (test data, XSS payloads, timestamped names)
+TEST_NAME_PATTERNS = [
+    re.compile(r"^Test CC\b", re.IGNORECASE),
+    re.compile(r"^Test Cost Center\b", re.IGNORECASE),
+    re.compile(r"^Test ?Expense[ _]", re.IGNORECASE),
+    re.compile(r"^test_update_", re.IGNORECASE),
+    re.compile(r"^Inactive CC\b", re.IGNORECASE),
+    re.compile(r"^Long Name x+", re.IGNORECASE),
+    re.compile(r"^XSS-", re.IGNORECASE),
+    re.compile(r"^API Bench\b", re.IGNORECASE),
+    re.compile(r"^Table Bench\b", re.IGNORECASE),
+    re.compile(r"<\s*(script|img|svg|iframe|div)\b|javascript:|onerror\s*=", re.IGNORECASE),
+]
+
+_ID_KEYS = ("id", "_id", "uuid")
+_CREATED_KEYS = ("createdAt", "created_at", "dateCreated", "created")
+_LIST_KEYS = ("data", "items", "results", "content", "rows")
+# List query parameters, first match wins; missing ones are added with the first name
+_PAGE_PARAMS = ("page", "pageNumber", "page_number")
+_PAGE_SIZE_PARAMS = ("pageSize", "page_size", "limit", "per_page", "size")
+_OFFSET_PARAMS = ("offset", "skip")
+STALE_PAGE_SIZE = 100
+STALE_MAX_PAGES = 50
+
+
+@dataclass
+class CreatedEntity:
+    """An entity created during the session that should be removed at the end"""
+    kind: str
+    name: Optional[str] = None
+    entity_id: Optional[str] = None
+    collection_url: Optional[str] = None
+    source: str = "manual"
+    # Origin of the app the entity was created on; None for manual registrations (BASE_URL)
+    origin: Optional[str] = None
+    deleted: bool = False
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def delete_url(self) -> Optional[str]:
+        if not (self.entity_id and self.collection_url):
+            return None
+        return f"{self.collection_url.rstrip('/')}/{self.entity_id}"
+
+
+def is_test_name(name: Optional[str]) -> bool:
+    """Check whether a name looks like one generated by the test suite"""
+    return bool(name) and any(pattern.search(name) for pattern in TEST_NAME_PATTERNS)
+
+
+def _unwrap(payload: Any) -> Any:
+    """Return the entity (or list of entities) wrapped in a typical API envelope"""
+    if isinstance(payload, dict):
+        for key in ("data", "result"):
+            if isinstance(payload.get(key), (dict, list)):
+                return payload[key]
+    return payload
+
+
+def _list_items(payload: Any) -> List[Dict]:
+    if isinstance(payload, list):
+        return [item for item in payload if isinstance(item, dict)]
+    if isinstance(payload, dict):
+        for key in _LIST_KEYS:
+            if key in payload:
+                return _list_items(payload[key])
+    return []
+
+
+def _first(item: Dict, keys) -> Any:
+    return next((item[k] for k in keys if item.get(k) not in (None, "")), None)
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if value in (None, ""):
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            # Milliseconds since epoch are common in JSON APIs
+            seconds = value / 1000 if value > 1e11 else value
+            return datetime.fromtimestamp(seconds, tz=timezone.utc)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _strip_query(url: str) -> str:
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+def _page_urls(list_url: str, page_size: int = STALE_PAGE_SIZE, max_pages: int = STALE_MAX_PAGES):
+    """List URLs of consecutive pages, starting from the first, at the given page size"""
+    parts = urlsplit(list_url)
+    query = dict(parse_qsl(parts.query))
+    size_param = next((p for p in _PAGE_SIZE_PARAMS if p in query), _PAGE_SIZE_PARAMS[0])
+    offset_param = next((p for p in _OFFSET_PARAMS if p in query), None)
+    page_param = next((p for p in _PAGE_PARAMS if p in query), _PAGE_PARAMS[0])
+    query[size_param] = page_size
+    for index in range(max_pages):
+        if offset_param:
+            query[offset_param] = index * page_size
+        else:
+            query[page_param] = index + 1
+        yield urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+APP_ORIGIN = _origin(BASE_URL)
+
+
+class CleanupRegistry:
+    """Collects created entities and deletes them in bulk"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.entities: List[CreatedEntity] = []
+        self.auth_headers: Dict[str, str] = {}
+        self.cookies: Dict[str, str] = {}
+        # Resource kind -> collection URL / last list URL observed in the app's traffic
+        self.collection_urls: Dict[str, str] = {}
+        self.list_urls: Dict[str, str] = {}
+
+    # Registration
+    def register(self, kind: str, name: str = None, entity_id: str = None,
+                 collection_url: str = None, source: str = "manual", origin: str = None) -> CreatedEntity:
+        """Register an entity for deletion at session end
+
+        Entries for the same kind and name (or id) are merged, so a page object
+        registering a name and the tracked API response registering its id end up
+        as a single entity.
+
+        Args:
+            kind: One of RESOURCES ('cost_center', 'expense_type', 'invoice')
+            name: Display name of the entity
+            entity_id: Backend id, if known
+            collection_url: API collection URL the entity was created on
+            source: Who registered the entity (for the cleanup report)
+            origin: URL of the app the entity was created on (default: BASE_URL)
+
+        Returns:
+            CreatedEntity: The registered (or updated) entry
+        """
+        entity_id = str(entity_id) if entity_id is not None else None
+        origin = _origin(origin) if origin else None
+        with self._lock:
+            for entity in self.entities:
+                if entity.kind != kind or entity.deleted:
+                    continue
+                if origin and entity.origin and entity.origin != origin:
+                    continue
+                same_id = entity_id and entity.entity_id == entity_id
+                same_name = name and entity.name == name and not (
+                    entity_id and entity.entity_id and entity.entity_id != entity_id)
+                if same_id or same_name:
+                    entity.name = entity.name or name
+                    entity.entity_id = entity.entity_id or entity_id
+                    entity.collection_url = entity.collection_url or collection_url
+                    entity.origin = entity.origin or origin
+                    return entity
+            entity = CreatedEntity(kind, name, entity_id, collection_url, source, origin=origin)
+            self.entities.append(entity)
+        print(f"Registered {kind} for cleanup: {name or entity_id}")
+        return entity
+
+    def mark_deleted(self, kind: str, name: str = None, entity_id: str = None) -> None:
+        """Mark entities the test already deleted so cleanup skips them"""
+        with self._lock:
+            for entity in self.entities:
+                if entity.kind == kind and ((name and entity.name == name) or
+                                            (entity_id and entity.entity_id == str(entity_id))):
+                    entity.deleted = True
+
+    def pending(self) -> List[CreatedEntity]:
+        """Return registered entities that have not been deleted yet"""
+        with self._lock:
+            return [e for e in self.entities if not e.deleted]
+
+    # Traffic tracking
+    def track(self, page: Page) -> None:
+        """Record create responses and API auth headers from the page's traffic"""
+        page.on("response", self._on_response)
+
+    def capture_auth(self, context: BrowserContext) -> None:
+        """Remember the context's cookies for API deletion after the browser is gone"""
+        try:
+            # Contexts on the stand-in or other hosts hold no session for the app
+            if not any(_origin(page.url) == APP_ORIGIN for page in context.pages):
+                return
+            for cookie in context.cookies():
+                self.cookies[cookie["name"]] = cookie["value"]
+        except Exception as e:
+            print(f"Could not capture cookies for cleanup: {e}")
+
+    def _kind_for(self, url: str) -> Optional[str]:
+        path = urlsplit(url).path
+        return next((kind for kind, part in RESOURCES.items() if part in path), None)
+
+    def _on_response(self, response: Response) -> None:
+        request = response.request
+        if request.resource_type not in ("fetch", "xhr"):
+            return
+        kind = self._kind_for(response.url)
+        # Frontend route fetches share the API path names; only JSON responses are API calls
+        if kind is None or "json" not in response.headers.get("content-type", ""):
+            return
+        try:
+            origin = _origin(response.frame.page.url)
+        except Exception:
+            return
+        if origin != APP_ORIGIN:
+            # Entities are recorded for the cleanup report, but never deleted
+            if request.method == "POST" and response.ok:
+                self._register_created(kind, response, _strip_query(response.url), origin)
+            return
+
+        authorization = request.headers.get("authorization")
+        if authorization:
+            self.auth_headers["Authorization"] = authorization
+
+        if request.method == "GET" and response.ok:
+            # The first list request of a page is the unfiltered initial load
+            self.list_urls.setdefault(kind, response.url)
+            self.collection_urls.setdefault(kind, _strip_query(response.url))
+            return
+        if request.method != "POST" or not response.ok:
+            return
+
+        collection_url = _strip_query(response.url)
+        self.collection_urls.setdefault(kind, collection_url)
+        # Cookies may be gone by teardown (logout), so grab them while the session is live
+        self.capture_auth(response.frame.page.context)
+        self._register_created(kind, response, collection_url, origin)
+
+    def _register_created(self, kind: str, response: Response, collection_url: str, origin: str) -> None:
+        try:
+            entity = _unwrap(response.json())
+        except Exception:
+            entity = None
+        if isinstance(entity, list):
+            entities = [e for e in entity if isinstance(e, dict)]
+        else:
+            entities = [entity] if isinstance(entity, dict) else []
+
+        for item in entities:
+            entity_id = _first(item, _ID_KEYS)
+            if entity_id is not None:
+                self.register(kind, item.get("name"), entity_id, collection_url, source="api", origin=origin)
+
+    # Deletion
+    def _api_available(self) -> bool:
+        return bool(self.auth_headers or self.cookies)
+
+    def _delete_via_api(self, entity: CreatedEntity, timeout: float) -> bool:
+        try:
+            response = requests.delete(entity.delete_url, headers=self.auth_headers,
+                                       cookies=self.cookies, timeout=timeout)
+        except requests.RequestException as e:
+            entity.error = str(e)
+            return False
+        # Already gone counts as cleaned up
+        if response.ok or response.status_code == 404:
+            entity.deleted = True
+            entity.error = None
+            return True
+        entity.error = f"HTTP {response.status_code}"
+        return False
+
+    def delete_via_api(self, entities: List[CreatedEntity], max_workers: int = 8,
+                       timeout: float = 15) -> List[CreatedEntity]:
+        """Delete entities concurrently through the API
+
+        Returns:
+            List[CreatedEntity]: Entities that could not be deleted through the API
+        """
+        candidates = [e for e in entities if e.delete_url] if self._api_available() else []
+        remaining = [e for e in entities if e not in candidates]
+        if not candidates:
+            return remaining
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda e: self._delete_via_api(e, timeout), candidates))
+
+        failed = [e for e, ok in zip(candidates, results) if not ok]
+        for entity in failed:
+            print(f"API delete failed for {entity.kind} '{entity.name or entity.entity_id}': {entity.error}")
+        return remaining + failed
+
+    def delete_via_ui(self, entities: List[CreatedEntity], headless: bool = True) -> List[CreatedEntity]:
+        """Delete named entities through the page objects in a fresh browser
+
+        Returns:
+            List[CreatedEntity]: Entities that could not be deleted through the UI
+        """
+        # Imported lazily: the page objects themselves register entities through this module
+        from playwright.sync_api import sync_playwright
+        from pages.cost_centers.cost_centers_page import CostCentersPage
+        from pages.expense_types.expense_types_page import ExpenseTypesPage
+        from pages.login.login_page import LoginPage
+
+        page_classes = {"cost_center": CostCentersPage, "expense_type": ExpenseTypesPage}
+        deletable = [e for e in entities if e.name and e.kind in page_classes]
+        remaining = [e for e in entities if e not in deletable]
+        if not deletable:
+            return remaining
+
+        with sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=headless)
+            try:
+                page = browser.new_page()
+                credentials = CREDENTIALS["DEFAULT"]
+                login = LoginPage(page)
+                login.navigate()
+                login.login(credentials["email"], credentials["password"])
+                page.wait_for_url(lambda url: "/login" not in url, timeout=30000)
+
+                # Expense types first: they reference cost centers
+                for kind in ("expense_type", "cost_center"):
+                    batch = [e for e in deletable if e.kind == kind]
+                    if not batch:
+                        continue
+                    page_object = page_classes[kind](page).open()
+                    for entity in batch:
+                        try:
+                            page_object.search(entity.name)
+                            if not page_object.is_item_in_table(entity.name, timeout=2000):
+                                entity.deleted = True
+                            elif page_object.delete_item(entity.name):
+                                entity.deleted = True
+                            else:
+                                entity.error = "UI delete failed"
+                                remaining.append(entity)
+                        except Exception as e:
+                            entity.error = str(e)
+                            remaining.append(entity)
+            except Exception as e:
+                print(f"UI cleanup failed: {e}")
+                remaining.extend(entity for entity in deletable
+                                 if not entity.deleted and entity not in remaining)
+            finally:
+                browser.close()
+        return remaining
+
+    def find_stale(self, older_than_days: float, timeout: float = 15) -> List[CreatedEntity]:
+        """List leftovers from earlier runs through the app's list APIs
+
+        Only entities whose name matches TEST_NAME_PATTERNS and whose creation time is
+        older than the given number of days are returned.
+        """
+        if not self._api_available():
+            return []
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        stale = []
+        for kind, list_url in self.list_urls.items():
+            known = {e.entity_id for e in self.entities if e.kind == kind}
+            for item in self._list_all(kind, list_url, timeout):
+                entity_id = _first(item, _ID_KEYS)
+                created = _parse_timestamp(_first(item, _CREATED_KEYS))
+                if entity_id is None or str(entity_id) in known or not is_test_name(item.get("name")):
+                    continue
+                if created is None or created > cutoff:
+                    continue
+                stale.append(CreatedEntity(kind, item.get("name"), str(entity_id),
+                                           self.collection_urls.get(kind), source="stale"))
+        return stale
+
+    def _list_all(self, kind: str, list_url: str, timeout: float) -> List[Dict]:
+        """Every item of a list API, page by page (lists show the newest first)"""
+        items: List[Dict] = []
+        seen = set()
+        for url in _page_urls(list_url):
+            try:
+                response = requests.get(url, headers=self.auth_headers, cookies=self.cookies, timeout=timeout)
+                response.raise_for_status()
+                page_items = _list_items(response.json())
+            except (requests.RequestException, ValueError) as e:
+                print(f"Could not list {kind} entities for stale cleanup: {e}")
+                break
+            ids = [_first(item, _ID_KEYS) for item in page_items]
+            new = [item for item, entity_id in zip(page_items, ids) if entity_id is None or entity_id not in seen]
+            # An API that ignores the paging parameters returns the same page again
+            if not new:
+                break
+            seen.update(i for i in ids if i is not None)
+            items.extend(new)
+            if len(page_items) < STALE_PAGE_SIZE:
+                break
+        return items
+
+    # Hand-over between xdist workers and the controller
+    def api_state(self) -> Dict[str, Dict[str, str]]:
+        """API URLs and auth learned from the traffic (JSON-serializable)"""
+        return {"auth_headers": dict(self.auth_headers), "cookies": dict(self.cookies),
+                "collection_urls": dict(self.collection_urls), "list_urls": dict(self.list_urls)}
+
+    def merge_api_state(self, state: Dict[str, Dict[str, str]]) -> None:
+        """Adopt what another registry learned, keeping what this one already knows"""
+        for name in ("auth_headers", "cookies", "collection_urls", "list_urls"):
+            known = getattr(self, name)
+            for key, value in (state.get(name) or {}).items():
+                known.setdefault(key, value)
+
+    def cleanup(self, max_workers: int = 8, stale_days: Optional[float] = None,
+                ui_fallback: bool = True) -> Dict[str, Any]:
+        """Delete every registered entity, plus stale leftovers when stale_days is set
+
+        Args:
+            max_workers: Number of concurrent API delete requests
+            stale_days: Purge test-named entities older than this many days (None disables)
+            ui_fallback: Whether to delete what the API could not through the UI
+
+        Returns:
+            Dict: Counts of deleted, stale-purged and failed entities and the duration
+        """
+        start = time.perf_counter()
+        pending = self.pending()
+        foreign = [e for e in pending if e.origin and e.origin != APP_ORIGIN]
+        pending = [e for e in pending if e not in foreign]
+        if foreign:
+            print(f"\nSkipping cleanup of {len(foreign)} entities created outside {APP_ORIGIN} "
+                  f"({', '.join(sorted({e.origin for e in foreign}))})")
+        stale = self.find_stale(stale_days) if stale_days is not None else []
+        if not pending and not stale:
+            return {"deleted": 0, "stale": 0, "skipped": len(foreign), "failed": [], "duration_ms": 0.0}
+
+        print(f"\nCleaning up {len(pending)} created and {len(stale)} stale entities...")
+        remaining = self.delete_via_api(pending + stale, max_workers=max_workers)
+        if remaining and ui_fallback:
+            remaining = self.delete_via_ui(remaining)
+
+        summary = {
+            "deleted": sum(1 for e in pending if e.deleted),
+            "stale": sum(1 for e in stale if e.deleted),
+            "skipped": len(foreign),
+            "failed": [{"kind": e.kind, "name": e.name, "id": e.entity_id, "error": e.error}
+                       for e in remaining],
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+        print(f"Cleanup finished: {summary['deleted']} deleted, {summary['stale']} stale purged, "
+              f"{len(summary['failed'])} failed in {summary['duration_ms']}ms")
+        for failure in summary["failed"]:
+            print(f"  - could not delete {failure['kind']} '{failure['name'] or failure['id']}': {failure['error']}")
+        return summary
+
+
+# Session-wide registry used by fixtures, page objects and tests
+cleanup_registry = CleanupRegistry()
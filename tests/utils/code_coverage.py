@@ -0,0 +1,273 @@
+"""
+JavaScript and CSS coverage per route and per bundle.
+
+The Python Playwright API has no page.coverage (it exists only in the Node API),
+so the collector drives the same Chromium instrumentation directly through a CDP
+session: Profiler.startPreciseCoverage for JS block coverage and
+CSS.startRuleUsageTracking for stylesheet rules. Coverage is taken as a delta
+whenever the page leaves a route (full navigation or client-side route change),
+so each route is credited with the code that ran while it was shown.
+
+Each test's coverage is saved to test_reports/coverage/<run_id>/<test>.json; at
+the end of the session they are merged (used ranges are unioned, so code used by
+any test counts as used) into test_reports/coverage_<run_id>.json and a sorted
+report of unused bytes per bundle and per route. Sizes are in characters of the
+served (decoded) source, which equals bytes for minified ASCII bundles.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.sync_api import Page, Request
+
+from tests.utils.result_log import run_id
+from tests.utils.web_vitals import route_name
+
+Ranges = List[Tuple[int, int]]
+
+
+def merge_ranges(ranges: Ranges) -> Ranges:
+    """Union of [start, end) ranges as a sorted list of disjoint ranges"""
+    merged: Ranges = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def ranges_length(ranges: Ranges) -> int:
+    return sum(end - start for start, end in ranges)
+
+
+def js_used_ranges(functions: List[Dict[str, Any]], length: int) -> Ranges:
+    """Executed ranges of a script from V8 block coverage
+
+    V8 reports nested ranges (function, then its blocks) where an inner range overrides
+    the count of the enclosing one, so applying them outermost first leaves each
+    character with the count of its innermost range.
+    """
+    ranges = sorted(((r["startOffset"], r["endOffset"], r["count"]) for f in functions for r in f["ranges"]),
+                    key=lambda r: (r[0], -r[1]))
+    executed = bytearray(length)
+    for start, end, count in ranges:
+        end = min(end, length)
+        if start < end:
+            executed[start:end] = (b"\x01" if count else b"\x00") * (end - start)
+    return [match.span() for match in re.finditer(b"\x01+", bytes(executed))]
+
+
+def _bundle_name(url: str) -> str:
+    return url.split("?", 1)[0].split("#", 1)[0]
+
+
+class CoverageCollector:
+    """Page-scoped JS/CSS coverage through the page's CDP session (Chromium only)"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._scripts: Dict[str, Tuple[str, int]] = {}
+        self._sheets: Dict[str, Tuple[str, int]] = {}
+        # (kind, route, bundle) -> {"total": length, "used": ranges}
+        self.usage: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._route: Optional[str] = None
+
+        try:
+            self._session = page.context.new_cdp_session(page)
+        except Exception as e:
+            raise RuntimeError(f"Coverage needs a Chromium CDP session: {str(e)}") from e
+        self._session.on("Debugger.scriptParsed", self._on_script_parsed)
+        self._session.on("CSS.styleSheetAdded", self._on_style_sheet_added)
+        self._session.on("CSS.styleSheetRemoved", lambda params: self._sheets.pop(params["styleSheetId"], None))
+        self._session.send("Debugger.enable")
+        # Coverage only needs script metadata; never stop on `debugger;` statements
+        self._session.send("Debugger.setSkipAllPauses", {"skip": True})
+        self._session.send("Profiler.enable")
+        self._session.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True})
+        self._session.send("DOM.enable")
+        self._session.send("CSS.enable")
+        self._session.send("CSS.startRuleUsageTracking")
+
+        page.on("request", self._on_request)
+        page.on("framenavigated", self._on_frame_navigated)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "CoverageCollector":
+        """Return the collector attached to the page, starting coverage on first use
+
+        Start before the first navigation; code that ran earlier is not covered.
+        """
+        collector = getattr(page, "_coverage", None)
+        if collector is None:
+            collector = cls(page)
+            page._coverage = collector
+        return collector
+
+    # Events
+    def _on_script_parsed(self, params: Dict[str, Any]) -> None:
+        if params.get("url", "").startswith(("http://", "https://")):
+            self._scripts[params["scriptId"]] = (_bundle_name(params["url"]), params.get("length", 0))
+
+    def _on_style_sheet_added(self, params: Dict[str, Any]) -> None:
+        header = params["header"]
+        url = header.get("sourceURL") or ""
+        if header.get("isInline") or not url:
+            url = f"{_bundle_name(url or self.page.url)} (inline)"
+        self._sheets[header["styleSheetId"]] = (_bundle_name(url), int(header.get("length", 0)))
+
+    def _on_request(self, request: Request) -> None:
+        # Credit the route being left before its document (and its scripts) goes away
+        if request.is_navigation_request() and request.frame == self.page.main_frame and self._route:
+            self.take()
+
+    def _on_frame_navigated(self, frame) -> None:
+        if frame != self.page.main_frame:
+            return
+        route = route_name(frame.url)
+        if route != self._route:
+            if self._route:
+                self.take()
+            self._route = route
+
+    # Collection
+    def _add(self, kind: str, bundle: str, total: int, used: Ranges) -> None:
+        entry = self.usage.setdefault((kind, self._route or "?", bundle), {"total": total, "used": []})
+        entry["total"] = max(entry["total"], total)
+        entry["used"] = merge_ranges(entry["used"] + used)
+
+    def take(self) -> None:
+        """Credit the coverage since the last take to the current route"""
+        try:
+            js = self._session.send("Profiler.takePreciseCoverage")
+            css = self._session.send("CSS.takeCoverageDelta")
+        except Exception as e:
+            # The page may be closing
+            print(f"Could not take coverage for {self._route}: {str(e)}")
+            return
+
+        for script in js.get("result", []):
+            bundle, length = self._scripts.get(script["scriptId"], (None, 0))
+            if bundle and length:
+                self._add("js", bundle, length, js_used_ranges(script["functions"], length))
+
+        sheet_ranges: Dict[str, Ranges] = {}
+        for rule in css.get("coverage", []):
+            if rule.get("used"):
+                sheet_ranges.setdefault(rule["styleSheetId"], []).append(
+                    (int(rule["startOffset"]), int(rule["endOffset"])))
+        for sheet_id, (bundle, length) in self._sheets.items():
+            if length:
+                self._add("css", bundle, length, sheet_ranges.get(sheet_id, []))
+
+    def stop(self) -> None:
+        """Take the final delta and stop the instrumentation"""
+        if self.page.is_closed():
+            return
+        self.take()
+        try:
+            self._session.send("Profiler.stopPreciseCoverage")
+            self._session.send("CSS.stopRuleUsageTracking")
+            self._session.detach()
+        except Exception:
+            pass
+
+    def save(self, test_name: str, report_dir: str = "test_reports/coverage") -> Optional[Path]:
+        """Write this test's coverage to <report_dir>/<run_id>/<test>.json
+
+        Returns:
+            Path to the written file, or None if nothing was covered
+        """
+        self.stop()
+        if not self.usage:
+            return None
+        output_dir = Path(report_dir) / run_id()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', test_name)}.json"
+        entries = [{"kind": kind, "route": route, "bundle": bundle, "total": entry["total"],
+                    "used": entry["used"]} for (kind, route, bundle), entry in self.usage.items()]
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump({"test": test_name, "entries": entries}, f)
+        return filepath
+
+
+def merge_coverage(directory: Path) -> Dict[Tuple[str, str, str], Dict[str, Any]]:
+    """Union the saved coverage of all tests of a run"""
+    usage: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for path in sorted(directory.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            for e in json.load(f)["entries"]:
+                entry = usage.setdefault((e["kind"], e["route"], e["bundle"]), {"total": 0, "used": []})
+                entry["total"] = max(entry["total"], e["total"])
+                entry["used"] = merge_ranges(entry["used"] + [tuple(r) for r in e["used"]])
+    return usage
+
+
+def build_report(usage: Dict[Tuple[str, str, str], Dict[str, Any]]) -> Dict[str, Any]:
+    """Used vs unused bytes per bundle (over all routes) and per route, largest waste first"""
+    def row(total: int, used: int, **fields) -> Dict[str, Any]:
+        return dict(fields, total=total, used=used, unused=total - used,
+                    unused_pct=round((total - used) / total * 100, 1) if total else 0.0)
+
+    bundles: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    routes = []
+    for (kind, route, bundle), entry in usage.items():
+        routes.append(row(entry["total"], ranges_length(entry["used"]), kind=kind, route=route, bundle=bundle))
+        merged = bundles.setdefault((kind, bundle), {"total": 0, "used": [], "routes": set()})
+        merged["total"] = max(merged["total"], entry["total"])
+        merged["used"] = merge_ranges(merged["used"] + entry["used"])
+        merged["routes"].add(route)
+
+    by_bundle = [row(m["total"], ranges_length(m["used"]), kind=kind, bundle=bundle, routes=sorted(m["routes"]))
+                 for (kind, bundle), m in bundles.items()]
+    by_route: Dict[str, Dict[str, Any]] = {}
+    for r in routes:
+        totals = by_route.setdefault(r["route"], {"total": 0, "used": 0, "bundles": []})
+        totals["total"] += r["total"]
+        totals["used"] += r["used"]
+        totals["bundles"].append(r)
+    return {
+        "run_id": run_id(),
+        "bundles": sorted(by_bundle, key=lambda r: r["unused"], reverse=True),
+        "routes": sorted(
+            (row(t["total"], t["used"], route=route,
+                 bundles=sorted(t["bundles"], key=lambda r: r["unused"], reverse=True))
+             for route, t in by_route.items()),
+            key=lambda r: r["unused"], reverse=True),
+    }
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f}KB"
+
+
+def format_report(report: Dict[str, Any], limit: int = 15) -> str:
+    lines = ["Unused code per bundle (all routes):"]
+    for r in report["bundles"][:limit]:
+        lines.append(f"  {r['kind']:<3} {_kb(r['unused']):>9} unused of {_kb(r['total']):>9} "
+                     f"({r['unused_pct']:.0f}%)  {r['bundle']}  [{', '.join(r['routes'])}]")
+    lines.append("Unused code per route:")
+    for r in report["routes"]:
+        worst = r["bundles"][0]
+        lines.append(f"  {r['route']:<14} {_kb(r['unused']):>9} unused of {_kb(r['total']):>9} "
+                     f"({r['unused_pct']:.0f}%)  worst: {worst['bundle']} ({_kb(worst['unused'])})")
+    return "\n".join(lines)
+
+
+def write_coverage_report(report_dir: str = "test_reports") -> Optional[Path]:
+    """Merge the coverage saved by all tests of this run and write the sorted report
+
+    Returns:
+        Path to the JSON report, or None if no coverage was collected
+    """
+    usage = merge_coverage(Path(report_dir) / "coverage" / run_id())
+    if not usage:
+        return None
+    report = build_report(usage)
+    filepath = Path(report_dir) / f"coverage_{run_id()}.json"
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print("\n" + format_report(report))
+    print(f"Coverage report saved to: {filepath}")
+    return filepath
@@ -1,42 +1,25 @@
-import imaplib
-import email
 import re
-import time
-from datetime import datetime, timezone
-from typing import Iterator, Optional
 
-# Regex pattern to match 6-digit OTP codes
-OTP_REGEX = re.compile(r"\b(\d{6})\b")  # adjust if OTP is not 6 digits
+from tests.utils.imap_client import OTP_REGEX
+from tests.utils.otp_mailbox import get_otp_multiplexer
 
-def _iter_message_bodies(msg: email.message.Message) -> Iterator[str]:
-    """Iterate through all text/plain and text/html parts of an email message.
-    
-    Args:
-        msg: Email message object
-        
-    Yields:
-        str: Decoded content of each text part
-    """
-    if msg.is_multipart():
-        for part in msg.walk():
-            if part.get_content_type() in ("text/plain", "text/html"):
-                payload = part.get_payload(decode=True)
-                if payload:
-                    yield payload.decode(errors="ignore")
-    else:
-        payload = msg.get_payload(decode=True)
-        if payload:
-            yield payload.decode(errors="ignore")
 
-def get_latest_otp_imap(imap_host: str, 
-                       username: str, 
-                       password: str, 
-                       email_to: str, 
+def get_latest_otp_imap(imap_host: str,
+                       username: str,
+                       password: str,
+                       email_to: str,
                        timeout_sec: int = 90,
                        otp_regex: re.Pattern = OTP_REGEX,
-                       subject_filter: str = None) -> str:
+                       subject_filter: str = None,
+                       port: int = None,
+                       use_ssl: bool = True) -> str:
     """Fetch the latest OTP code from an email using IMAP.
-    
+
+    Registers a waiter with the session's mailbox watcher, which holds one IMAP
+    connection in IDLE and dispatches each new email to the waiter for its
+    recipient and subject. The OTP is returned as soon as the email is delivered,
+    and concurrent lookups do not race each other on UNSEEN.
+
     Args:
         imap_host: IMAP server hostname (e.g., 'imap.gmail.com')
         username: Email account username
@@ -45,75 +28,17 @@ def get_latest_otp_imap(imap_host: str,
         timeout_sec: Maximum time to wait for OTP email (in seconds)
         otp_regex: Regex pattern to match OTP in email body
         subject_filter: Optional subject filter to match emails against
-        
+        port: IMAP server port (default: 993 with SSL, 143 without)
+        use_ssl: Whether to connect over SSL
+
     Returns:
         str: The OTP code found in the email
-        
+
     Raises:
         TimeoutError: If no OTP is found within the timeout period
-        imaplib.IMAP4.error: If there's an error connecting to the IMAP server
+        ConnectionError: If the IMAP connection keeps failing after the watcher's reconnects
+        imaplib.IMAP4.error: If the server rejects the credentials or a command
     """
-    deadline = time.time() + timeout_sec
-    since = datetime.now(timezone.utc).strftime("%d-%b-%Y")  # IMAP date format
-    print(f"Searching for OTP in emails to {email_to}" + 
-          (f" with subject containing: {subject_filter}" if subject_filter else ""))
-
-    while time.time() < deadline:
-        try:
-            with imaplib.IMAP4_SSL(imap_host) as imap_conn:
-                imap_conn.login(username, password)
-                imap_conn.select("INBOX")
-                
-                # Build search criteria
-                search_criteria = ['UNSEEN', 'SINCE', since, 'TO', f'"{email_to}"']
-                if subject_filter:
-                    search_criteria.extend(['SUBJECT', f'"{subject_filter}"'])
-                
-                # Search for matching messages
-                status, ids = imap_conn.search(None, *search_criteria)
-                print(f"IMAP search status: {status}, found {len(ids[0].split()) if ids[0] else 0} messages")
-                
-                if status != "OK" or not ids[0]:
-                    time.sleep(2)
-                    continue
-
-                # Process messages from newest to oldest
-                for msg_id in reversed(ids[0].split()):
-                    try:
-                        _, data = imap_conn.fetch(msg_id, "(RFC822)")
-                        if not data or not data[0]:
-                            continue
-                            
-                        msg = email.message_from_bytes(data[0][1])
-                        msg_subject = msg.get("Subject", "")
-                        msg_to = ",".join(msg.get_all("To", []) or [])
-                        print(f"Processing email - Subject: {msg_subject}, To: {msg_to}")
-
-                        # Search for OTP in the email body
-                        for body in _iter_message_bodies(msg):
-                            # Print first 100 chars of the body for debugging
-                            print(f"Email body preview: {body[:200]}...")
-                            match = otp_regex.search(body)
-                            if match:
-                                otp = match.group(1)
-                                print(f"Found OTP: {otp}")
-                                # Mark message as read
-                                imap_conn.store(msg_id, "+FLAGS", "\\Seen")
-                                return otp
-                    except Exception as e:
-                        print(f"Error processing email: {str(e)}")
-                        continue
-                        
-        except Exception as e:
-            print(f"IMAP error: {str(e)}")
-            # If there's an error, wait a bit before retrying
-            time.sleep(2)
-            continue
-            
-        time.sleep(3)  # Wait before next check
-    
-    # If we get here, we didn't find an OTP in time
-    error_msg = f"No OTP found in emails to {email_to} within {timeout_sec} seconds"
-    if subject_filter:
-        error_msg += f" with subject containing: {subject_filter}"
-    raise TimeoutError(error_msg)
+    multiplexer = get_otp_multiplexer(imap_host, username, password, port=port, use_ssl=use_ssl)
+    return multiplexer.wait_for_otp(email_to, timeout_sec=timeout_sec,
+                                    subject_filter=subject_filter, otp_regex=otp_regex)
@@ -0,0 +1,321 @@
+"""
+Long-lived IMAP mailbox client for OTP retrieval.
+
+One authenticated connection is kept open and reused for every command; it is
+only reopened when a command fails because the server dropped it. Waiting for a
+message uses IMAP IDLE, so the server pushes new mail instead of the client
+reconnecting and polling. Candidate messages are
+checked on their headers first; only matching ones get their text fetched, with
+BODY.PEEK so nothing is marked read until an OTP has been taken from it.
+"""
+import email
+import email.message
+import imaplib
+import re
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Pattern, Tuple, TypeVar
+
+# Regex pattern to match 6-digit OTP codes
+OTP_REGEX = re.compile(r"\b(\d{6})\b")
+
+# Header fields fetched to decide whether a message is a candidate (plus the MIME
+# fields needed to decode its text afterwards)
+HEADER_FIELDS = "FROM TO SUBJECT DATE MESSAGE-ID MIME-VERSION CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+
+# Longest single IDLE wait; the mailbox is searched again after each one, which
+# bounds the delay if the server ever misses a push
+IDLE_INTERVAL_SEC = 10
+
+_EXISTS_RE = re.compile(rb"^\* \d+ (EXISTS|RECENT)")
+_UID_RE = re.compile(rb"UID (\d+)")
+
+T = TypeVar("T")
+
+
+def iter_message_bodies(msg: email.message.Message) -> Iterator[str]:
+    """Iterate through all text/plain and text/html parts of an email message.
+
+    Args:
+        msg: Email message object
+
+    Yields:
+        str: Decoded content of each text part
+    """
+    if msg.is_multipart():
+        for part in msg.walk():
+            if part.get_content_type() in ("text/plain", "text/html"):
+                payload = part.get_payload(decode=True)
+                if payload:
+                    yield payload.decode(errors="ignore")
+    else:
+        payload = msg.get_payload(decode=True)
+        if payload:
+            yield payload.decode(errors="ignore")
+
+
+def quote_string(value: str) -> str:
+    """Quote a value for use in IMAP search criteria"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class MailboxClient:
+    """Persistent, thread-safe IMAP connection to one mailbox"""
+
+    def __init__(self, host: str, username: str, password: str, port: int = None,
+                 use_ssl: bool = True, mailbox: str = "INBOX"):
+        """
+        Args:
+            host: IMAP server hostname (e.g., 'imap.gmail.com')
+            username: Email account username
+            password: Email account password or app password
+            port: Server port (default: 993 with SSL, 143 without)
+            use_ssl: Whether to connect over SSL
+            mailbox: Mailbox to watch
+        """
+        self.host = host
+        self.username = username
+        self.password = password
+        self.port = port or (imaplib.IMAP4_SSL_PORT if use_ssl else imaplib.IMAP4_PORT)
+        self.use_ssl = use_ssl
+        self.mailbox = mailbox
+        self.connections = 0
+        self._conn: Optional[imaplib.IMAP4] = None
+        self._idle_supported = False
+        self._lock = threading.RLock()
+
+    # Connection handling
+    def connect(self) -> imaplib.IMAP4:
+        """Open, authenticate and select the mailbox (replacing any previous connection)"""
+        with self._lock:
+            self.close()
+            conn_class = imaplib.IMAP4_SSL if self.use_ssl else imaplib.IMAP4
+            conn = conn_class(self.host, self.port)
+            conn.login(self.username, self.password)
+            conn.select(self.mailbox)
+            self._idle_supported = "IDLE" in conn.capabilities
+            self._conn = conn
+            self.connections += 1
+            print(f"IMAP connected to {self.host}:{self.port} as {self.username} "
+                  f"(IDLE {'supported' if self._idle_supported else 'not supported'})")
+            return conn
+
+    def _connection(self) -> imaplib.IMAP4:
+        """Return the open connection, connecting on first use"""
+        return self._conn if self._conn is not None else self.connect()
+
+    def _run(self, command: Callable[[imaplib.IMAP4], T]) -> T:
+        """Run a command on the connection, reconnecting and retrying once if the server dropped it"""
+        with self._lock:
+            try:
+                return command(self._connection())
+            except (imaplib.IMAP4.abort, OSError) as e:
+                print(f"IMAP connection lost ({e}), reconnecting")
+                return command(self.connect())
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._conn.logout()
+            except Exception:
+                pass
+            self._conn = None
+
+    def __enter__(self):
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Commands
+    def search(self, *criteria: str) -> List[bytes]:
+        """Return the UIDs matching the search criteria, oldest first"""
+        status, data = self._run(lambda conn: conn.uid("SEARCH", None, *criteria))
+        if status != "OK" or not data or not data[0]:
+            return []
+        return data[0].split()
+
+    def _fetch(self, uids: List[bytes], section: str) -> Dict[bytes, bytes]:
+        """Fetch one section for several UIDs in a single round trip"""
+        status, data = self._run(lambda conn: conn.uid("FETCH", b",".join(uids).decode(), f"({section})"))
+        if status != "OK":
+            return {}
+        result, pending_payload = {}, None
+        for item in data or []:
+            if isinstance(item, tuple):
+                match = _UID_RE.search(item[0])
+                if match:
+                    result[match.group(1)] = item[1]
+                else:
+                    # Some servers send the UID after the literal
+                    pending_payload = item[1]
+            elif isinstance(item, bytes) and pending_payload is not None:
+                match = _UID_RE.search(item)
+                if match:
+                    result[match.group(1)] = pending_payload
+                pending_payload = None
+        return result
+
+    def fetch_headers(self, uids: List[bytes]) -> Dict[bytes, email.message.Message]:
+        """Fetch only the header fields of the messages, without marking them read"""
+        if not uids:
+            return {}
+        raw = self._fetch(uids, f"BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})]")
+        return {uid: email.message_from_bytes(headers) for uid, headers in raw.items()}
+
+    def fetch_texts(self, headers: Dict[bytes, email.message.Message]) -> Dict[bytes, email.message.Message]:
+        """Fetch the text of several messages (without marking them read) joined to their headers"""
+        if not headers:
+            return {}
+        raw = self._fetch(list(headers), "BODY.PEEK[TEXT]")
+        return {uid: email.message_from_bytes(message_headers.as_bytes() + raw.get(uid, b""))
+                for uid, message_headers in headers.items()}
+
+    def fetch_text(self, uid: bytes, headers: email.message.Message) -> email.message.Message:
+        """Fetch the text of a message (without marking it read) and join it to its headers"""
+        return self.fetch_texts({uid: headers})[uid]
+
+    def mark_seen(self, *uids: bytes) -> None:
+        """Flag the messages as read in one STORE"""
+        if not uids:
+            return
+        self._run(lambda conn: conn.uid("STORE", b",".join(uids).decode(), "+FLAGS", "(\\Seen)"))
+
+    def idle(self, timeout: float) -> bool:
+        """Wait until the server reports new mail or the timeout expires
+
+        Falls back to sleeping when the server does not support IDLE. A dropped
+        connection is closed and reported as a change, so the caller searches
+        again and the search reconnects.
+
+        Returns:
+            bool: True if the server reported a mailbox change
+        """
+        with self._lock:
+            try:
+                return self._idle(self._connection(), timeout)
+            except (imaplib.IMAP4.abort, OSError) as e:
+                print(f"IMAP connection lost during IDLE ({e})")
+                self.close()
+                return True
+
+    def _idle(self, conn: imaplib.IMAP4, timeout: float) -> bool:
+        # Mail that arrived since the last search was announced in the responses to
+        # the commands that followed it
+        conn.untagged_responses.pop("RECENT", None)
+        if conn.untagged_responses.pop("EXISTS", None):
+            return True
+        if not self._idle_supported:
+            time.sleep(min(timeout, 1.0))
+            return False
+
+        # imaplib has no IDLE command before Python 3.14, so speak it directly
+        tag = conn._new_tag()
+        conn.send(tag + b" IDLE\r\n")
+        line = conn.readline()
+        if not line.startswith(b"+"):
+            conn.tagged_commands.pop(tag, None)
+            raise imaplib.IMAP4.error(f"IDLE rejected: {line!r}")
+
+        changed = False
+        try:
+            deadline = time.time() + timeout
+            while not changed and self._readable(deadline - time.time()):
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                changed = bool(_EXISTS_RE.match(line))
+        finally:
+            conn.send(b"DONE\r\n")
+            while True:
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed while ending IDLE")
+                if line.startswith(tag):
+                    break
+            conn.tagged_commands.pop(tag, None)
+        return changed
+
+    def _readable(self, timeout: float) -> bool:
+        if timeout <= 0:
+            return False
+        sock = self._conn.sock
+        if hasattr(sock, "pending") and sock.pending():
+            return True
+        readable, _, _ = select.select([sock], [], [], timeout)
+        return bool(readable)
+
+    # OTP lookup
+    def find_otp(self, email_to: str, subject_filter: str = None, otp_regex: Pattern = OTP_REGEX,
+                 skip: set = None) -> Tuple[Optional[str], List[bytes]]:
+        """Look once for an unread message to email_to containing an OTP
+
+        Args:
+            email_to: Recipient address the message must be sent to
+            subject_filter: Optional text the subject must contain
+            otp_regex: Regex whose first group is the OTP
+            skip: UIDs already checked (not re-fetched)
+
+        Returns:
+            Tuple of (otp or None, UIDs checked)
+        """
+        since = datetime.now(timezone.utc).strftime("%d-%b-%Y")
+        criteria = ["UNSEEN", "SINCE", since, "TO", quote_string(email_to)]
+        if subject_filter:
+            criteria += ["SUBJECT", quote_string(subject_filter)]
+        uids = [uid for uid in self.search(*criteria) if uid not in (skip or set())]
+        if not uids:
+            return None, []
+
+        headers = self.fetch_headers(uids)
+        # Newest first
+        for uid in reversed(uids):
+            message_headers = headers.get(uid)
+            if message_headers is None:
+                continue
+            recipients = ",".join(message_headers.get_all("To", []) or [])
+            subject = message_headers.get("Subject", "")
+            if email_to.lower() not in recipients.lower():
+                continue
+            if subject_filter and subject_filter.lower() not in subject.lower():
+                continue
+            print(f"Processing email - Subject: {subject}, To: {recipients}")
+            for body in iter_message_bodies(self.fetch_text(uid, message_headers)):
+                match = otp_regex.search(body)
+                if match:
+                    self.mark_seen(uid)
+                    return match.group(1), uids
+        return None, uids
+
+    def wait_for_otp(self, email_to: str, timeout_sec: float = 90, subject_filter: str = None,
+                     otp_regex: Pattern = OTP_REGEX) -> str:
+        """Wait for an OTP email to email_to, woken by IDLE when new mail arrives
+
+        Raises:
+            TimeoutError: If no OTP arrives within the timeout
+        """
+        deadline = time.time() + timeout_sec
+        checked = set()
+        print(f"Waiting for OTP in emails to {email_to}" +
+              (f" with subject containing: {subject_filter}" if subject_filter else ""))
+        while True:
+            otp, uids = self.find_otp(email_to, subject_filter, otp_regex, skip=checked)
+            if otp:
+                print(f"Found OTP: {otp}")
+                return otp
+            checked.update(uids)
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self.idle(min(remaining, IDLE_INTERVAL_SEC))
+
+        error_msg = f"No OTP found in emails to {email_to} within {timeout_sec} seconds"
+        if subject_filter:
+            error_msg += f" with subject containing: {subject_filter}"
+        raise TimeoutError(error_msg)
+
@@ -0,0 +1,305 @@
+"""
+In-memory generator for invoice-like upload documents.
+
+Produces PNG, JPEG and PDF invoices (and invalid-type files) as Playwright file
+payloads ({'name', 'mimeType', 'buffer'}) that go straight to set_input_files, so
+upload tests need no committed binaries and no disk writes.
+
+The invoice content (vendor, number, line items) is derived from a seed: the same
+seed renders the same invoice in every format, a different seed a different one.
+Documents can be padded to an exact target size.
+
+PNG and PDF use only the standard library; JPEG needs Pillow (requirements-test.txt).
+"""
+import io
+import random
+import struct
+import zlib
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Union
+
+KB = 1024
+MB = 1024 * 1024
+
+MIME_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "pdf": "application/pdf",
+}
+
+# Payloads for file types the app rejects ("File type not supported")
+INVALID_TYPES = {
+    "webp": ("image/webp", b"RIFF\x00\x00\x00\x00WEBPVP8 "),
+    "gif": ("image/gif", b"GIF89a"),
+    "txt": ("text/plain", b"INVOICE\n"),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", b"PK\x03\x04"),
+    "exe": ("application/octet-stream", b"MZ\x90\x00"),
+}
+
+_VENDORS = ["Acme Supplies", "Northwind Traders", "Globex Corp", "Initech", "Umbrella Services",
+            "Stark Logistics", "Wayne Office", "Hooli Cloud", "Vandelay Imports", "Soylent Foods"]
+_ITEMS = ["Consulting hours", "Office chairs", "Printer paper", "Cloud hosting", "Software license",
+          "Travel expenses", "Catering", "Maintenance", "Shipping", "Training session"]
+
+Seed = Union[int, str]
+
+
+def _invoice_data(seed: Seed) -> Dict:
+    """Build the invoice content shared by all formats for a seed"""
+    rng = random.Random(f"invoice:{seed}")
+    items = []
+    for _ in range(rng.randint(3, 8)):
+        quantity = rng.randint(1, 20)
+        price = round(rng.uniform(5, 500), 2)
+        items.append((rng.choice(_ITEMS), quantity, price))
+    issued = date(2024, 1, 1) + timedelta(days=rng.randint(0, 600))
+    return {
+        "vendor": rng.choice(_VENDORS),
+        "number": f"INV-{rng.randint(10000, 99999)}",
+        "date": issued.isoformat(),
+        "items": items,
+        "total": round(sum(q * p for _, q, p in items), 2),
+    }
+
+
+def _fit(build: Callable[[int], bytes], size: int = None) -> bytes:
+    """Call build(padding) with the padding that makes the output exactly size bytes
+
+    Documents whose natural size already exceeds the target are returned unpadded.
+    """
+    data = build(0)
+    if not size or len(data) >= size:
+        return data
+    padding = size - len(data)
+    # Padding containers add a little overhead of their own; converge on the exact size
+    for _ in range(4):
+        data = build(padding)
+        if len(data) == size:
+            break
+        padding += size - len(data)
+    return data
+
+
+# ===== Raster rendering (PNG/JPEG) =====
+
+def _render_raster(invoice: Dict, width: int, height: int) -> bytearray:
+    """Draw an invoice layout (header band, text lines, item table) as RGB pixels"""
+    stride = width * 3
+    pixels = bytearray(b"\xff" * (stride * height))
+
+    def rect(x0, y0, x1, y1, color):
+        x0, x1 = max(0, min(width, int(x0))), max(0, min(width, int(x1)))
+        y0, y1 = max(0, min(height, int(y0))), max(0, min(height, int(y1)))
+        if x1 <= x0:
+            return
+        row = bytes(color) * (x1 - x0)
+        for y in range(y0, y1):
+            start = y * stride + x0 * 3
+            pixels[start:start + len(row)] = row
+
+    def text(x, y, value, scale=1.0, color=(40, 40, 40)):
+        # Text is drawn as word-shaped bars; lengths follow the real strings
+        char_width, line_height = 7 * scale, 10 * scale
+        for word in str(value).split():
+            rect(x, y, x + len(word) * char_width, y + line_height, color)
+            x += (len(word) + 1) * char_width
+
+    margin = width * 0.06
+    unit = height / 1100
+    rect(0, 0, width, 90 * unit, (17, 161, 147))
+    text(margin, 30 * unit, "INVOICE", scale=2.5 * unit, color=(255, 255, 255))
+    text(margin, 120 * unit, invoice["vendor"], scale=1.6 * unit)
+    text(width * 0.6, 120 * unit, invoice["number"], scale=1.4 * unit)
+    text(width * 0.6, 150 * unit, invoice["date"], scale=1.2 * unit)
+
+    top = 230 * unit
+    row_height = 36 * unit
+    rect(margin, top, width - margin, top + row_height, (230, 236, 240))
+    for index, (name, quantity, price) in enumerate(invoice["items"], start=1):
+        y = top + index * row_height
+        rect(margin, y, width - margin, y + 1, (200, 200, 200))
+        text(margin + 10, y + 12 * unit, name, scale=unit)
+        text(width * 0.6, y + 12 * unit, str(quantity), scale=unit)
+        text(width * 0.75, y + 12 * unit, f"{quantity * price:.2f}", scale=unit)
+
+    y = top + (len(invoice["items"]) + 1.5) * row_height
+    rect(width * 0.55, y, width - margin, y + row_height, (17, 161, 147))
+    text(width * 0.58, y + 10 * unit, f"TOTAL {invoice['total']:.2f}", scale=1.3 * unit, color=(255, 255, 255))
+    return pixels
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def _png(pixels: bytearray, width: int, height: int, padding: bytes) -> bytes:
+    stride = width * 3
+    raw = b"".join(b"\x00" + bytes(pixels[y * stride:(y + 1) * stride]) for y in range(height))
+    chunks = [
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        _png_chunk(b"IDAT", zlib.compress(raw, 6)),
+    ]
+    if padding:
+        # Private ancillary chunk: decoders skip it
+        chunks.append(_png_chunk(b"pdAd", padding))
+    chunks.append(_png_chunk(b"IEND", b""))
+    return b"\x89PNG\r\n\x1a\n" + b"".join(chunks)
+
+
+def _jpeg(pixels: bytearray, width: int, height: int) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise RuntimeError("JPEG documents need Pillow: pip install -r requirements-test.txt") from e
+    output = io.BytesIO()
+    Image.frombytes("RGB", (width, height), bytes(pixels)).save(output, "JPEG", quality=85)
+    return output.getvalue()
+
+
+def _pad_jpeg(data: bytes, padding: bytes) -> bytes:
+    """Insert padding as JPEG comment (COM) segments right after the SOI marker"""
+    segments = []
+    for start in range(0, len(padding), 65533):
+        chunk = padding[start:start + 65533]
+        segments.append(b"\xff\xfe" + struct.pack(">H", len(chunk) + 2) + chunk)
+    return data[:2] + b"".join(segments) + data[2:]
+
+
+# ===== PDF rendering =====
+
+def _pdf_escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _pdf(invoice: Dict, width: int, height: int, pages: int, padding: bytes) -> bytes:
+    """Write a minimal PDF with one text page per invoice page and an optional padding stream"""
+    lines = [("INVOICE", 28), (invoice["vendor"], 16), (f"Invoice number: {invoice['number']}", 12),
+             (f"Date: {invoice['date']}", 12), ("", 12)]
+    lines += [(f"{name}    x{quantity}    {quantity * price:.2f}", 11) for name, quantity, price in invoice["items"]]
+    lines += [("", 12), (f"TOTAL: {invoice['total']:.2f}", 14)]
+
+    page_count = max(1, pages)
+    font_id = 3 + 2 * page_count
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            " ".join(f"{3 + 2 * i} 0 R" for i in range(page_count)), page_count)).encode(),
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for page_index in range(page_count):
+        y = height - 60
+        commands = ["BT"]
+        for value, size in lines + [(f"Page {page_index + 1} of {page_count}", 9)]:
+            commands.append(f"/F1 {size} Tf 1 0 0 1 50 {y} Tm ({_pdf_escape(value)}) Tj")
+            y -= size + 10
+        commands.append("ET")
+        content = "\n".join(commands).encode("latin-1", "replace")
+        page_id, content_id = 3 + 2 * page_index, 4 + 2 * page_index
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width} {height}] "
+                            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>").encode()
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+    if padding:
+        # Unreferenced binary stream: readers ignore it
+        objects[font_id + 1] = b"<< /Length %d >>\nstream\n" % len(padding) + padding + b"\nendstream"
+
+    output = io.BytesIO()
+    output.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = output.tell()
+        output.write(b"%d 0 obj\n" % object_id + objects[object_id] + b"\nendobj\n")
+    xref = output.tell()
+    size = max(objects) + 1
+    output.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+    for object_id in range(1, size):
+        output.write(b"%010d 00000 n \n" % offsets[object_id] if object_id in offsets else b"0000000000 65535 f \n")
+    output.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref))
+    return output.getvalue()
+
+
+# ===== Public API =====
+
+def invoice_document(name: str = None, file_type: str = "png", size: int = None,
+                     width: int = 850, height: int = 1100, pages: int = 1, seed: Seed = 0) -> Dict:
+    """Generate an invoice document as an in-memory file payload
+
+    Args:
+        name: File name (defaults to 'invoice_<seed>.<file_type>')
+        file_type: 'png', 'jpg'/'jpeg' or 'pdf'
+        size: Target size in bytes; documents are padded to exactly this size
+              (None keeps the natural size, which is also used if it is larger)
+        width: Image width in pixels (PDF: page width in points)
+        height: Image height in pixels (PDF: page height in points)
+        pages: Number of pages (PDF only)
+        seed: Content seed; equal seeds give the same invoice content in every format
+
+    Returns:
+        Dict: {'name', 'mimeType', 'buffer'} for Locator.set_input_files
+    """
+    file_type = file_type.lower().lstrip(".")
+    if file_type not in MIME_TYPES:
+        raise ValueError(f"Unsupported invoice file type '{file_type}', use one of {sorted(MIME_TYPES)}")
+    name = name or f"invoice_{seed}.{file_type}"
+    invoice = _invoice_data(seed)
+
+    def pad(length: int) -> bytes:
+        # Same seed and size give byte-identical files, whatever the name
+        return random.Random(f"padding:{seed}").randbytes(length)
+
+    if file_type == "pdf":
+        buffer = _fit(lambda n: _pdf(invoice, width, height, pages, pad(n)), size)
+    else:
+        pixels = _render_raster(invoice, width, height)
+        if file_type == "png":
+            buffer = _fit(lambda n: _png(pixels, width, height, pad(n)), size)
+        else:
+            jpeg = _jpeg(pixels, width, height)
+            buffer = _fit(lambda n: _pad_jpeg(jpeg, pad(n)), size)
+
+    return {"name": name, "mimeType": MIME_TYPES[file_type], "buffer": buffer}
+
+
+def invalid_document(name: str = "invoice.webp", size: int = 10 * KB, file_type: str = None) -> Dict:
+    """Generate a file of a type the app does not accept
+
+    Args:
+        name: File name; its extension selects the type unless file_type is given
+        size: Size in bytes
+        file_type: One of INVALID_TYPES (defaults to the name's extension)
+
+    Returns:
+        Dict: {'name', 'mimeType', 'buffer'} for Locator.set_input_files
+    """
+    file_type = (file_type or name.rsplit(".", 1)[-1]).lower()
+    mime_type, header = INVALID_TYPES.get(file_type, ("application/octet-stream", b""))
+    body = random.Random(f"invalid:{name}").randbytes(max(0, size - len(header)))
+    return {"name": name, "mimeType": mime_type, "buffer": header + body}
+
+
+def duplicate(document: Dict, name: str = None) -> Dict:
+    """Copy a document byte for byte, optionally under a different name"""
+    return {"name": name or document["name"], "mimeType": document["mimeType"], "buffer": document["buffer"]}
+
+
+def invoice_documents(count: int, file_type: str = "png", size: int = None,
+                      prefix: str = "invoice", same_content: bool = False, **kwargs) -> List[Dict]:
+    """Generate a batch of uniquely named invoices
+
+    Args:
+        count: Number of documents
+        file_type: 'png', 'jpg'/'jpeg' or 'pdf'
+        size: Target size of each document in bytes
+        prefix: File name prefix ('<prefix>_<n>.<type>')
+        same_content: Render the same invoice in every file instead of one per file
+        **kwargs: Passed to invoice_document (width, height, pages)
+
+    Returns:
+        List[Dict]: File payloads for Locator.set_input_files
+    """
+    extension = "jpg" if file_type == "jpeg" else file_type
+    return [
+        invoice_document(f"{prefix}_{index}.{extension}", file_type, size,
+                         seed=prefix if same_content else f"{prefix}:{index}", **kwargs)
+        for index in range(1, count + 1)
+    ]
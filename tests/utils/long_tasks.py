@@ -0,0 +1,218 @@
+"""
+Main-thread blocking per page-object step.
+
+An init script observes Long Tasks (main-thread tasks over 50ms) and Long
+Animation Frames (frames delayed over 50ms, with the scripts that caused them)
+on every document. LongTaskTracker is a StepHook: around each outermost
+page-object or component step (CostCentersPage.search, TableComponent.next_page,
+InvoicesPage.open_new_invoice_overlay, ...) it collects the entries that
+overlapped the step and attributes their total blocking time (the part of each
+long task beyond 50ms) to it. Steps are aggregated for the whole session and the
+worst offenders are reported at the end.
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Page
+
+from pages.base_page import BasePage, StepHook
+from tests.utils.metrics import record_metric
+from tests.utils.result_log import run_id, worker_id
+
+LONG_TASK_INIT_SCRIPT = r"""
+(() => {
+  if (window !== window.top || window.__longTasks) return;
+  const entries = [];
+  const observers = [];
+  function observe(type, map) {
+    try {
+      const observer = new PerformanceObserver(list => list.getEntries().forEach(e => entries.push(map(e))));
+      observer.observe({ type, buffered: true });
+      observers.push([observer, map]);
+    } catch (e) {
+      // Entry type not supported by this browser
+    }
+  }
+  observe('longtask', e => ({
+    type: 'longtask', start: e.startTime, duration: e.duration,
+    blocking: Math.max(0, e.duration - 50)
+  }));
+  observe('long-animation-frame', e => ({
+    type: 'loaf', start: e.startTime, duration: e.duration, blocking: e.blockingDuration || 0,
+    scripts: (e.scripts || []).map(s => ({
+      source: s.sourceURL, fn: s.sourceFunctionName, invoker: s.invoker, duration: s.duration
+    }))
+  }));
+  const id = `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+  window.__longTasks = {
+    mark: () => ({ id, now: performance.now() }),
+    // Entries that ended after the mark (all of them if the mark was taken in another document),
+    // once pending frames have run and queued observer entries are flushed
+    collect: async mark => {
+      await new Promise(resolve => requestAnimationFrame(() => setTimeout(resolve, 0)));
+      observers.forEach(([observer, map]) => observer.takeRecords().forEach(e => entries.push(map(e))));
+      const since = mark && mark.id === id ? mark.now : 0;
+      return { id, entries: entries.filter(e => e.start + e.duration >= since) };
+    }
+  };
+})();
+"""
+
+
+class StepBlocking:
+    """Blocking time of all calls of one step across the session"""
+
+    def __init__(self, step: str):
+        self.step = step
+        self.calls = 0
+        self.total_blocking_ms = 0.0
+        self.max_blocking_ms = 0.0
+        self.long_tasks = 0
+        self.longest_task_ms = 0.0
+        self.worst: Optional[Dict[str, Any]] = None
+
+    def add(self, sample: Dict[str, Any]) -> None:
+        self.calls += 1
+        self.total_blocking_ms += sample["blocking_ms"]
+        self.long_tasks += sample["long_tasks"]
+        self.longest_task_ms = max(self.longest_task_ms, sample["longest_task_ms"])
+        if sample["blocking_ms"] >= self.max_blocking_ms:
+            self.max_blocking_ms = sample["blocking_ms"]
+            self.worst = sample
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "step": self.step,
+            "calls": self.calls,
+            "total_blocking_ms": round(self.total_blocking_ms, 1),
+            "mean_blocking_ms": round(self.total_blocking_ms / self.calls, 1) if self.calls else 0.0,
+            "max_blocking_ms": round(self.max_blocking_ms, 1),
+            "long_tasks": self.long_tasks,
+            "longest_task_ms": round(self.longest_task_ms, 1),
+            "worst": self.worst,
+        }
+
+
+_lock = threading.Lock()
+_steps: Dict[str, StepBlocking] = {}
+
+
+def summarize(sample: Dict[str, Any]) -> None:
+    with _lock:
+        _steps.setdefault(sample["step"], StepBlocking(sample["step"])).add(sample)
+
+
+def worst_offenders(limit: int = 10) -> List[Dict[str, Any]]:
+    """Steps with the most total blocking time this session"""
+    with _lock:
+        steps = [s.to_dict() for s in _steps.values() if s.total_blocking_ms > 0]
+    return sorted(steps, key=lambda s: s["total_blocking_ms"], reverse=True)[:limit]
+
+
+class LongTaskTracker(StepHook):
+    """Attributes main-thread blocking on one page to the page-object steps that caused it"""
+
+    def __init__(self, page: Page, test_name: str = None):
+        self.page = page
+        self.test_name = test_name or getattr(page, "test_name", None)
+        self.samples: List[Dict[str, Any]] = []
+        self._marks: Dict[int, Dict[str, Any]] = {}
+        page.add_init_script(LONG_TASK_INIT_SCRIPT)
+        BasePage.add_step_hook(self)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "LongTaskTracker":
+        """Return the tracker attached to the page, installing it on first use
+
+        Install before the first navigation; documents loaded earlier are not observed.
+        """
+        tracker = getattr(page, "_long_tasks", None)
+        if tracker is None:
+            tracker = cls(page)
+            page._long_tasks = tracker
+        return tracker
+
+    def close(self) -> None:
+        BasePage.remove_step_hook(self)
+
+    def _mark(self) -> Optional[Dict[str, Any]]:
+        try:
+            return self.page.evaluate("() => window.__longTasks ? window.__longTasks.mark() : null")
+        except Exception:
+            return None
+
+    # StepHook
+    def before_step(self, page_object, step: str) -> None:
+        if page_object.page is self.page:
+            self._marks[id(page_object)] = self._mark()
+
+    def after_step(self, page_object, step: str, duration: float, error: Optional[BaseException]) -> None:
+        if page_object.page is not self.page or self.page.is_closed():
+            return
+        mark = self._marks.pop(id(page_object), None)
+        try:
+            result = self.page.evaluate(
+                "mark => window.__longTasks ? window.__longTasks.collect(mark) : null", mark)
+        except Exception as e:
+            print(f"Could not collect long tasks for {step}: {str(e)}")
+            return
+        if not result:
+            return
+        self.record(step, duration, result["entries"])
+
+    def record(self, step: str, duration: float, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        tasks = [e for e in entries if e["type"] == "longtask"]
+        frames = [e for e in entries if e["type"] == "loaf"]
+        scripts: Dict[str, float] = {}
+        for frame in frames:
+            for script in frame["scripts"]:
+                key = f"{script.get('invoker') or script.get('fn') or '?'} ({script.get('source') or 'inline'})"
+                scripts[key] = scripts.get(key, 0.0) + script["duration"]
+        sample = {
+            "step": step,
+            "test": self.test_name,
+            "duration_ms": round(duration * 1000, 1),
+            "blocking_ms": round(sum(t["blocking"] for t in tasks), 1),
+            "long_tasks": len(tasks),
+            "longest_task_ms": round(max((t["duration"] for t in tasks), default=0.0), 1),
+            "loaf_blocking_ms": round(sum(f["blocking"] for f in frames), 1),
+            "top_scripts": sorted(({"script": k, "duration_ms": round(v, 1)} for k, v in scripts.items()),
+                                  key=lambda s: s["duration_ms"], reverse=True)[:3],
+        }
+        self.samples.append(sample)
+        summarize(sample)
+        if tasks or frames:
+            record_metric("long_tasks.blocking_time", sample["blocking_ms"], step=step, test=self.test_name,
+                          long_tasks=len(tasks), loaf_blocking_ms=sample["loaf_blocking_ms"])
+        return sample
+
+    @property
+    def total_blocking_ms(self) -> float:
+        return round(sum(s["blocking_ms"] for s in self.samples), 1)
+
+
+def write_long_task_report(report_dir: str = "test_reports", limit: int = 10) -> Optional[Path]:
+    """Print the steps that blocked the main thread the most and save all of them
+
+    Returns:
+        Path to the JSON report, or None if no step blocked the main thread
+    """
+    offenders = worst_offenders(limit=len(_steps) or 1)
+    if not offenders:
+        return None
+    print("\nMain-thread blocking by step (worst first):")
+    for s in offenders[:limit]:
+        worst = s["worst"] or {}
+        culprit = worst.get("top_scripts") or [{}]
+        print(f"  {s['step']}: {s['total_blocking_ms']}ms total over {s['calls']} call(s), "
+              f"max {s['max_blocking_ms']}ms, longest task {s['longest_task_ms']}ms"
+              f"{' in ' + worst['test'] if worst.get('test') else ''}"
+              f"{'; top script ' + culprit[0]['script'] if culprit[0] else ''}")
+    filepath = Path(report_dir) / f"long_tasks_{run_id()}_{worker_id()}.json"
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"run_id": run_id(), "worker": worker_id(), "steps": offenders}, f, indent=2)
+    print(f"Long task report saved to: {filepath}")
+    return filepath
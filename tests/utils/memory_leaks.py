@@ -0,0 +1,181 @@
+"""
+Browser memory leak detection for repeated UI cycles.
+
+A leak scenario is a function that performs one UI cycle (open and close the New
+Invoice overlay, navigate between two list pages, run a search, ...) and leaves
+the page where it started. LeakDetector runs it many times and, after each cycle,
+forces a garbage collection (HeapProfiler.collectGarbage) and samples the page's
+JS heap, DOM node and event listener counts (Performance.getMetrics) through a
+Chromium CDP session. A least-squares slope over the cycles after warm-up tells
+steady growth apart from noise; when it exceeds the threshold, two heap snapshots
+a few cycles apart are saved to test_reports/heap_snapshots/ so the retained
+objects can be diffed in the DevTools Memory panel (Comparison view).
+"""
+import json
+import re
+import statistics
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from playwright.sync_api import Page
+
+from tests.utils.metrics import record_metric
+
+# Growth per cycle above which a scenario counts as leaking
+LEAK_THRESHOLDS = {
+    "js_heap_bytes": 100 * 1024,
+    "nodes": 50,
+    "listeners": 10,
+}
+
+# Performance.getMetrics name -> sample field
+SAMPLED_METRICS = {"JSHeapUsedSize": "js_heap_bytes", "Nodes": "nodes", "JSEventListeners": "listeners",
+                   "Documents": "documents"}
+
+
+def fit_slope(values: List[float]) -> float:
+    """Least-squares slope of the values against their index (growth per cycle)"""
+    if len(values) < 2:
+        return 0.0
+    x_mean = (len(values) - 1) / 2
+    y_mean = statistics.fmean(values)
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(values))
+    denominator = sum((x - x_mean) ** 2 for x in range(len(values)))
+    return numerator / denominator
+
+
+class HeapSampler:
+    """Samples the page's heap through its CDP session (Chromium only)"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        try:
+            self._session = page.context.new_cdp_session(page)
+        except Exception as e:
+            raise RuntimeError(f"Heap sampling needs a Chromium CDP session: {str(e)}") from e
+        self._session.send("Performance.enable")
+        self._session.send("HeapProfiler.enable")
+
+    def sample(self, collect_garbage: bool = True) -> Dict[str, float]:
+        """Heap and DOM counters, after a full garbage collection by default"""
+        if collect_garbage:
+            self._session.send("HeapProfiler.collectGarbage")
+        metrics = {m["name"]: m["value"] for m in self._session.send("Performance.getMetrics")["metrics"]}
+        return {key: metrics.get(name, 0) for name, key in SAMPLED_METRICS.items()}
+
+    def take_snapshot(self, path: Path) -> Path:
+        """Write a .heapsnapshot file that DevTools can load"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            handler = lambda params: f.write(params["chunk"])
+            self._session.on("HeapProfiler.addHeapSnapshotChunk", handler)
+            try:
+                self._session.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+            finally:
+                self._session.remove_listener("HeapProfiler.addHeapSnapshotChunk", handler)
+        return path
+
+    def close(self) -> None:
+        try:
+            self._session.detach()
+        except Exception:
+            pass
+
+
+@dataclass
+class LeakReport:
+    scenario: str
+    cycles: int
+    warmup: int
+    samples: List[Dict[str, float]]
+    slopes: Dict[str, float] = field(default_factory=dict)
+    leaking: Dict[str, float] = field(default_factory=dict)
+    snapshots: List[str] = field(default_factory=list)
+
+    @property
+    def leaked(self) -> bool:
+        return bool(self.leaking)
+
+    def summary(self) -> str:
+        growth = ", ".join(f"{name} {slope:+.0f}/cycle" for name, slope in self.slopes.items())
+        verdict = f"LEAK ({', '.join(self.leaking)})" if self.leaked else "ok"
+        return f"{self.scenario}: {verdict} over {self.cycles} cycles; {growth}"
+
+    def save(self, report_dir: str = "test_reports/memory") -> Path:
+        output_dir = Path(report_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', self.scenario)}.json"
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(dict(asdict(self), saved_at=datetime.now().isoformat()), f, indent=2)
+        return filepath
+
+
+class LeakDetector:
+    """Runs a UI cycle repeatedly and fits the growth of the heap counters"""
+
+    def __init__(self, page: Page, thresholds: Dict[str, float] = None,
+                 snapshot_dir: str = "test_reports/heap_snapshots"):
+        """
+        Args:
+            page: Chromium page the cycles run on
+            thresholds: Growth per cycle that counts as a leak (default: LEAK_THRESHOLDS)
+            snapshot_dir: Where heap snapshots of leaking scenarios are written
+        """
+        self.page = page
+        self.thresholds = dict(LEAK_THRESHOLDS, **(thresholds or {}))
+        self.snapshot_dir = Path(snapshot_dir)
+        self.sampler = HeapSampler(page)
+
+    def run(self, scenario: str, cycle: Callable[[], None], cycles: int = 20, warmup: int = 3,
+            snapshot_cycles: int = 5) -> LeakReport:
+        """Run the cycle `warmup + cycles` times and report the growth per cycle
+
+        Args:
+            scenario: Name used in the report and snapshot file names
+            cycle: One UI cycle; must leave the page where it started
+            cycles: Measured cycles
+            warmup: Unmeasured cycles first, so caches and lazy chunks do not count as growth
+            snapshot_cycles: Cycles between the two heap snapshots taken when leaking
+
+        Returns:
+            LeakReport with one sample per measured cycle
+        """
+        for _ in range(warmup):
+            cycle()
+        samples = [self.sampler.sample()]
+        for index in range(cycles):
+            cycle()
+            samples.append(self.sampler.sample())
+            print(f"[{scenario}] cycle {index + 1}/{cycles}: heap {samples[-1]['js_heap_bytes'] / 1024:.0f}KB, "
+                  f"{samples[-1]['nodes']:.0f} nodes, {samples[-1]['listeners']:.0f} listeners")
+
+        report = LeakReport(scenario, cycles, warmup, samples)
+        for name in self.thresholds:
+            report.slopes[name] = round(fit_slope([s[name] for s in samples]), 1)
+            record_metric(f"memory.{name}.slope", report.slopes[name], unit="/cycle", scenario=scenario)
+            if report.slopes[name] > self.thresholds[name]:
+                report.leaking[name] = report.slopes[name]
+
+        if report.leaked:
+            report.snapshots = [str(p) for p in self._snapshots(scenario, cycle, snapshot_cycles)]
+        print(report.summary())
+        report.save()
+        return report
+
+    def _snapshots(self, scenario: str, cycle: Callable[[], None], between: int) -> List[Path]:
+        """Two snapshots `between` cycles apart; objects retained per cycle show up in their diff"""
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", scenario)
+        paths = [self.snapshot_dir / f"{name}_{stamp}_1.heapsnapshot"]
+        self.sampler.take_snapshot(paths[0])
+        for _ in range(between):
+            cycle()
+        paths.append(self.snapshot_dir / f"{name}_{stamp}_2.heapsnapshot")
+        self.sampler.take_snapshot(paths[1])
+        print(f"Heap snapshots saved to: {paths[0]} and {paths[1]}")
+        return paths
+
+    def close(self) -> None:
+        self.sampler.close()
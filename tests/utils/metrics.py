@@ -0,0 +1,112 @@
+"""
+Session-wide registry for performance metrics recorded by page objects and tests.
+
+Metrics are kept in memory while the suite runs and written once to
+test_reports/metrics_<run id>_<worker>.json at the end of the session. Samples are
+only printed as they are recorded when enabled with set_print_samples (pytest
+--print-metrics); the session summary covers them otherwise.
+"""
+import json
+import statistics
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from tests.utils.result_log import run_id, worker_id
+
+_lock = threading.Lock()
+_samples: List[Dict[str, Any]] = []
+_print_samples = False
+
+
+def set_print_samples(enabled: bool) -> None:
+    """Print a [METRIC] line for every recorded sample (off by default)"""
+    global _print_samples
+    _print_samples = enabled
+
+
+def record_metric(name: str, value: float, unit: str = "ms", **tags) -> Dict[str, Any]:
+    """Record a single metric sample.
+
+    Args:
+        name: Metric name (e.g., 'cost_centers.search.latency')
+        value: Measured value
+        unit: Unit of the value (default: 'ms')
+        **tags: Extra dimensions such as the query, test name or file count
+
+    Returns:
+        Dict: The stored sample
+    """
+    sample = {
+        "name": name,
+        "value": round(float(value), 3),
+        "unit": unit,
+        "tags": tags,
+        "timestamp": datetime.now().isoformat()
+    }
+    with _lock:
+        _samples.append(sample)
+    if _print_samples:
+        print(f"[METRIC] {name}={sample['value']}{unit} {tags if tags else ''}".rstrip())
+    return sample
+
+
+def get_metrics(name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return recorded samples, optionally filtered by metric name"""
+    with _lock:
+        return [s for s in _samples if name is None or s["name"] == name]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(name: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    """Aggregate samples per metric name into count/mean/p50/p95/max"""
+    grouped: Dict[str, List[float]] = {}
+    units: Dict[str, str] = {}
+    for sample in get_metrics(name):
+        grouped.setdefault(sample["name"], []).append(sample["value"])
+        units[sample["name"]] = sample["unit"]
+
+    return {
+        metric: {
+            "count": len(values),
+            "mean": round(statistics.fmean(values), 3),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "max": max(values),
+            "unit": units[metric]
+        }
+        for metric, values in grouped.items()
+    }
+
+
+def reset_metrics() -> None:
+    """Clear all recorded samples"""
+    with _lock:
+        _samples.clear()
+
+
+def save_metrics(report_dir: str = "test_reports") -> Optional[Path]:
+    """Write all samples and their summary to a JSON file
+
+    Returns:
+        Path to the written file, or None if nothing was recorded
+    """
+    samples = get_metrics()
+    if not samples:
+        return None
+
+    output_dir = Path(report_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # One file per xdist worker, all sharing the run id
+    filepath = output_dir / f"metrics_{run_id()}_{worker_id()}.json"
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump({"summary": summarize(), "samples": samples}, f, indent=2)
+
+    print(f"Metrics saved to: {filepath}")
+    return filepath
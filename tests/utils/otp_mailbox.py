@@ -0,0 +1,313 @@
+"""
+OTP mailbox multiplexer.
+
+Concurrent signup and reset-password flows all read OTPs from the same inbox.
+Instead of each of them searching (and racing on UNSEEN), one watcher thread owns
+the IMAP connection: it IDLEs, fetches the headers of new messages once, and hands
+each message to the waiter registered for its recipient and subject. Waiters get a
+Future with their own deadline. For every dispatched message the delivery latency
+(Date header to arrival in the watcher) is recorded as a metric.
+
+Dropped connections and network errors are retried with an exponential backoff;
+after max_reconnects failures in a row, or on any other error (such as rejected
+credentials), the pending waiters fail with that error instead of timing out.
+"""
+import atexit
+import imaplib
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.message import Message
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Pattern
+
+from tests.utils.imap_client import IDLE_INTERVAL_SEC, OTP_REGEX, MailboxClient, iter_message_bodies, quote_string
+from tests.utils.metrics import record_metric
+
+
+@dataclass(eq=False)
+class OtpWaiter:
+    """A registered wait for the OTP sent to one recipient"""
+    email_to: str
+    subject_filter: Optional[str]
+    otp_regex: Pattern
+    deadline: float
+    registered_at: float = field(default_factory=time.time)
+    future: Future = field(default_factory=Future)
+
+    def matches(self, headers: Message) -> bool:
+        recipients = ",".join(headers.get_all("To", []) or []).lower()
+        if self.email_to.lower() not in recipients:
+            return False
+        if self.subject_filter and self.subject_filter.lower() not in headers.get("Subject", "").lower():
+            return False
+        return True
+
+    def result(self) -> str:
+        """Block until the OTP arrives; raises TimeoutError after the deadline"""
+        try:
+            # The watcher expires the future at the deadline; the margin covers one IDLE cycle
+            return self.future.result(timeout=max(0.0, self.deadline - time.time()) + 5)
+        except FutureTimeoutError:
+            if self.future.done():
+                # The watcher expired the waiter with its own message
+                raise
+            raise TimeoutError(f"No OTP found in emails to {self.email_to} before the deadline")
+
+
+@dataclass
+class _CachedMessage:
+    headers: Message
+    seen_at: float
+    text: Optional[Message] = None
+
+
+class OtpMultiplexer:
+    """Single watcher thread dispatching OTP emails to per-recipient waiters"""
+
+    def __init__(self, client: MailboxClient, idle_interval: float = IDLE_INTERVAL_SEC,
+                 max_reconnects: int = 5, max_backoff: float = 30.0):
+        """
+        Args:
+            client: Mailbox client used exclusively by the watcher thread
+            idle_interval: Longest IDLE wait before pending waiters are re-checked
+            max_reconnects: Consecutive connection failures before pending waiters fail
+            max_backoff: Longest delay between reconnects, in seconds
+        """
+        self.client = client
+        self.idle_interval = idle_interval
+        self.max_reconnects = max_reconnects
+        self.max_backoff = max_backoff
+        self.deliveries: List[Dict] = []
+        self._waiters: List[OtpWaiter] = []
+        self._messages: Dict[bytes, _CachedMessage] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # Lifecycle
+    def start(self) -> "OtpMultiplexer":
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="otp-mailbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self.client.close()
+        for waiter in self._take_waiters():
+            waiter.future.set_exception(RuntimeError("OTP mailbox watcher stopped"))
+
+    # Waiters
+    def expect(self, email_to: str, subject_filter: str = None, timeout_sec: float = 90,
+               otp_regex: Pattern = OTP_REGEX) -> OtpWaiter:
+        """Register a waiter before triggering the email, then call .result() on it
+
+        Args:
+            email_to: Recipient address (e.g., 'testuser+<id>@example.com')
+            subject_filter: Optional text the subject must contain
+            timeout_sec: Time after which the waiter fails with TimeoutError
+            otp_regex: Regex whose first group is the OTP
+
+        Returns:
+            OtpWaiter: Holds the Future resolved with the OTP
+        """
+        waiter = OtpWaiter(email_to, subject_filter, otp_regex, time.time() + timeout_sec)
+        with self._condition:
+            self._waiters.append(waiter)
+            self._condition.notify_all()
+        self.start()
+        return waiter
+
+    def wait_for_otp(self, email_to: str, timeout_sec: float = 90, subject_filter: str = None,
+                     otp_regex: Pattern = OTP_REGEX) -> str:
+        """Register a waiter and block until its OTP arrives
+
+        Raises:
+            TimeoutError: If no OTP arrives within the timeout
+        """
+        print(f"Waiting for OTP in emails to {email_to}" +
+              (f" with subject containing: {subject_filter}" if subject_filter else ""))
+        otp = self.expect(email_to, subject_filter, timeout_sec, otp_regex).result()
+        print(f"Found OTP: {otp}")
+        return otp
+
+    def _pending(self) -> List[OtpWaiter]:
+        with self._condition:
+            return [w for w in self._waiters if not w.future.done()]
+
+    def _take_waiters(self) -> List[OtpWaiter]:
+        with self._condition:
+            waiters, self._waiters = self._waiters, []
+        return [w for w in waiters if not w.future.done()]
+
+    def _fail_pending(self, error: Exception) -> None:
+        for waiter in self._take_waiters():
+            waiter.future.set_exception(error)
+
+    # Watcher
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            with self._condition:
+                while not self._stopped and not any(not w.future.done() for w in self._waiters):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+            try:
+                self._poll()
+                self._dispatch()
+                self._expire()
+                pending = self._pending()
+                if pending:
+                    nearest = min(w.deadline for w in pending) - time.time()
+                    self.client.idle(max(0.05, min(self.idle_interval, nearest)))
+                failures = 0
+            except (imaplib.IMAP4.abort, OSError) as e:
+                # Dropped connection or network error: reconnect with backoff
+                self.client.close()
+                failures += 1
+                if failures > self.max_reconnects:
+                    print(f"OTP mailbox watcher giving up after {self.max_reconnects} reconnects: {str(e)}")
+                    self._fail_pending(ConnectionError(
+                        f"IMAP connection failed {failures} times in a row: {str(e)}"))
+                    failures = 0
+                    continue
+                delay = min(self.max_backoff, 2 ** (failures - 1))
+                print(f"OTP mailbox watcher error ({str(e)}), reconnecting in {delay}s")
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stopped, timeout=delay)
+            except Exception as e:
+                # Rejected credentials, unknown mailbox, protocol errors: retrying will not help
+                print(f"OTP mailbox watcher error: {str(e)}")
+                self.client.close()
+                self._fail_pending(e)
+                failures = 0
+
+    def _poll(self) -> None:
+        """Fetch the headers of new unread messages addressed to any pending recipient"""
+        recipients = sorted({w.email_to for w in self._pending()})
+        if not recipients:
+            return
+        # OR TO a OR TO b TO c
+        criteria = ["TO", quote_string(recipients[-1])]
+        for recipient in reversed(recipients[:-1]):
+            criteria = ["OR", "TO", quote_string(recipient)] + criteria
+        since = datetime.now(timezone.utc).strftime("%d-%b-%Y")
+        uids = self.client.search("UNSEEN", "SINCE", since, *criteria)
+
+        new = [uid for uid in uids if uid not in self._messages]
+        if new:
+            seen_at = time.time()
+            for uid, headers in self.client.fetch_headers(new).items():
+                self._messages[uid] = _CachedMessage(headers, seen_at)
+
+    def _dispatch(self) -> None:
+        """Hand cached messages to matching waiters, newest message first"""
+        matches = {}
+        for uid in sorted(self._messages, key=int, reverse=True):
+            waiters = [w for w in self._pending() if w.matches(self._messages[uid].headers)]
+            if waiters:
+                matches[uid] = waiters
+        if not matches:
+            return
+
+        # One FETCH for all texts not read yet, one STORE for all consumed messages
+        missing = {uid: self._messages[uid].headers for uid in matches if self._messages[uid].text is None}
+        for uid, text in self.client.fetch_texts(missing).items():
+            self._messages[uid].text = text
+
+        # A waiter takes only the newest message with its OTP (e.g. after a resend); older ones stay unread
+        resolved, taken = [], set()
+        for uid, waiters in matches.items():
+            cached = self._messages[uid]
+            for waiter in waiters:
+                if waiter.future.done() or id(waiter) in taken:
+                    continue
+                otp = self._extract(cached.text, waiter.otp_regex)
+                if otp is not None:
+                    resolved.append((uid, cached, waiter, otp))
+                    taken.add(id(waiter))
+                    break
+        if not resolved:
+            return
+
+        self.client.mark_seen(*(uid for uid, _, _, _ in resolved))
+        for uid, cached, waiter, otp in resolved:
+            del self._messages[uid]
+            self._record_delivery(uid, cached, waiter)
+            waiter.future.set_result(otp)
+
+    @staticmethod
+    def _extract(message: Message, otp_regex: Pattern) -> Optional[str]:
+        for body in iter_message_bodies(message):
+            match = otp_regex.search(body)
+            if match:
+                return match.group(1)
+        return None
+
+    def _expire(self) -> None:
+        now = time.time()
+        for waiter in self._pending():
+            if now >= waiter.deadline:
+                message = f"No OTP found in emails to {waiter.email_to} within " \
+                          f"{round(waiter.deadline - waiter.registered_at)} seconds"
+                if waiter.subject_filter:
+                    message += f" with subject containing: {waiter.subject_filter}"
+                waiter.future.set_exception(TimeoutError(message))
+        with self._condition:
+            self._waiters = [w for w in self._waiters if not w.future.done()]
+
+    def _record_delivery(self, uid: bytes, cached: _CachedMessage, waiter: OtpWaiter) -> None:
+        delivery = {
+            "uid": uid.decode(),
+            "recipient": waiter.email_to,
+            "subject": cached.headers.get("Subject", ""),
+            "wait_ms": round((time.time() - waiter.registered_at) * 1000, 1),
+            "delivery_latency_ms": None
+        }
+        try:
+            sent_at = parsedate_to_datetime(cached.headers.get("Date", "")).timestamp()
+            # Date has one-second resolution; never report a negative latency
+            delivery["delivery_latency_ms"] = round(max(0.0, cached.seen_at - sent_at) * 1000, 1)
+        except (TypeError, ValueError):
+            pass
+        self.deliveries.append(delivery)
+        record_metric("email.otp.wait", delivery["wait_ms"], recipient=waiter.email_to)
+        if delivery["delivery_latency_ms"] is not None:
+            record_metric("email.otp.delivery_latency", delivery["delivery_latency_ms"],
+                          recipient=waiter.email_to, subject=delivery["subject"])
+
+
+_multiplexers: Dict[tuple, OtpMultiplexer] = {}
+_multiplexers_lock = threading.Lock()
+
+
+def get_otp_multiplexer(host: str, username: str, password: str, port: int = None,
+                        use_ssl: bool = True) -> OtpMultiplexer:
+    """Return the session-wide multiplexer for the mailbox, starting it on first use"""
+    key = (host, port, use_ssl, username)
+    with _multiplexers_lock:
+        multiplexer = _multiplexers.get(key)
+        if multiplexer is None:
+            client = MailboxClient(host, username, password, port=port, use_ssl=use_ssl)
+            multiplexer = _multiplexers[key] = OtpMultiplexer(client).start()
+        return multiplexer
+
+
+def stop_otp_multiplexers() -> None:
+    """Stop all watcher threads and log out"""
+    with _multiplexers_lock:
+        for multiplexer in _multiplexers.values():
+            multiplexer.stop()
+        _multiplexers.clear()
+
+
+atexit.register(stop_otp_multiplexers)
@@ -0,0 +1,227 @@
+"""
+Performance budget checker.
+
+Compares per-route measurements (from the Web Vitals collector) against the
+budgets in tests/config/performance_budgets.py and against a rolling baseline: the
+median of the route's recent passing runs, kept in test_reports/perf_baseline.jsonl.
+A metric fails when it exceeds its budget, or when it grew by more than its
+tolerance over the baseline. Runs under a throttle profile get that profile's budget
+and are compared only with earlier runs under the same profile. Failures are
+reported as one delta table.
+
+Run directly to check the Web Vitals saved by the last suite run:
+    python -m tests.utils.perf_budget --record
+"""
+import json
+import statistics
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from tests.config.performance_budgets import (
+    BASELINE_FILE, BASELINE_MIN_RUNS, BASELINE_WINDOW, get_budget
+)
+
+OK = "ok"
+OVER_BUDGET = "OVER BUDGET"
+REGRESSION = "REGRESSION"
+NO_DATA = "no data"
+
+
+@dataclass
+class BudgetCheck:
+    """One metric of one route checked against its budget and baseline"""
+    route: str
+    metric: str
+    value: Optional[float]
+    budget: float
+    baseline: Optional[float]
+    baseline_runs: int
+    tolerance_pct: float
+    unit: str
+    status: str
+
+    @property
+    def failed(self) -> bool:
+        return self.status in (OVER_BUDGET, REGRESSION)
+
+    @property
+    def delta(self) -> Optional[float]:
+        if self.value is None or self.baseline is None:
+            return None
+        return self.value - self.baseline
+
+    @property
+    def delta_pct(self) -> Optional[float]:
+        if self.delta is None or not self.baseline:
+            return None
+        return self.delta / self.baseline * 100
+
+
+def aggregate_navigations(navigations: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Median of each metric per route over all navigations of a run (all under one profile)"""
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for navigation in navigations:
+        route = samples.setdefault(navigation.get("route", "?"), {})
+        for metric in get_budget(navigation.get("route", "?")):
+            if navigation.get(metric) is not None:
+                route.setdefault(metric, []).append(float(navigation[metric]))
+    return {route: {metric: statistics.median(values) for metric, values in metrics.items()}
+            for route, metrics in samples.items()}
+
+
+def load_history(history_file: str = BASELINE_FILE) -> List[Dict[str, Any]]:
+    path = Path(history_file)
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def baseline(history: List[Dict[str, Any]], route: str, metric: str, profile: Optional[str] = None,
+             window: int = BASELINE_WINDOW, min_runs: int = BASELINE_MIN_RUNS):
+    """Median of the metric over the route's last `window` passing runs under the profile
+
+    Returns:
+        Tuple of (median or None if fewer than min_runs, number of runs used)
+    """
+    values = [run["values"][metric] for run in history
+              if run.get("route") == route and run.get("profile") == profile and run.get("passed")
+              and run.get("values", {}).get(metric) is not None]
+    values = values[-window:]
+    if len(values) < min_runs:
+        return None, len(values)
+    return statistics.median(values), len(values)
+
+
+def check_route(route: str, values: Dict[str, float], history: List[Dict[str, Any]],
+                profile: Optional[str] = None) -> List[BudgetCheck]:
+    checks = []
+    for metric, limits in get_budget(route, profile).items():
+        value = values.get(metric)
+        base, runs = baseline(history, route, metric, profile)
+        status = OK
+        if value is None:
+            status = NO_DATA
+        elif value > limits["max"]:
+            status = OVER_BUDGET
+        elif (base is not None and value > base * (1 + limits["tolerance_pct"] / 100)
+              and value - base >= limits["min_delta"]):
+            status = REGRESSION
+        checks.append(BudgetCheck(route, metric, value, limits["max"], base, runs,
+                                  limits["tolerance_pct"], limits["unit"], status))
+    return checks
+
+
+def check_budgets(measurements: Dict[str, Dict[str, float]], history_file: str = BASELINE_FILE,
+                  profile: Optional[str] = None) -> List[BudgetCheck]:
+    """Check every measured route against its budget and rolling baseline
+
+    Args:
+        measurements: {route: {metric: value}}, e.g. from aggregate_navigations()
+        history_file: JSONL file with the previous runs
+        profile: Throttle profile the measurements were taken under, None for full speed
+    """
+    history = load_history(history_file)
+    return [check for route, values in sorted(measurements.items())
+            for check in check_route(route, values, history, profile)]
+
+
+def _format_value(value: Optional[float], unit: str) -> str:
+    if value is None:
+        return "-"
+    if unit == "B":
+        return f"{value / 1024:.1f}KB"
+    if unit == "ms":
+        return f"{value:.0f}ms"
+    return f"{value:.3f}".rstrip("0").rstrip(".") if isinstance(value, float) and value % 1 else f"{value:.0f}"
+
+
+def format_table(checks: List[BudgetCheck]) -> str:
+    """Render the checks as a fixed-width delta table"""
+    header = ("Route", "Metric", "Value", "Budget", "Baseline", "Delta", "Status")
+    rows = []
+    for check in checks:
+        if check.delta is None:
+            delta = "-"
+        else:
+            sign = "+" if check.delta >= 0 else "-"
+            delta = f"{sign}{_format_value(abs(check.delta), check.unit)}"
+            if check.delta_pct is not None:
+                delta += f" ({check.delta_pct:+.1f}%)"
+        baseline_text = _format_value(check.baseline, check.unit)
+        if check.baseline is not None:
+            baseline_text += f" (n={check.baseline_runs})"
+        rows.append((check.route, check.metric, _format_value(check.value, check.unit),
+                     _format_value(check.budget, check.unit), baseline_text, delta, check.status))
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+             for row in [header] + rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    return "\n".join(lines)
+
+
+def record_run(measurements: Dict[str, Dict[str, float]], checks: List[BudgetCheck],
+               history_file: str = BASELINE_FILE, profile: Optional[str] = None) -> None:
+    """Append this run to the baseline history; failing routes are kept but not used as baseline"""
+    path = Path(history_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().isoformat()
+    with open(path, "a", encoding="utf-8") as f:
+        for route, values in sorted(measurements.items()):
+            passed = not any(c.failed for c in checks if c.route == route)
+            f.write(json.dumps({"timestamp": timestamp, "route": route, "profile": profile,
+                                "values": values, "passed": passed}) + "\n")
+
+
+def assert_within_budgets(measurements: Dict[str, Dict[str, float]], record: bool = True,
+                          history_file: str = BASELINE_FILE, profile: Optional[str] = None) -> List[BudgetCheck]:
+    """Check the measurements, record the run and fail with the delta table on any violation
+
+    Raises:
+        AssertionError: If any metric is over budget or regressed against the baseline
+    """
+    checks = check_budgets(measurements, history_file, profile)
+    print(f"\nPerformance budgets ({profile or 'unthrottled'}):\n" + format_table(checks))
+    if record:
+        record_run(measurements, checks, history_file, profile)
+    failed = [c for c in checks if c.failed]
+    if failed:
+        raise AssertionError(f"{len(failed)} performance budget violation(s):\n{format_table(failed)}")
+    return checks
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check saved Web Vitals against the performance budgets")
+    parser.add_argument("--dir", default="test_reports/web_vitals",
+                        help="Directory with the per-test Web Vitals files of the run")
+    parser.add_argument("--history", default=BASELINE_FILE, help="Baseline history file")
+    parser.add_argument("--record", action="store_true", help="Append this run to the baseline history")
+    parser.add_argument("--profile", default=None, help="Throttle profile the Web Vitals were collected under")
+    args = parser.parse_args()
+
+    navigations = []
+    for path in sorted(Path(args.dir).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("throttle") == args.profile:
+            navigations.extend(saved.get("navigations", []))
+    if not navigations:
+        print(f"No Web Vitals found in {args.dir}")
+        return 1
+
+    measurements = aggregate_navigations(navigations)
+    try:
+        assert_within_budgets(measurements, record=args.record, history_file=args.history,
+                              profile=args.profile)
+    except AssertionError as e:
+        print(f"\n{e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,210 @@
+"""
+Chromium performance traces of selected tests.
+
+Tests marked @pytest.mark.perf_trace run with browser.start_tracing /
+stop_tracing around the test body: the DevTools timeline trace (the one the
+Performance panel records, not the Playwright trace), with screenshots by
+default. The trace is saved to test_reports/traces/<test>.json and can be loaded
+into the DevTools Performance panel.
+
+A small analyzer summarizes the renderer main thread of the trace: self time of
+the trace events grouped into script, layout (style and layout), paint
+(paint, layerize, composite), GC, parsing and other task work, and the longest
+tasks with the category that dominated each of them. The summary is printed,
+recorded as trace.* metrics and saved next to the trace.
+
+Usage:
+    @pytest.mark.perf_trace
+    def test_form_performance(self, page): ...
+
+    @pytest.mark.perf_trace(screenshots=False, categories=[...])
+"""
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from playwright.sync_api import Browser, Page
+
+from tests.utils.metrics import record_metric
+
+TRACE_CATEGORIES = [
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "disabled-by-default-devtools.timeline.stack",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+    "latencyInfo",
+    "toplevel",
+]
+
+# Trace event name -> summary category; self time of unlisted events inside a task counts as other
+EVENT_CATEGORIES = {
+    **dict.fromkeys(("EvaluateScript", "v8.evaluateModule", "FunctionCall", "TimerFire", "EventDispatch",
+                     "FireAnimationFrame", "FireIdleCallback", "RunMicrotasks", "v8.compile",
+                     "v8.compileModule", "V8.CompileCode", "v8.produceCache", "XHRReadyStateChange",
+                     "XHRLoad"), "script"),
+    **dict.fromkeys(("Layout", "UpdateLayoutTree", "RecalculateStyles", "UpdateLayerTree", "HitTest",
+                     "PrePaint", "InvalidateLayout", "ScheduleStyleRecalculation"), "layout"),
+    **dict.fromkeys(("Paint", "PaintImage", "PaintSetup", "Layerize", "CompositeLayers", "Commit",
+                     "UpdateLayer", "Decode Image", "Decode LazyPixelRef"), "paint"),
+    **dict.fromkeys(("MinorGC", "MajorGC", "V8.GCScavenger", "V8.GCFinalizeMC", "V8.GCIncrementalMarking",
+                     "BlinkGC.AtomicPhase", "ThreadState::performIdleLazySweep"), "gc"),
+    **dict.fromkeys(("ParseHTML", "ParseAuthorStyleSheet"), "parse"),
+}
+SUMMARY_CATEGORIES = ("script", "layout", "paint", "gc", "parse", "other")
+
+TASK_EVENTS = ("RunTask", "ThreadControllerImpl::RunTask")
+LONG_TASK_MS = 50
+
+
+def _main_thread_ids(events: List[Dict[str, Any]]) -> set:
+    """(pid, tid) of the renderer main threads (CrRendererMain)"""
+    return {(e["pid"], e["tid"]) for e in events
+            if e.get("ph") == "M" and e.get("name") == "thread_name"
+            and e.get("args", {}).get("name") == "CrRendererMain"}
+
+
+def _script_url(event: Dict[str, Any]) -> Optional[str]:
+    data = event.get("args", {}).get("data")
+    if not isinstance(data, dict):
+        return None
+    stack = data.get("stackTrace") or [{}]
+    return data.get("url") or stack[0].get("url") or None
+
+
+def analyze_trace(trace: Union[bytes, str, Dict, List], longest: int = 5) -> Dict[str, Any]:
+    """
+    Summarize where the renderer main thread spent its time
+
+    Args:
+        trace: Trace as returned by browser.stop_tracing, its JSON text or the parsed JSON
+        longest: Number of longest tasks to report
+
+    Returns:
+        Dict: Self time per category, task counts, the longest tasks and the screenshot count
+    """
+    if isinstance(trace, (bytes, str)):
+        trace = json.loads(trace)
+    events = trace.get("traceEvents", []) if isinstance(trace, dict) else trace
+    main_threads = _main_thread_ids(events)
+    complete = [e for e in events if e.get("ph") == "X" and "dur" in e
+                and (not main_threads or (e.get("pid"), e.get("tid")) in main_threads)]
+    timestamps = [e["ts"] for e in events if e.get("ts")]
+    trace_start = min(timestamps) if timestamps else 0
+
+    totals = dict.fromkeys(SUMMARY_CATEGORIES, 0.0)
+    tasks: List[Dict[str, Any]] = []
+    by_thread: Dict[Any, List[Dict[str, Any]]] = {}
+    for event in complete:
+        by_thread.setdefault((event["pid"], event["tid"]), []).append(event)
+
+    for thread_events in by_thread.values():
+        # Walk each thread's events outermost first; an event's self time excludes its children
+        thread_events.sort(key=lambda e: (e["ts"], -e["dur"]))
+        stack: List[Dict[str, Any]] = []
+        task: Optional[Dict[str, Any]] = None
+        for event in thread_events:
+            while stack and event["ts"] >= stack[-1]["ts"] + stack[-1]["dur"]:
+                stack.pop()
+            if stack:
+                stack[-1]["_children"] = stack[-1].get("_children", 0) + event["dur"]
+            elif event["name"] in TASK_EVENTS:
+                task = {"start_ms": round((event["ts"] - trace_start) / 1000, 1),
+                        "duration_ms": round(event["dur"] / 1000, 1),
+                        "breakdown": dict.fromkeys(SUMMARY_CATEGORIES, 0.0), "scripts": []}
+                tasks.append(task)
+            else:
+                task = None
+            event["_task"] = task if stack or event["name"] in TASK_EVENTS else None
+            stack.append(event)
+
+        for event in thread_events:
+            category = EVENT_CATEGORIES.get(event["name"])
+            if category is None and event["_task"] is None:
+                continue
+            self_ms = max(0, event["dur"] - event.get("_children", 0)) / 1000
+            category = category or "other"
+            totals[category] += self_ms
+            if event["_task"] is not None:
+                event["_task"]["breakdown"][category] += self_ms
+                url = _script_url(event) if category == "script" else None
+                if url and url not in event["_task"]["scripts"]:
+                    event["_task"]["scripts"].append(url)
+
+    for task in tasks:
+        task["breakdown"] = {k: round(v, 1) for k, v in task["breakdown"].items() if v}
+        task["dominant"] = max(task["breakdown"], key=task["breakdown"].get) if task["breakdown"] else "other"
+        task["scripts"] = task["scripts"][:3]
+
+    long_tasks = [t for t in tasks if t["duration_ms"] > LONG_TASK_MS]
+    return {
+        "duration_ms": round((max(timestamps) - trace_start) / 1000, 1) if timestamps else 0.0,
+        **{f"{name}_ms": round(value, 1) for name, value in totals.items()},
+        "tasks": len(tasks),
+        "long_tasks": len(long_tasks),
+        "total_blocking_ms": round(sum(t["duration_ms"] - LONG_TASK_MS for t in long_tasks), 1),
+        "longest_tasks": sorted(tasks, key=lambda t: t["duration_ms"], reverse=True)[:longest],
+        "screenshots": sum(1 for e in events if e.get("name") == "Screenshot"),
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    busy = ", ".join(f"{name} {summary[f'{name}_ms']:.0f}ms" for name in SUMMARY_CATEGORIES)
+    lines = [f"Trace of {summary['duration_ms']:.0f}ms: {busy}; {summary['tasks']} tasks, "
+             f"{summary['long_tasks']} long (blocking {summary['total_blocking_ms']:.0f}ms), "
+             f"{summary['screenshots']} screenshots",
+             "Longest tasks:"]
+    for t in summary["longest_tasks"]:
+        scripts = f" in {', '.join(t['scripts'])}" if t["scripts"] else ""
+        lines.append(f"  at {t['start_ms']:>8.0f}ms: {t['duration_ms']:.0f}ms, mostly {t['dominant']} "
+                     f"({', '.join(f'{k} {v:.0f}ms' for k, v in t['breakdown'].items())}){scripts}")
+    return "\n".join(lines)
+
+
+class PerfTrace:
+    """DevTools performance trace of one page (Chromium only)"""
+
+    def __init__(self, browser: Browser, page: Page, screenshots: bool = True, categories: List[str] = None):
+        """
+        Args:
+            browser: Browser the page belongs to
+            page: Page whose renderer is traced
+            screenshots: Capture filmstrip screenshots in the trace
+            categories: Trace categories (default: TRACE_CATEGORIES)
+        """
+        self.browser = browser
+        self.page = page
+        self.screenshots = screenshots
+        self.categories = categories or TRACE_CATEGORIES
+        self.summary: Optional[Dict[str, Any]] = None
+
+    def start(self) -> "PerfTrace":
+        try:
+            self.browser.start_tracing(page=self.page, screenshots=self.screenshots, categories=self.categories)
+        except Exception as e:
+            raise RuntimeError(f"Performance tracing needs Chromium: {str(e)}") from e
+        return self
+
+    def stop(self, test_name: str, report_dir: str = "test_reports/traces") -> Path:
+        """Stop tracing, save the trace and its summary, and print the summary
+
+        Returns:
+            Path to the saved trace
+        """
+        output_dir = Path(report_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', test_name)}.json"
+        trace = self.browser.stop_tracing()
+        filepath.write_bytes(trace)
+
+        self.summary = analyze_trace(trace)
+        with open(filepath.with_suffix(".summary.json"), "w", encoding="utf-8") as f:
+            json.dump(dict(self.summary, test=test_name, trace=str(filepath)), f, indent=2)
+        for name in SUMMARY_CATEGORIES:
+            record_metric(f"trace.{name}", self.summary[f"{name}_ms"], test=test_name)
+        record_metric("trace.total_blocking_time", self.summary["total_blocking_ms"], test=test_name)
+        print(f"\n{format_summary(self.summary)}\nPerformance trace saved to: {filepath}")
+        return filepath
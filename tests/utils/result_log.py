@@ -0,0 +1,229 @@
+"""
+Session-wide structured result log.
+
+Results are buffered in memory and written as JSON lines by a background thread,
+so recording a case costs a queue put no matter how many cases a data-driven test
+emits. Each pytest-xdist worker writes its own file under
+test_reports/results/<run_id>/; at the end of the session the controller merges
+them into one test_reports/results_<run_id>.json summary and an HTML rendering.
+"""
+import atexit
+import html
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+RUN_ID_ENV = "TEST_REPORT_RUN_ID"
+
+
+def run_id() -> str:
+    """Identifier shared by the controller and all workers of one test run
+
+    Set in the controller's environment on first use, so xdist workers spawned
+    afterwards inherit it.
+    """
+    return os.environ.setdefault(RUN_ID_ENV, datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+
+def worker_id() -> str:
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+def run_dir(report_dir: str = "test_reports") -> Path:
+    return Path(report_dir) / "results" / run_id()
+
+
+class ResultLog:
+    """Buffers result records and appends them to a JSONL file from a writer thread"""
+
+    def __init__(self, path: Path, flush_interval: float = 0.5):
+        """
+        Args:
+            path: JSONL file written by this process
+            flush_interval: Longest time a record waits in memory before being written
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def record(self, **result) -> Dict[str, Any]:
+        """Queue one result; the test name and worker are added automatically"""
+        result.setdefault("timestamp", datetime.now().isoformat())
+        result.setdefault("worker", worker_id())
+        current = os.environ.get("PYTEST_CURRENT_TEST")
+        if current:
+            result.setdefault("test", current.rsplit(" ", 1)[0])
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="result-log", daemon=True)
+                self._thread.start()
+            self.count += 1
+        self._queue.put(result)
+        return result
+
+    def close(self) -> None:
+        """Write everything still buffered and stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _run(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            stopping = False
+            while not stopping:
+                try:
+                    batch = [self._queue.get(timeout=self.flush_interval)]
+                except queue.Empty:
+                    continue
+                # Drain whatever else is queued so one write covers the whole burst
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stopping = None in batch
+                lines = [json.dumps(r, default=str) for r in batch if r is not None]
+                if lines:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+
+
+_log: Optional[ResultLog] = None
+_log_lock = threading.Lock()
+
+
+def get_result_log(report_dir: str = "test_reports") -> ResultLog:
+    """Return this process's result log, creating it on first use"""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = ResultLog(run_dir(report_dir) / f"{worker_id()}.jsonl")
+        return _log
+
+
+def close_result_log() -> None:
+    with _log_lock:
+        if _log is not None:
+            _log.close()
+
+
+atexit.register(close_result_log)
+
+
+def merge_results(directory: Path) -> List[Dict[str, Any]]:
+    """Read the JSONL files of all workers, ordered by timestamp"""
+    results = []
+    for path in sorted(directory.glob("*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        results.append(json.loads(line))
+                    except ValueError:
+                        print(f"Skipping malformed result line in {path}")
+    return sorted(results, key=lambda r: r.get("timestamp", ""))
+
+
+def build_summary(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate results into totals per suite"""
+    suites: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        suite = suites.setdefault(result.get("suite", "ungrouped"), {
+            "total": 0, "passed": 0, "failed": 0, "security_issues": 0, "failed_cases": []
+        })
+        suite["total"] += 1
+        if result.get("success"):
+            suite["passed"] += 1
+        else:
+            suite["failed"] += 1
+            suite["failed_cases"].append(result.get("case_name"))
+            if result.get("security_concern"):
+                suite["security_issues"] += 1
+    return {
+        "run_id": run_id(),
+        "generated_at": datetime.now().isoformat(),
+        "workers": sorted({r.get("worker", "main") for r in results}),
+        "total": len(results),
+        "passed": sum(s["passed"] for s in suites.values()),
+        "failed": sum(s["failed"] for s in suites.values()),
+        "security_issues": sum(s["security_issues"] for s in suites.values()),
+        "suites": suites
+    }
+
+
+def render_html(summary: Dict[str, Any], results: List[Dict[str, Any]]) -> str:
+    """Render the summary and all results as a standalone HTML page"""
+    e = lambda value: html.escape(str(value if value is not None else ""))
+    suite_rows = "".join(
+        f"<tr><td>{e(name)}</td><td>{s['total']}</td><td>{s['passed']}</td>"
+        f"<td class='{'fail' if s['failed'] else ''}'>{s['failed']}</td><td>{s['security_issues']}</td></tr>"
+        for name, s in sorted(summary["suites"].items()))
+    result_rows = "".join(
+        f"<tr class='{'pass' if r.get('success') else 'fail'}'><td>{e(r.get('suite'))}</td>"
+        f"<td>{e(r.get('case_name'))}</td><td>{'PASS' if r.get('success') else 'FAIL'}"
+        f"{' (security)' if r.get('security_concern') and not r.get('success') else ''}</td>"
+        f"<td>{e(r.get('details'))}</td><td>{e(r.get('expected_behavior'))}</td>"
+        f"<td>{e(r.get('actual_behavior'))}</td><td>{e(r.get('worker'))}</td><td>{e(r.get('test'))}</td></tr>"
+        for r in results)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Test results {e(summary['run_id'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; }}
+table {{ border-collapse: collapse; margin-bottom: 24px; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }}
+tr.fail td, td.fail {{ background: #fef2f2; }}
+</style>
+</head>
+<body>
+<h1>Test results {e(summary['run_id'])}</h1>
+<p>{summary['total']} cases, {summary['passed']} passed, {summary['failed']} failed,
+{summary['security_issues']} security issues; workers: {e(', '.join(summary['workers']))}</p>
+<table>
+<tr><th>Suite</th><th>Total</th><th>Passed</th><th>Failed</th><th>Security issues</th></tr>
+{suite_rows}
+</table>
+<table>
+<tr><th>Suite</th><th>Case</th><th>Result</th><th>Details</th><th>Expected</th><th>Actual</th><th>Worker</th><th>Test</th></tr>
+{result_rows}
+</table>
+</body>
+</html>
+"""
+
+
+def write_session_report(report_dir: str = "test_reports") -> Optional[Tuple[Path, Path]]:
+    """Merge all worker logs of this run into one JSON summary and one HTML page
+
+    Returns:
+        Paths of the JSON and HTML files, or None if nothing was recorded
+    """
+    close_result_log()
+    results = merge_results(run_dir(report_dir))
+    if not results:
+        return None
+
+    summary = build_summary(results)
+    json_path = Path(report_dir) / f"results_{run_id()}.json"
+    html_path = json_path.with_suffix(".html")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"summary": summary, "results": results}, f, indent=2, default=str)
+    html_path.write_text(render_html(summary, results), encoding="utf-8")
+
+    print(f"\nStructured results: {summary['total']} cases, {summary['passed']} passed, "
+          f"{summary['failed']} failed")
+    print(f"Results saved to: {json_path} and {html_path}")
+    return json_path, html_path
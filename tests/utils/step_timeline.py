@@ -0,0 +1,155 @@
+"""
+Per-step Chromium performance counters.
+
+StepTimeline is a StepHook that snapshots Performance.getMetrics through the
+page's CDP session before and after every page-object step (LoginPage.login,
+ExpenseTypesPage.submit_form, InvoicesPage.click_add_invoice, ...) and records the
+difference: layouts and style recalcs with their durations, script and task
+duration, DOM nodes and JS heap, plus the requests the step made. Whatever part of
+the step's wall time the renderer was not busy is reported as waiting (network,
+timers, Playwright's own polling), so each step gets a dominant cost: layout,
+script, other main-thread work or waiting. The timeline is saved per test to
+test_reports/timelines/<test>.json.
+
+Usage:
+    with StepTimeline(page) as timeline:
+        login_page.login(email, password)
+    timeline.save(request.node.nodeid)
+"""
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from playwright.sync_api import Page, Request
+
+from pages.base_page import BasePage, StepHook
+
+# Performance.getMetrics name -> timeline field; durations are reported in seconds
+COUNTERS = {"LayoutCount": "layouts", "RecalcStyleCount": "style_recalcs"}
+DURATIONS = {"LayoutDuration": "layout_ms", "RecalcStyleDuration": "style_ms",
+             "ScriptDuration": "script_ms", "TaskDuration": "task_ms"}
+GAUGES = {"Nodes": "nodes", "JSHeapUsedSize": "js_heap_bytes"}
+
+
+class StepTimeline(StepHook):
+    """Records the renderer's work during each page-object step on one page (Chromium only)"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.entries: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._requests = 0
+        self._started = time.perf_counter()
+        try:
+            self._session = page.context.new_cdp_session(page)
+        except Exception as e:
+            raise RuntimeError(f"Step timeline needs a Chromium CDP session: {str(e)}") from e
+        self._session.send("Performance.enable")
+        page.on("request", self._on_request)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "StepTimeline":
+        """Return the timeline attached to the page, starting it on first use"""
+        timeline = getattr(page, "_step_timeline", None)
+        if timeline is None:
+            timeline = cls(page)
+            page._step_timeline = timeline
+        return timeline.start()
+
+    def start(self) -> "StepTimeline":
+        if self not in BasePage._step_hooks:
+            BasePage.add_step_hook(self)
+        return self
+
+    def stop(self) -> None:
+        BasePage.remove_step_hook(self)
+
+    def __enter__(self) -> "StepTimeline":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _on_request(self, request: Request) -> None:
+        self._requests += 1
+
+    def _metrics(self) -> Optional[Dict[str, float]]:
+        try:
+            return {m["name"]: m["value"] for m in self._session.send("Performance.getMetrics")["metrics"]}
+        except Exception:
+            # The page may be closing
+            return None
+
+    # StepHook
+    def before_step(self, page_object, step: str) -> None:
+        if page_object.page is not self.page:
+            return
+        self._stack.append({"step": step, "metrics": self._metrics(), "requests": self._requests,
+                            "offset": time.perf_counter() - self._started})
+
+    def after_step(self, page_object, step: str, duration: float, error: Optional[BaseException]) -> None:
+        if page_object.page is not self.page or not self._stack:
+            return
+        start = self._stack.pop()
+        end = self._metrics()
+        if start["metrics"] is None or end is None:
+            return
+        self.entries.append(self._entry(step, duration, error, start, end))
+
+    def _entry(self, step: str, duration: float, error: Optional[BaseException],
+               start: Dict[str, Any], end: Dict[str, float]) -> Dict[str, Any]:
+        before = start["metrics"]
+        # Counters start over in a new document; then everything counted belongs to this step
+        reset = any(end.get(name, 0) < before.get(name, 0) for name in list(COUNTERS) + list(DURATIONS))
+        delta = lambda name: end.get(name, 0) - (0 if reset else before.get(name, 0))
+
+        entry: Dict[str, Any] = {
+            "step": step,
+            "depth": len(self._stack),
+            "start_ms": round(start["offset"] * 1000, 1),
+            "duration_ms": round(duration * 1000, 1),
+            "ok": error is None,
+            "new_document": reset,
+            "requests": self._requests - start["requests"],
+        }
+        entry.update({field: int(delta(name)) for name, field in COUNTERS.items()})
+        entry.update({field: round(delta(name) * 1000, 1) for name, field in DURATIONS.items()})
+        for name, field in GAUGES.items():
+            entry[field] = int(end.get(name, 0))
+            entry[f"{field}_delta"] = int(delta(name))
+
+        layout = entry["layout_ms"] + entry["style_ms"]
+        costs = {
+            "layout": layout,
+            "script": entry["script_ms"],
+            "other_main_thread": max(0.0, entry["task_ms"] - layout - entry["script_ms"]),
+            "waiting": max(0.0, entry["duration_ms"] - entry["task_ms"]),
+        }
+        entry["waiting_ms"] = round(costs["waiting"], 1)
+        entry["dominant"] = max(costs, key=costs.get)
+        return entry
+
+    def print_timeline(self) -> None:
+        print("\nStep timeline:")
+        for e in self.entries:
+            print(f"  {e['start_ms']:>9.0f}ms {'  ' * e['depth']}{e['step']}: {e['duration_ms']:.0f}ms "
+                  f"(script {e['script_ms']:.0f}ms, layout {e['layout_ms'] + e['style_ms']:.0f}ms/"
+                  f"{e['layouts']} layouts, waiting {e['waiting_ms']:.0f}ms, {e['requests']} requests, "
+                  f"{e['nodes']} nodes) -> {e['dominant']}")
+
+    def save(self, test_name: str, report_dir: str = "test_reports/timelines") -> Optional[Path]:
+        """Write the timeline to <report_dir>/<test>.json
+
+        Returns:
+            Path to the written file, or None if no step was recorded
+        """
+        if not self.entries:
+            return None
+        output_dir = Path(report_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        filepath = output_dir / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', test_name)}.json"
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump({"test": test_name, "steps": sorted(self.entries, key=lambda e: e["start_ms"])}, f, indent=2)
+        return filepath
@@ -1,37 +1,27 @@
-import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any
 from datetime import datetime
-from pathlib import Path
+from tests.utils.result_log import get_result_log
 
 class TestReporter:
-    """Utility class for generating formatted test reports."""
+    """Utility class for generating formatted test reports.
     
-    def __init__(self, test_name: str, report_dir: str = "test_reports"):
+    Results are kept in memory and handed to the session result log, which writes
+    them as JSON lines in the background and renders one aggregated JSON/HTML
+    report at the end of the session (see tests/utils/result_log.py).
+    """
+    
+    def __init__(self, test_name: str, report_dir: str = "test_reports", verbose: bool = False):
         self.test_name = test_name
         self.results = []
         self.start_time = datetime.now()
+        self.verbose = verbose
+        self.result_log = get_result_log(report_dir)
+        self.report_file = self.result_log.path
         
-        # Create reports directory if it doesn't exist
-        self.report_dir = Path(report_dir)
-        self.report_dir.mkdir(exist_ok=True, parents=True)
-        
-        # Create a sanitized filename from test name
-        safe_test_name = "".join(c if c.isalnum() else "_" for c in test_name)
-        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
-        self.report_file = self.report_dir / f"{safe_test_name}_{timestamp}.txt"
-        
-        # Initialize the report file
-        with open(self.report_file, 'w') as f:
-            f.write(f"{'='*80}\n")
-            f.write(f"TEST: {test_name.upper()}\n")
-            f.write(f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"-" * 80 + "\n\n")
-        
-        # Also print to console
         print(f"\n{'='*80}")
         print(f"TEST: {test_name.upper()}")
         print(f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Report will be saved to: {self.report_file}")
+        print(f"Results will be logged to: {self.report_file}")
         print("-" * 80)
     
     def add_result(
@@ -63,34 +53,31 @@ class TestReporter:
             'timestamp': datetime.now()
         }
         self.results.append(result)
+        self.result_log.record(suite=self.test_name, **dict(result, timestamp=result['timestamp'].isoformat()))
         
-        # Format the result
-        status = "✅ PASS" if success else "❌ FAIL"
-        security_note = " (Security Issue)" if security_concern and not success else ""
+        if self.verbose:
+            print(self._format_result(result))
+    
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> str:
+        status = "✅ PASS" if result['success'] else "❌ FAIL"
+        security_note = " (Security Issue)" if result['security_concern'] and not result['success'] else ""
         
-        # Prepare the output
         output_lines = [
-            f"\n{case_name}:",
+            f"\n{result['case_name']}:",
             f"Result: {status}{security_note}",
-            f"Details: {details}"
+            f"Details: {result['details']}"
         ]
         
-        if expected_behavior:
-            output_lines.append(f"Expected: {expected_behavior}")
-        if actual_behavior:
-            output_lines.append(f"Actual: {actual_behavior}")
-        if security_concern and not success:
+        if result['expected_behavior']:
+            output_lines.append(f"Expected: {result['expected_behavior']}")
+        if result['actual_behavior']:
+            output_lines.append(f"Actual: {result['actual_behavior']}")
+        if result['security_concern'] and not result['success']:
             output_lines.append("SECURITY CONCERN: This could indicate a potential security vulnerability.")
         
         output_lines.append("-" * 40)
-        output = "\n".join(output_lines)
-        
-        # Print to console
-        print(output)
-        
-        # Append to report file
-        with open(self.report_file, 'a') as f:
-            f.write(output + "\n")
+        return "\n".join(output_lines)
     
     def generate_summary(self) -> Dict[str, Any]:
         """Generate a summary of all test results."""
@@ -131,16 +118,9 @@ class TestReporter:
         summary_lines.append("="*80 + "\n")
         summary = "\n".join(summary_lines)
         
-        # Print to console
+        # Print to console; the file report is written once at session end
         print(summary)
         
-        # Append to report file
-        with open(self.report_file, 'a') as f:
-            f.write(summary + "\n")
-            f.write(f"Report saved to: {os.path.abspath(self.report_file)}\n")
-        
-        print(f"Report saved to: {os.path.abspath(self.report_file)}")
-        
         return {
             'test_name': self.test_name,
             'start_time': self.start_time,
@@ -0,0 +1,119 @@
+"""
+Network and CPU throttling through a Chromium CDP session.
+
+Named profiles emulate slower connections (Network.emulateNetworkConditions) and
+slower devices (Emulation.setCPUThrottlingRate) so performance checks see what
+real users on those devices see, not the CI box's desktop speed. Throttling is
+per page; pages opened later (popups, new tabs) run unthrottled.
+
+Usage:
+    @pytest.mark.throttle("slow-4g")          # applied by the page fixture before the test
+    def test_something(page): ...
+
+    @pytest.mark.parametrize("profile", throttle_params())  # one run per profile
+    def test_something(page, profile): ...
+
+    Throttler.for_page(page).apply("fast-3g")  # or switch mid-test via the throttle fixture
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from playwright.sync_api import Page
+
+
+def _kbps(kilobits: float) -> float:
+    """Throughput in bytes per second, with the 10% packet overhead DevTools presets use"""
+    return kilobits * 1024 / 8 * 0.9
+
+
+@dataclass(frozen=True)
+class ThrottleProfile:
+    name: str
+    latency: float  # Added round-trip time in ms
+    download: float  # Bytes per second, -1 for unthrottled
+    upload: float  # Bytes per second, -1 for unthrottled
+    cpu_rate: float = 1  # CPU slowdown factor, 1 for none
+
+
+THROTTLE_PROFILES = {
+    profile.name: profile for profile in (
+        ThrottleProfile("fast-3g", latency=562.5, download=_kbps(1600), upload=_kbps(750)),
+        ThrottleProfile("slow-4g", latency=150, download=_kbps(4000), upload=_kbps(3000)),
+        # Mid-tier phone (Moto G class) on a 4G connection
+        ThrottleProfile("mid-tier-mobile", latency=150, download=_kbps(4000), upload=_kbps(3000), cpu_rate=4),
+    )
+}
+
+
+def get_profile(name: str) -> ThrottleProfile:
+    try:
+        return THROTTLE_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown throttle profile '{name}', expected one of: "
+                         f"{', '.join(THROTTLE_PROFILES)}") from None
+
+
+def throttle_params(*names: str) -> List:
+    """pytest.param per profile, each carrying the throttle marker, for @pytest.mark.parametrize"""
+    import pytest
+
+    return [pytest.param(name, marks=pytest.mark.throttle(name), id=name)
+            for name in (names or THROTTLE_PROFILES)]
+
+
+class Throttler:
+    """Page-scoped throttling through the page's CDP session (Chromium only)"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.profile: Optional[ThrottleProfile] = None
+        try:
+            self._session = page.context.new_cdp_session(page)
+        except Exception as e:
+            raise RuntimeError(f"Throttling needs a Chromium CDP session: {str(e)}") from e
+        self._session.send("Network.enable")
+
+    @classmethod
+    def for_page(cls, page: Page) -> "Throttler":
+        """Return the throttler attached to the page, creating it on first use"""
+        throttler = getattr(page, "_throttler", None)
+        if throttler is None:
+            throttler = cls(page)
+            page._throttler = throttler
+        return throttler
+
+    def apply(self, profile) -> ThrottleProfile:
+        """Throttle the page's network and CPU to the profile (name or ThrottleProfile)"""
+        if isinstance(profile, str):
+            profile = get_profile(profile)
+        self._session.send("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": profile.latency,
+            "downloadThroughput": profile.download,
+            "uploadThroughput": profile.upload,
+        })
+        self._session.send("Emulation.setCPUThrottlingRate", {"rate": profile.cpu_rate})
+        self.profile = profile
+        print(f"Throttling page to '{profile.name}' ({profile.latency:.0f}ms RTT, "
+              f"{profile.download * 8 / 1024 / 0.9:.0f}kbps down, {profile.cpu_rate:g}x CPU)")
+        return profile
+
+    def reset(self) -> None:
+        """Back to full speed"""
+        if self.profile is None:
+            return
+        self._session.send("Network.emulateNetworkConditions", {
+            "offline": False, "latency": 0, "downloadThroughput": -1, "uploadThroughput": -1
+        })
+        self._session.send("Emulation.setCPUThrottlingRate", {"rate": 1})
+        self.profile = None
+
+    @property
+    def profile_name(self) -> Optional[str]:
+        return self.profile.name if self.profile else None
+
+
+def profile_name(page: Page) -> Optional[str]:
+    """Name of the profile the page is throttled to, None if it runs at full speed"""
+    throttler = getattr(page, "_throttler", None)
+    return throttler.profile_name if throttler else None
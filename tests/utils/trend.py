@@ -0,0 +1,87 @@
+"""
+Trend files and result tables of the standalone benchmarks.
+
+Every run of a benchmark is appended to test_reports/<name>.jsonl as one line
+(the run's results nested under a key) and to test_reports/<name>.csv as one row
+per result, so numbers can be compared across commits and environments.
+"""
+import csv
+import json
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+RUN_FIELDS = ["run_at", "target"]
+
+# (header, attribute name or function of the result, format spec such as '>10' or '<13')
+TableColumn = Tuple[str, Union[str, Callable[[Any], Any]], str]
+
+
+def _as_dict(result: Any) -> Dict[str, Any]:
+    return asdict(result) if is_dataclass(result) else dict(result)
+
+
+def append_trend(name: str, results: Sequence[Any], target: str, fields: List[str], key: str = "points",
+                 label: str = "Benchmark", report_dir: str = "test_reports") -> Path:
+    """
+    Append the results of one run to the JSON-lines and CSV trend files
+
+    Args:
+        name: Trend file name without extension (e.g., 'upload_benchmark_trend')
+        results: Benchmark results of the run (dataclasses or dicts)
+        target: Label of the system under test (e.g., 'stand-in' or 'staging')
+        fields: Result fields written to the CSV file, after run_at and target
+        key: Key the results are nested under in the JSON line
+        label: Benchmark name for the printed message
+        report_dir: Directory of the trend files
+
+    Returns:
+        Path: The JSON-lines trend file
+    """
+    output_dir = Path(report_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    run = {"run_at": datetime.now().isoformat(timespec="seconds"), "target": target}
+    rows = [_as_dict(result) for result in results]
+
+    jsonl_path = output_dir / f"{name}.jsonl"
+    with open(jsonl_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({**run, key: rows}) + "\n")
+
+    csv_path = output_dir / f"{name}.csv"
+    write_header = not csv_path.exists()
+    with open(csv_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RUN_FIELDS + list(fields), extrasaction="ignore")
+        if write_header:
+            writer.writeheader()
+        for row in rows:
+            writer.writerow({**run, **row})
+
+    print(f"{label} trend saved to: {jsonl_path} and {csv_path}")
+    return jsonl_path
+
+
+def last_run(name: str, target: str, report_dir: str = "test_reports") -> Optional[Dict[str, Any]]:
+    """Return the last run saved to the trend file against the target, if any"""
+    path = Path(report_dir) / f"{name}.jsonl"
+    if not path.exists():
+        return None
+    last = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            run = json.loads(line)
+            if run.get("target") == target:
+                last = run
+    return last
+
+
+def print_table(results: Sequence[Any], columns: Sequence[TableColumn]) -> None:
+    """Print the results as a fixed-width table; missing values show as '-'"""
+    def cell(value: Any, spec: str) -> str:
+        return format("-" if value is None else value, spec)
+
+    print("\n" + " ".join(cell(header, spec) for header, _, spec in columns).rstrip())
+    for result in results:
+        values = [(getter(result) if callable(getter) else getattr(result, getter), spec)
+                  for _, getter, spec in columns]
+        print(" ".join(cell(value, spec) for value, spec in values).rstrip())
@@ -0,0 +1,206 @@
+"""
+Web Vitals collection for every page the suite loads.
+
+An init script installs PerformanceObservers (with buffered entries) before any
+app code runs, so LCP, CLS, INP, FCP and TTFB are observed as they happen instead
+of being read back after the fact. Each document reports its values to Python
+through an exposed binding whenever they change and when it is hidden, so every
+navigation a test makes is captured without extra waits. Results are saved per
+test to test_reports/web_vitals/<test>.json and recorded as metrics tagged with
+the route (see route_name), together with the load time and page weight
+(requests, transfer bytes, JS bytes) that the performance budgets check.
+"""
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Page
+
+from tests.config.test_config import URLS
+from tests.utils.metrics import record_metric
+from tests.utils.throttling import profile_name
+
+BINDING_NAME = "__reportWebVitals"
+
+# Metric name -> unit, in report order
+VITALS = {"ttfb": "ms", "fcp": "ms", "lcp": "ms", "cls": "", "inp": "ms"}
+
+WEB_VITALS_INIT_SCRIPT = r"""
+(() => {
+  if (window !== window.top || window.__webVitals) return;
+  const state = {
+    id: `${Date.now()}-${Math.random().toString(36).slice(2, 8)}`,
+    url: location.href,
+    ttfb: null, fcp: null, lcp: null, cls: 0, inp: null, interactions: 0,
+    dom_content_loaded: null, load_time: null, requests: 0, transfer_bytes: 0, js_bytes: 0
+  };
+  // Keep every resource of heavy pages (the default buffer holds 250)
+  performance.setResourceTimingBufferSize(1000);
+
+  // Page weight; cross-origin resources without Timing-Allow-Origin count as 0 bytes
+  function snapshot() {
+    const [navigation] = performance.getEntriesByType('navigation');
+    const resources = performance.getEntriesByType('resource');
+    state.requests = resources.length + (navigation ? 1 : 0);
+    state.transfer_bytes = (navigation ? navigation.transferSize : 0) +
+      resources.reduce((sum, r) => sum + (r.transferSize || 0), 0);
+    state.js_bytes = resources
+      .filter(r => r.initiatorType === 'script' || /\.m?js(\?|$)/.test(r.name))
+      .reduce((sum, r) => sum + (r.encodedBodySize || 0), 0);
+    return Object.assign({}, state);
+  }
+
+  let timer = null;
+  function report() {
+    clearTimeout(timer);
+    timer = null;
+    const binding = window.__reportWebVitals;
+    if (typeof binding === 'function') {
+      Promise.resolve(binding(snapshot())).catch(() => {});
+    }
+  }
+  function schedule() {
+    if (!timer) timer = setTimeout(report, 250);
+  }
+  function observe(type, callback, options) {
+    try {
+      new PerformanceObserver(list => { list.getEntries().forEach(callback); schedule(); })
+        .observe(Object.assign({ type, buffered: true }, options));
+    } catch (e) {
+      // Entry type not supported by this browser
+    }
+  }
+
+  observe('navigation', entry => {
+    state.ttfb = entry.responseStart;
+    state.dom_content_loaded = entry.domContentLoadedEventEnd || null;
+    state.load_time = entry.loadEventEnd || null;
+  });
+  observe('paint', entry => {
+    if (entry.name === 'first-contentful-paint') state.fcp = entry.startTime;
+  });
+  observe('largest-contentful-paint', entry => { state.lcp = entry.startTime; });
+
+  // CLS: largest session window of shifts less than 1s apart and at most 5s long
+  let windowValue = 0, windowStart = 0, lastShift = 0;
+  observe('layout-shift', entry => {
+    if (entry.hadRecentInput) return;
+    if (windowValue && entry.startTime - lastShift < 1000 && entry.startTime - windowStart < 5000) {
+      windowValue += entry.value;
+    } else {
+      windowValue = entry.value;
+      windowStart = entry.startTime;
+    }
+    lastShift = entry.startTime;
+    state.cls = Math.max(state.cls, windowValue);
+  });
+
+  // INP: slowest interaction (the p98 rule only differs past 50 interactions)
+  const interactions = new Map();
+  observe('event', entry => {
+    if (!entry.interactionId) return;
+    interactions.set(entry.interactionId, Math.max(interactions.get(entry.interactionId) || 0, entry.duration));
+    state.interactions = interactions.size;
+    state.inp = Math.max(...interactions.values());
+  }, { durationThreshold: 16 });
+
+  addEventListener('pagehide', report);
+  addEventListener('visibilitychange', () => { if (document.visibilityState === 'hidden') report(); });
+  window.__webVitals = { snapshot };
+})();
+"""
+
+_ROUTES = sorted(((name, urlsplit(url).path.rstrip("/")) for name, url in URLS.items()),
+                 key=lambda item: len(item[1]), reverse=True)
+
+
+def route_name(url: str) -> str:
+    """Map a URL to its URLS key (e.g. '.../cost-center?page=2' -> 'COST_CENTERS'), or its path"""
+    path = urlsplit(url).path.rstrip("/")
+    for name, route_path in _ROUTES:
+        if path == route_path or (route_path and path.startswith(route_path + "/")):
+            return name
+    return path or "/"
+
+
+class WebVitalsCollector:
+    """Page-scoped Web Vitals collector; one entry per loaded document"""
+
+    def __init__(self, page: Page):
+        self.page = page
+        self._navigations: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        page.expose_binding(BINDING_NAME, self._on_report)
+        page.add_init_script(WEB_VITALS_INIT_SCRIPT)
+
+    @classmethod
+    def for_page(cls, page: Page) -> "WebVitalsCollector":
+        """Return the collector attached to the page, installing it on first use
+
+        Install before the first navigation; documents loaded earlier are not observed.
+        """
+        collector = getattr(page, "_web_vitals", None)
+        if collector is None:
+            collector = cls(page)
+            page._web_vitals = collector
+        return collector
+
+    def _on_report(self, source, payload: Dict[str, Any]) -> None:
+        self._update(payload)
+
+    def _update(self, payload: Optional[Dict[str, Any]]) -> None:
+        if not payload or "id" not in payload:
+            return
+        payload = dict(payload, route=route_name(payload.get("url", "")))
+        with self._lock:
+            self._navigations[payload["id"]] = payload
+
+    def flush(self) -> None:
+        """Pull the current document's values (its last scheduled report may not have fired yet)"""
+        try:
+            self._update(self.page.evaluate("() => window.__webVitals && window.__webVitals.snapshot()"))
+        except Exception as e:
+            print(f"Could not read Web Vitals from the page: {str(e)}")
+
+    @property
+    def navigations(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._navigations.values())
+
+    def latest(self, route: str = None) -> Optional[Dict[str, Any]]:
+        """Values of the most recent document, optionally of a given route (URLS key)"""
+        self.flush()
+        matching = [n for n in self.navigations if route is None or n["route"] == route]
+        return matching[-1] if matching else None
+
+    def save(self, test_name: str, report_dir: str = "test_reports/web_vitals") -> Optional[Path]:
+        """Record each navigation's vitals as metrics and write them to <report_dir>/<test>.json
+
+        Returns:
+            Path to the written file, or None if no navigation was observed
+        """
+        if not self.page.is_closed():
+            self.flush()
+        navigations = self.navigations
+        if not navigations:
+            return None
+
+        throttle = profile_name(self.page)
+        for navigation in navigations:
+            for name, unit in VITALS.items():
+                if navigation.get(name) is not None:
+                    record_metric(f"web_vitals.{name}", navigation[name], unit=unit,
+                                  route=navigation["route"], test=test_name, throttle=throttle or "none")
+
+        output_dir = Path(report_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", test_name)
+        filepath = output_dir / f"{safe_name}.json"
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump({"test": test_name, "saved_at": datetime.now().isoformat(), "throttle": throttle,
+                       "navigations": navigations}, f, indent=2)
+        return filepath